@@ -0,0 +1,156 @@
+"""Benchmark the band/DOS readers on synthetic files.
+
+Run from the repository root::
+
+    python benchmarks/bench_readers.py
+    python benchmarks/bench_readers.py --atoms 16 128 --kpoints 400 --only band-h5
+
+Every reader path is covered: band and DOS, HDF5 and JSON, spinless,
+collinear and non-collinear files, every projection mode, with and without
+float formatting. The files are written once per size into ``--workdir`` by
+:mod:`ddpc.testing`.
+
+Each case runs in a fresh process and reports the best and median wall time
+of ``--repeat`` reads, the peak resident set size (RSS) of the process and its
+growth during the reads, and the peak of the memory traced by
+:mod:`tracemalloc` during one more read. Traced memory covers NumPy buffers
+and Python objects, not the allocations made by Polars itself.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ddpc.io.band import read_band
+from ddpc.io.dos import read_dos
+from ddpc.io.projection import BAND_MODES, DOS_MODES
+from ddpc.testing import SPIN_TYPES, write_band_file, write_dos_file
+
+KINDS = {
+    "band": {
+        "modes": [0, *BAND_MODES],
+        "write": write_band_file,
+        "dims": ("atoms", "bands", "kpoints"),
+    },
+    "dos": {"modes": [0, *DOS_MODES], "write": write_dos_file, "dims": ("atoms", "energies")},
+}
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+_MB = 1 << 20
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark cases selected on the command line."""
+    args = _parser().parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        cases = [case for case in _cases(args, workdir) if all(s in case[0] for s in args.only)]
+        if not cases:
+            sys.exit("no benchmark case matches --only")
+
+        results = []
+        print(f"{'case':<48}{'file MB':>9}{'best ms':>10}{'median ms':>11}", end="")
+        print(f"{'peak RSS MB':>13}{'RSS growth MB':>15}{'traced MB':>11}")
+        context = multiprocessing.get_context("spawn")
+        for name, kind, path, mode, fmt in cases:
+            # a fresh process per case, so the peak RSS belongs to that case alone
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(_run_case, kind, str(path), mode, fmt, args.repeat).result()
+            result = {"case": name, "file_mb": path.stat().st_size / _MB, **result}
+            results.append(result)
+            print(
+                f"{name:<48}{result['file_mb']:>9.1f}{result['best_s'] * 1e3:>10.1f}"
+                f"{result['median_s'] * 1e3:>11.1f}{result['peak_rss_mb']:>13.1f}"
+                f"{result['rss_growth_mb']:>15.1f}{result['traced_peak_mb']:>11.1f}",
+                flush=True,
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=list(KINDS))
+    parser.add_argument("--formats", nargs="+", default=["h5", "json"], choices=["h5", "json"])
+    parser.add_argument("--spins", nargs="+", default=list(SPIN_TYPES), choices=list(SPIN_TYPES))
+    parser.add_argument("--modes", nargs="+", type=int, help="projection modes, default all")
+    parser.add_argument(
+        "--fmt",
+        nargs="+",
+        default=["8.3f", "none"],
+        help="float formats passed to the readers, 'none' for native floats",
+    )
+    parser.add_argument("--atoms", nargs="+", type=int, default=[8, 64])
+    parser.add_argument("--bands", nargs="+", type=int, default=[64])
+    parser.add_argument("--kpoints", nargs="+", type=int, default=[200])
+    parser.add_argument("--energies", nargs="+", type=int, default=[2001])
+    parser.add_argument("--repeat", type=int, default=3, help="timed reads per case")
+    parser.add_argument(
+        "--only", nargs="+", default=[], help="run the cases whose name contains all strings"
+    )
+    parser.add_argument("--workdir", help="where the synthetic files are kept, default temporary")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    return parser
+
+
+def _cases(args: argparse.Namespace, workdir: Path) -> list[tuple]:
+    """List ``(name, kind, path, mode, fmt)`` of every case, writing missing files."""
+    cases = []
+    for kind in args.kinds:
+        spec = KINDS[kind]
+        sizes = itertools.product(*(getattr(args, dim) for dim in spec["dims"]))
+        for size, ext, spin in itertools.product(sizes, args.formats, args.spins):
+            tag = "".join(f"{dim[0]}{n}" for dim, n in zip(spec["dims"], size, strict=True))
+            path = workdir / f"{kind}-{spin}-{tag}.{ext}"
+            if not path.exists():
+                spec["write"](path, spin, size)
+            for mode in spec["modes"]:
+                if args.modes is not None and mode not in args.modes:
+                    continue
+                for fmt in args.fmt:
+                    name = f"{kind}-{ext}-{spin}-{tag}-m{mode}-{fmt}"
+                    cases.append((name, kind, path, mode, None if fmt == "none" else fmt))
+    return cases
+
+
+def _run_case(kind: str, path: str, mode: int, fmt: str | None, repeat: int) -> dict:
+    """Time one reader in the current process, which has only imported the modules."""
+    reader = read_band if kind == "band" else read_dos
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = reader(path, mode, fmt)
+        times.append(time.perf_counter() - start)
+        if result is None:
+            raise RuntimeError(f"cannot read {path} with mode {mode}, see the log")
+        del result
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    reader(path, mode, fmt)
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "best_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_rss_mb": peak * _RSS_UNIT / _MB,
+        "rss_growth_mb": (peak - baseline) * _RSS_UNIT / _MB,
+        "traced_peak_mb": traced / _MB,
+    }
+
+
+if __name__ == "__main__":
+    main()
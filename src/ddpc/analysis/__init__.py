@@ -0,0 +1 @@
+"""Analyse band structures and densities of states read by ddpc.io."""
@@ -0,0 +1,242 @@
+"""Densities of states computed from band eigenvalues and projections."""
+
+import numpy as np
+from loguru import logger
+
+from ddpc.analysis.broadening import broaden_array
+from ddpc.io.band import BandStructure
+from ddpc.io.dos import DensityOfStates
+from ddpc.io.instrument import stage
+
+METHODS = ("gaussian", "tetrahedron")
+# number of points of the default energy grid
+_GRID_POINTS = 2001
+# decimals kept of fractional k-point coordinates when matching them to a mesh
+_MESH_DECIMALS = 6
+# number of (tetrahedron, edge, channel) evaluations per chunk
+_TETRAHEDRON_CHUNK = 1 << 22
+# the six tetrahedra of a mesh cell sharing its main diagonal, corners numbered x + 2y + 4z
+_CELL_TETRAHEDRA = np.array(
+    [[0, 1, 3, 7], [0, 1, 5, 7], [0, 2, 3, 7], [0, 2, 6, 7], [0, 4, 5, 7], [0, 4, 6, 7]]
+)
+
+
+@logger.catch
+def dos_from_bands(
+    band: BandStructure,
+    grid: np.ndarray | None = None,
+    method: str = "gaussian",
+    width: float = 0.1,
+) -> DensityOfStates:
+    """Compute the total and projected DOS from band eigenvalues.
+
+    Every band holds one state per spin channel, shared evenly between the
+    k-points. Projected densities weight each eigenvalue with its orbital
+    projections, so they are computed together with the total DOS as extra
+    channels.
+
+    - ``"gaussian"`` adds every eigenvalue to its two neighbouring grid
+      points with linear weights, all at once, and smears the histogram
+      with a Gaussian of full width at half maximum ``width`` (see
+      :func:`ddpc.analysis.broadening.broaden_array`).
+    - ``"tetrahedron"`` is the linear tetrahedron method: energies are
+      interpolated linearly inside the six tetrahedra of every mesh cell,
+      and the states of every tetrahedron are integrated analytically
+      between the grid points. The k-points must form a full regular mesh
+      of the Brillouin zone; a k-path or a symmetry-reduced mesh is
+      rejected. Projections are averaged over the corners of every
+      tetrahedron. The result is averaged over every grid cell.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`.
+    grid : numpy.ndarray, optional
+        Ascending energy grid in eV, uniform for ``"gaussian"``; defaults to
+        2001 points spanning the eigenvalues.
+    method : {"gaussian", "tetrahedron"}, default "gaussian"
+        Integration method.
+    width : float, default 0.1
+        Full width at half maximum of the Gaussian in eV, unused by the
+        tetrahedron method.
+
+    Returns
+    -------
+    DensityOfStates
+        DOS in states per eV per cell on ``grid``, with the projections of
+        ``band`` as ``(spin, atom, orbital, energy)`` when they were loaded.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is unknown, the grid has fewer than two points or is
+        not ascending, or the k-points are not a full mesh for the
+        tetrahedron method.
+
+    Examples
+    --------
+    >>> dos = dos_from_bands(load_band("band.h5"), width=0.2)
+    >>> df = dos.to_polars(mode=2)
+    """
+    if method not in METHODS:
+        raise ValueError(f"{method=} must be one of {METHODS}")
+    energies = np.asarray(band.energies, dtype=float)
+    if grid is None:
+        pad = 3 * width if method == "gaussian" else 0.1
+        grid = np.linspace(energies.min() - pad, energies.max() + pad, _GRID_POINTS)
+    grid = np.asarray(grid, dtype=float)
+    if len(grid) < 2 or (np.diff(grid) <= 0).any():
+        raise ValueError("the energy grid must hold at least two ascending energies")
+
+    # channel 0 is the total DOS, the others are the projections
+    nspin, nband, nkpt = energies.shape
+    rows = np.ones((nspin, 1, nband, nkpt))
+    if band.projections is not None:
+        weights = np.asarray(band.projections, dtype=float)
+        rows = np.concatenate([rows, weights.reshape(nspin, -1, nband, nkpt)], axis=1)
+
+    with stage("dos_from_bands", rows.nbytes):
+        if method == "gaussian":
+            values = broaden_array(_histogram(energies, rows, grid), grid, width, "gaussian")
+        else:
+            values = _tetrahedron_dos(energies, rows, grid, _mesh_tetrahedra(band.kpoints))
+
+    projections = None
+    if band.projections is not None:
+        projections = values[:, 1:].reshape(*band.projections.shape[:3], len(grid))
+    info = {"efermi": band.efermi, "spin_type": band.spin_type, "projected": band.projected}
+    return DensityOfStates(grid, values[:, 0], projections, band.axes, info)
+
+
+@logger.catch
+def _histogram(energies: np.ndarray, rows: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Add the channel weights of every eigenvalue to its two nearest grid points.
+
+    Returns densities of shape ``(spin, channel, energy)`` in states per eV.
+    """
+    nspin, nrow, nband, nkpt = rows.shape
+    flat = energies.reshape(nspin, 1, nband * nkpt)
+    upper = np.clip(np.searchsorted(grid, flat, side="right"), 1, len(grid) - 1)
+    lower = upper - 1
+    frac = (flat - grid[lower]) / (grid[upper] - grid[lower])
+    inside = (flat >= grid[0]) & (flat <= grid[-1])
+    weights = rows.reshape(nspin, nrow, -1) * inside / nkpt
+
+    # one bincount over every (spin, channel, grid point)
+    base = np.arange(nspin * nrow).reshape(nspin, nrow, 1) * len(grid)
+    index = np.concatenate([base + lower, base + upper], axis=-1)
+    values = np.concatenate([weights * (1 - frac), weights * frac], axis=-1)
+    counts = np.bincount(index.ravel(), values.ravel(), minlength=nspin * nrow * len(grid))
+
+    steps = np.diff(grid)
+    cells = np.concatenate([[steps[0] / 2], (steps[:-1] + steps[1:]) / 2, [steps[-1] / 2]])
+    return counts.reshape(nspin, nrow, len(grid)) / cells
+
+
+@logger.catch
+def _mesh_tetrahedra(kpoints: np.ndarray) -> np.ndarray:
+    """Return the k-point indices of the corners of every mesh tetrahedron.
+
+    The fractional k-points must form a full regular mesh, in any order.
+    """
+    frac = np.round(np.asarray(kpoints, dtype=float) % 1.0, _MESH_DECIMALS) % 1.0
+    shape, index = [], []
+    for axis in range(3):
+        values = np.unique(frac[:, axis])
+        n = len(values)
+        if not np.allclose(np.diff(values), 1 / n, atol=10.0**-_MESH_DECIMALS):
+            raise ValueError("k-points do not form a full regular mesh")
+        shape.append(n)
+        index.append(np.rint((frac[:, axis] - values[0]) * n).astype(int) % n)
+    lookup = np.full(shape, -1)
+    lookup[tuple(index)] = np.arange(len(frac))
+    if len(frac) != lookup.size or (lookup < 0).any():
+        raise ValueError("k-points do not form a full regular mesh")
+
+    # corner c of every cell is shifted by the bits of c along x, y and z
+    cell = np.indices(shape).reshape(3, -1, 1)
+    bits = (np.arange(8) >> np.arange(3)[:, None]) & 1
+    corners = (cell + bits[:, None, :]) % np.array(shape).reshape(3, 1, 1)
+    cube = lookup[tuple(corners)]
+    return cube[:, _CELL_TETRAHEDRA].reshape(-1, 4)
+
+
+@logger.catch
+def _tetrahedron_dos(
+    energies: np.ndarray, rows: np.ndarray, grid: np.ndarray, tetrahedra: np.ndarray
+) -> np.ndarray:
+    """Integrate the states of every tetrahedron over the cells of the grid.
+
+    Returns densities of shape ``(spin, channel, energy)`` in states per eV.
+    """
+    nspin, nrow = rows.shape[:2]
+    steps = np.diff(grid)
+    edges = np.concatenate(
+        [[grid[0] - steps[0] / 2], (grid[:-1] + grid[1:]) / 2, [grid[-1] + steps[-1] / 2]]
+    )
+    nedge = len(edges)
+    states = np.zeros((nspin, nrow, nedge))
+    for si in range(nspin):
+        corners = np.sort(energies[si][:, tetrahedra], axis=-1).reshape(-1, 4)
+        origins, coefficients = _occupied_pieces(corners)
+        # channel weight of every (band, tetrahedron), the mean over its corners
+        weights = rows[si][:, :, tetrahedra].mean(axis=-1).reshape(nrow, -1)
+
+        # tetrahedra below an edge are fully occupied there
+        full = np.searchsorted(edges, corners[:, 3])
+        index = (np.arange(nrow)[:, None] * (nedge + 1) + full).ravel()
+        below = np.bincount(index, weights.ravel(), minlength=nrow * (nedge + 1))
+        states[si] = below.reshape(nrow, nedge + 1)[:, :-1].cumsum(axis=1)
+
+        # edges inside a tetrahedron's energy range, evaluated in chunks
+        first = np.searchsorted(edges, corners[:, 0])
+        counts = full - first
+        ends = np.cumsum(counts)
+        limit = max(_TETRAHEDRON_CHUNK // nrow, int(counts.max(initial=1)))
+        bounds = np.searchsorted(ends, np.arange(limit, ends[-1], limit))
+        for lo, hi in zip([0, *bounds], [*bounds, len(counts)], strict=True):
+            item = np.repeat(np.arange(lo, hi), counts[lo:hi])
+            offset = np.arange(len(item)) - (ends - counts)[item] + (ends[lo] - counts[lo])
+            position = first[item] + offset
+            energy = edges[position]
+            piece = (energy >= corners[item, 1]).astype(int) + (energy >= corners[item, 2])
+            c = coefficients[item, piece]
+            x = energy - origins[item, piece]
+            fraction = c[:, 0] + x * (c[:, 1] + x * (c[:, 2] + x * c[:, 3]))
+            index = (np.arange(nrow)[:, None] * nedge + position).ravel()
+            partial = np.bincount(
+                index, (weights[:, item] * fraction).ravel(), minlength=nrow * nedge
+            )
+            states[si] += partial.reshape(nrow, nedge)
+    return np.diff(states, axis=-1) / (len(tetrahedra) * np.diff(edges))
+
+
+@logger.catch
+def _occupied_pieces(corners: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the occupied fraction of tetrahedra as three cubic pieces.
+
+    Between the sorted corner energies ``e1 <= e2 <= e3 <= e4``, the
+    fraction below ``E`` is a cubic polynomial in ``E - origin`` on each of
+    ``[e1, e2)``, ``[e2, e3)`` and ``[e3, e4)``. Returns the origins of shape
+    ``(tetrahedron, 3)`` and coefficients of shape ``(tetrahedron, 3, 4)``
+    in increasing order; pieces of zero width are never evaluated.
+    """
+    e1, e2, e3, e4 = corners.T
+    coefficients = np.zeros((len(corners), 3, 4))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coefficients[:, 0, 3] = 1 / ((e2 - e1) * (e3 - e1) * (e4 - e1))
+        scale = 1 / ((e3 - e1) * (e4 - e1))
+        coefficients[:, 1] = (
+            np.column_stack(
+                [
+                    (e2 - e1) ** 2,
+                    3 * (e2 - e1),
+                    np.full(len(corners), 3.0),
+                    -(e3 - e1 + e4 - e2) / ((e3 - e2) * (e4 - e2)),
+                ]
+            )
+            * scale[:, None]
+        )
+        coefficients[:, 2, 0] = 1.0
+        coefficients[:, 2, 3] = 1 / ((e4 - e1) * (e4 - e2) * (e4 - e3))
+    return np.column_stack([e1, e2, e4]), coefficients
@@ -0,0 +1,174 @@
+"""Reorder bands by continuity across k-points to follow band crossings."""
+
+import numpy as np
+from loguru import logger
+
+from ddpc.analysis.kpath import kpath_segments
+from ddpc.io.band import BandStructure
+from ddpc.io.instrument import stage
+
+# accuracy of the assignment in units of the cost (eV)
+_ASSIGN_TOL = 1e-6
+
+
+@logger.catch
+def band_order(band: BandStructure, weight: float = 0.5) -> np.ndarray:
+    r"""Connect the bands of neighbouring k-points by continuity.
+
+    Walking along the k-path, the energy of every connected band is
+    extrapolated linearly from its two previous k-points, and each band at
+    the next k-point is assigned to one connected band by minimising the
+    total cost
+
+    .. math:: |E_\text{predicted} - E| + w\,(1 - \cos\theta)
+
+    where :math:`\theta` is the angle between the projection vectors of the
+    two bands. The assignment of all bands at a k-point is one vectorised
+    auction; the walk restarts its extrapolation at every segment break.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`. The
+        projections, or the aggregated channels, are used when present.
+    weight : float, default 0.5
+        Cost in eV of fully dissimilar projections; 0 uses the energies
+        only.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape ``(spin, band, kpoint)`` giving, for every
+        connected band, the index of the energy-ordered band at each
+        k-point.
+
+    Examples
+    --------
+    >>> order = band_order(load_band("band.h5"), weight=1.0)
+    """
+    energies = np.asarray(band.energies, dtype=float)
+    nspin, nband, nkpt = energies.shape
+    features = _features(band) if weight else None
+    distances, segments = kpath_segments(band)
+    starts = {seg.start for seg in segments}
+
+    order = np.empty((nspin, nband, nkpt), dtype=int)
+    order[..., 0] = np.arange(nband)
+    with stage("band_order", energies.nbytes):
+        for si in range(nspin):
+            for k in range(1, nkpt):
+                previous = order[si, :, k - 1]
+                if k in starts:
+                    # repeated high-symmetry point, the bands are the same
+                    order[si, :, k] = previous
+                    continue
+                predicted = energies[si, previous, k - 1]
+                if k - 1 not in starts:
+                    slope = (predicted - energies[si, order[si, :, k - 2], k - 2]) / (
+                        distances[k - 1] - distances[k - 2]
+                    )
+                    predicted = predicted + slope * (distances[k] - distances[k - 1])
+                cost = np.abs(predicted[:, None] - energies[si, None, :, k])
+                if features is not None:
+                    cost += weight * (1 - features[si, previous, k - 1] @ features[si, :, k].T)
+                order[si, :, k] = _assign(cost)
+    return order
+
+
+@logger.catch
+def reorder_bands(band: BandStructure, weight: float = 0.5) -> BandStructure:
+    """Return the band structure with bands connected across crossings.
+
+    The energies, projections and aggregated channels of every k-point are
+    permuted by :func:`band_order`, so band ``i`` follows one continuous
+    band instead of the ``i``-th lowest energy.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`.
+    weight : float, default 0.5
+        Cost in eV of fully dissimilar projections, see :func:`band_order`.
+
+    Returns
+    -------
+    BandStructure
+        Band structure with reordered bands.
+
+    Examples
+    --------
+    >>> df = reorder_bands(load_band("band.h5")).to_polars(mode=2)
+    """
+    order = band_order(band, weight)
+    kpath = {"kpoints": band.kpoints, "distances": band.distances, "labels": band.labels}
+    info = {
+        "efermi": band.efermi,
+        "spin_type": band.spin_type,
+        "projected": band.projected,
+        "first_band": band.first_band,
+        "first_kpoint": band.first_kpoint,
+    }
+    energies = np.take_along_axis(band.energies, order, axis=1)
+    projections = band.projections
+    if projections is not None:
+        projections = np.take_along_axis(projections, order[:, None, None], axis=3)
+    reordered = BandStructure(energies, projections, kpath, band.axes, info)
+    if band.channels is not None:
+        mode, labels, weights = band.channels
+        reordered.channels = (mode, labels, np.take_along_axis(weights, order[:, None], axis=2))
+    return reordered
+
+
+@logger.catch
+def _features(band: BandStructure) -> np.ndarray | None:
+    """Return unit projection vectors of shape ``(spin, band, kpoint, feature)``."""
+    if band.channels is not None:
+        weights = band.channels[2]
+    elif band.projections is not None:
+        nspin, natom, norb, nband, nkpt = band.projections.shape
+        weights = band.projections.reshape(nspin, natom * norb, nband, nkpt)
+    else:
+        return None
+    vectors = np.moveaxis(np.asarray(weights, dtype=float), 1, -1)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+@logger.catch
+def _assign(cost: np.ndarray) -> np.ndarray:
+    """Return the column of a square cost matrix assigned to every row.
+
+    The total cost is minimised by an auction with epsilon scaling; all
+    unassigned rows bid at once, and the highest bid wins every column.
+    """
+    n = len(cost)
+    best = cost.argmin(axis=1)
+    if len(np.unique(best)) == n:
+        # every row has its own cheapest column
+        return best
+    benefit = -cost
+    prices = np.zeros(n)
+    rows = np.arange(n)
+    eps = max(np.ptp(cost) / 4, _ASSIGN_TOL)
+    while True:
+        owner = np.full(n, -1)
+        assigned = np.full(n, -1)
+        while (free := rows[assigned < 0]).size:
+            values = benefit[free] - prices
+            best = values.argmax(axis=1)
+            top = values[np.arange(len(free)), best]
+            values[np.arange(len(free)), best] = -np.inf
+            bids = prices[best] + top - values.max(axis=1) + eps
+            # the highest bid on every column wins it
+            ranked = np.lexsort((bids, best))
+            last = np.append(best[ranked][1:] != best[ranked][:-1], True)
+            win = ranked[last]
+            columns = best[win]
+            outbid = owner[columns]
+            assigned[outbid[outbid >= 0]] = -1
+            owner[columns] = free[win]
+            assigned[free[win]] = columns
+            prices[columns] = bids[win]
+        if eps <= _ASSIGN_TOL:
+            return assigned
+        eps = max(eps / 8, _ASSIGN_TOL)
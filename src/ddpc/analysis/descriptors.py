@@ -0,0 +1,129 @@
+"""Integrated DOS, band centres and higher moments of every DOS channel."""
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from ddpc.io.dos import DensityOfStates
+from ddpc.io.projection import DOS_MODES, aggregate, mode_rule
+
+
+@logger.catch
+def dos_descriptors(
+    dos: DensityOfStates, mode: int | dict = 5, window: tuple[float, float] | None = None
+) -> pl.DataFrame:
+    r"""Compute the descriptors of the total DOS and every projected channel.
+
+    The channels of ``mode`` are stacked into one ``(spin, channel,
+    energy)`` array and every integral is a single matrix product with
+    trapezoid weights. For channel density :math:`\rho` over the window:
+
+    - ``states`` is :math:`\int \rho\,dE`
+    - ``occupied`` is the same integral below the Fermi energy
+    - ``filling`` is ``occupied / states``
+    - ``center`` is :math:`\int E\rho\,dE / \int \rho\,dE`, e.g. the
+      d-band centre in mode 4
+    - ``width`` is the square root of the second central moment
+    - ``skewness`` and ``kurtosis`` are the third and fourth central
+      moments over ``width`` cubed and to the fourth (not excess kurtosis)
+
+    Parameters
+    ----------
+    dos : DensityOfStates
+        Loaded density of states, see :func:`ddpc.io.dos.load_dos`.
+    mode : int or dict, default 5
+        Projection mode, a key of :data:`ddpc.io.projection.DOS_MODES`, or
+        channel groups, see :func:`ddpc.io.dos.read_dos`. Mode 0, or a DOS
+        without projections, gives the total DOS only.
+    window : tuple of (float, float), optional
+        Inclusive ``(emin, emax)`` window in eV relative to the Fermi
+        energy, defaults to the whole grid.
+
+    Returns
+    -------
+    polars.DataFrame
+        One row per spin and channel, the total DOS as channel ``"tdos"``
+        first, with columns ``spin, channel, states, occupied, filling,
+        center, width, skewness, kurtosis``. Energies are relative to the
+        Fermi energy; moments of empty channels are NaN.
+
+    Raises
+    ------
+    RuntimeError
+        If ``mode`` is not a supported projection mode.
+    ValueError
+        If the window holds fewer than two energies.
+
+    Examples
+    --------
+    >>> table = dos_descriptors(load_dos("dos.h5"), mode=4, window=(-10, 5))
+    >>> table.filter(pl.col("channel").str.ends_with("d"))
+    """
+    channels = ["tdos"]
+    values = dos.dos[:, None]
+    if mode != 0 and dos.projections is not None:
+        labels, out = aggregate(dos.projections, dos.axes, mode_rule(mode, DOS_MODES))
+        channels += ["".join(label) for label in labels]
+        values = np.concatenate([values, out], axis=1)
+
+    energies = dos.energies - dos.efermi
+    inside = np.ones(len(energies), dtype=bool)
+    if window is not None:
+        inside = (energies >= window[0]) & (energies <= window[1])
+    if inside.sum() < 2:
+        raise ValueError(f"energy window {window} holds fewer than two energies")
+    energies, values = energies[inside], values[..., inside]
+
+    # trapezoid weights, and those of the part of the window below the Fermi energy
+    weights = np.zeros(len(energies))
+    steps = np.diff(energies) / 2
+    weights[:-1] += steps
+    weights[1:] += steps
+    below = _trapezoid_below(energies, 0.0)
+    powers = energies ** np.arange(5)[:, None]
+    # (spin, channel, [occupied, moment 0..4])
+    moments = values @ np.column_stack([below, (weights * powers).T])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        states = moments[..., 1]
+        raw = moments[..., 2:] / states[..., None]
+        center = raw[..., 0]
+        variance = raw[..., 1] - center**2
+        third = raw[..., 2] - 3 * center * raw[..., 1] + 2 * center**3
+        fourth = (
+            raw[..., 3] - 4 * center * raw[..., 2] + 6 * center**2 * raw[..., 1] - 3 * center**4
+        )
+        width = np.sqrt(np.maximum(variance, 0.0))
+        columns = {
+            "states": states,
+            "occupied": moments[..., 0],
+            "filling": moments[..., 0] / states,
+            "center": center,
+            "width": width,
+            "skewness": third / width**3,
+            "kurtosis": fourth / width**4,
+        }
+
+    nspin, nchannel = states.shape
+    spins = [s or "none" for s in dos.spins]
+    return pl.DataFrame(
+        {
+            "spin": pl.Series(np.repeat(spins, nchannel)).cast(pl.Enum(spins)),
+            "channel": pl.Series(np.tile(channels, nspin)).cast(pl.Enum(channels)),
+            **{name: value.ravel() for name, value in columns.items()},
+        }
+    )
+
+
+@logger.catch
+def _trapezoid_below(energies: np.ndarray, limit: float) -> np.ndarray:
+    """Trapezoid weights integrating a piecewise linear curve up to ``limit``."""
+    weights = np.zeros(len(energies))
+    left, right = energies[:-1], energies[1:]
+    # part of every interval below the limit, and the curve weights at its end
+    top = np.clip(limit, left, right)
+    span = top - left
+    frac = np.divide(span, right - left, out=np.zeros_like(span), where=right > left)
+    weights[:-1] += span * (1 - frac / 2)
+    weights[1:] += span * frac / 2
+    return weights
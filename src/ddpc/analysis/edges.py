@@ -0,0 +1,104 @@
+"""Band edges, band gaps and their direct or indirect character."""
+
+from collections.abc import Callable
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from ddpc.io.band import BandStructure
+
+
+@logger.catch
+def band_edges(band: BandStructure, tol: float = 1e-4) -> pl.DataFrame:
+    """Find the valence band maximum, conduction band minimum and band gap.
+
+    States at or below the Fermi energy (plus ``tol``) are occupied. Every
+    quantity is a reduction over the ``(spin, band, kpoint)`` energy array:
+    the valence and conduction edges at each k-point are masked maxima and
+    minima over bands, and the edges of the band structure are reductions of
+    those over k-points.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`; the
+        projections are not needed.
+    tol : float, default 1e-4
+        Tolerance in eV above the Fermi energy for occupied states, and for
+        the comparison of the direct and fundamental gaps.
+
+    Returns
+    -------
+    polars.DataFrame
+        One row per spin channel (``"none"`` without spin polarisation) and,
+        for collinear data, a ``"both"`` row over both spins, with columns:
+
+        - ``vbm``, ``cbm``: band edges in eV, NaN without occupied or empty
+          states
+        - ``gap``: fundamental gap in eV, 0 for metals
+        - ``direct_gap``: smallest gap at a single k-point in eV
+        - ``direct``: whether the fundamental gap is direct, False for metals
+        - ``metal``: whether a band crosses the Fermi energy
+        - ``vbm_spin``, ``cbm_spin``: spin channel of each edge
+        - ``vbm_band``, ``cbm_band``, ``vbm_kpoint``, ``cbm_kpoint``: 1-based
+          band and k-point indices of each edge in the file
+        - ``vbm_label``, ``cbm_label``: high-symmetry labels of the edge
+          k-points, empty elsewhere
+
+    Examples
+    --------
+    >>> edges = band_edges(load_band("band.h5", projections=False))
+    >>> edges.select("spin", "gap", "direct")
+    """
+    energies = np.asarray(band.energies, dtype=float)
+    occupied = energies <= band.efermi + tol
+    valence = np.where(occupied, energies, -np.inf)
+    conduction = np.where(occupied, np.inf, energies)
+    # a band crosses the Fermi energy when it is occupied at some k-points only
+    crossing = (occupied.any(axis=2) & ~occupied.all(axis=2)).any(axis=1)
+
+    spins = [s or "none" for s in band.spins]
+    groups = [[si] for si in range(len(spins))]
+    if len(spins) == 2:
+        # both spins seen as one band structure
+        groups.append([0, 1])
+    labels = np.asarray(band.labels, dtype=str)
+
+    rows = []
+    for group in groups:
+        vbm, vspin, vband, vkpt = _extreme(valence[group], np.argmax)
+        cbm, cspin, cband, ckpt = _extreme(conduction[group], np.argmin)
+        metal = bool(crossing[group].any())
+        # edges at every k-point, the direct gap is their smallest distance
+        direct_gap = (conduction[group].min(axis=(0, 1)) - valence[group].max(axis=(0, 1))).min()
+        gap = cbm - vbm
+        if metal:
+            gap = direct_gap = 0.0
+        rows.append(
+            {
+                "spin": "both" if len(group) == 2 else spins[group[0]],
+                "vbm": vbm if np.isfinite(vbm) else np.nan,
+                "cbm": cbm if np.isfinite(cbm) else np.nan,
+                "gap": max(gap, 0.0) if np.isfinite(gap) else np.nan,
+                "direct_gap": max(direct_gap, 0.0) if np.isfinite(direct_gap) else np.nan,
+                "direct": not metal and bool(direct_gap - gap <= tol),
+                "metal": metal,
+                "vbm_spin": spins[group[vspin]],
+                "cbm_spin": spins[group[cspin]],
+                "vbm_band": vband + band.first_band,
+                "cbm_band": cband + band.first_band,
+                "vbm_kpoint": vkpt + band.first_kpoint,
+                "cbm_kpoint": ckpt + band.first_kpoint,
+                "vbm_label": labels[vkpt],
+                "cbm_label": labels[ckpt],
+            }
+        )
+    return pl.DataFrame(rows)
+
+
+@logger.catch
+def _extreme(values: np.ndarray, find: Callable) -> tuple[float, int, int, int]:
+    """Return the extreme of a ``(spin, band, kpoint)`` array and its position."""
+    si, bi, ki = np.unravel_index(find(values), values.shape)
+    return float(values[si, bi, ki]), int(si), int(bi), int(ki)
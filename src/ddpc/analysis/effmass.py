@@ -0,0 +1,129 @@
+"""Effective masses fitted at the band extrema of every k-path segment."""
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+from ddpc.analysis.kpath import kpath_segments
+from ddpc.io.band import BandStructure
+
+# hbar^2 / m_e in eV Angstrom^2
+HBAR2_OVER_ME = 7.619964231
+
+
+@logger.catch
+def effective_masses(
+    band: BandStructure,
+    lattice: np.ndarray | None = None,
+    npoints: int = 3,
+    order: int = 2,
+) -> pl.DataFrame:
+    """Fit the curvature of every band at the extrema of every k-path segment.
+
+    The lowest and highest point of each band in each segment are taken as
+    extrema. Around every extremum, ``npoints`` k-points on each side are
+    fitted with a polynomial of ``order`` in the distance along the path;
+    at a segment end the points are mirrored, assuming the band is symmetric
+    about the high-symmetry point. All fits are solved together as one
+    batch of least-squares problems.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure; restrict it to the bands of interest first,
+        e.g. with an ``"energies"`` or ``"bands"`` selector.
+    lattice : numpy.ndarray, optional
+        Real-space lattice vectors as rows in Angstrom, see
+        :func:`ddpc.analysis.kpath.kpath_segments`. Needed for masses in
+        units of the electron mass when the k-points are fractional.
+    npoints : int, default 3
+        Number of k-points fitted on each side of an extremum.
+    order : int, default 2
+        Order of the fitted polynomial, 2 for a parabola; the mass always
+        comes from its second-order coefficient.
+
+    Returns
+    -------
+    polars.DataFrame
+        One row per spin, band, segment and extremum with columns ``spin``,
+        ``band`` (1-based in the file), ``segment`` (labels of its ends),
+        ``kind`` (``"min"`` or ``"max"``), ``kpoint`` (1-based in the file),
+        ``label``, ``energy`` in eV, ``mass`` in electron masses (negative
+        at maxima) and ``rmse``, the root mean square error of the fit in
+        eV.
+
+    Raises
+    ------
+    ValueError
+        If ``order`` is not between 2 and ``2 * npoints``.
+
+    Examples
+    --------
+    >>> band = load_band("band.h5", {"energies": (-1, 2), "relative_to_fermi": True})
+    >>> masses = effective_masses(band, lattice=read_structure("structure.as").cell[:])
+    """
+    if not 2 <= order <= 2 * npoints:
+        raise ValueError(f"{order=} must be between 2 and {2 * npoints}")
+    distances, segments = kpath_segments(band, lattice)
+    segments = [seg for seg in segments if seg.stop - seg.start >= 3]
+    energies = np.asarray(band.energies, dtype=float)
+    nspin, nband, _ = energies.shape
+    labels = np.array(band.labels, dtype=str)
+    for seg in segments:
+        # the label of a repeated point is only stored on one of its copies
+        if not labels[seg.start] and seg.start > 0:
+            labels[seg.start] = labels[seg.start - 1]
+        if not labels[seg.stop - 1] and seg.stop < len(labels):
+            labels[seg.stop - 1] = labels[seg.stop]
+
+    # every (spin, band) has one minimum and one maximum per segment
+    centers, starts, stops, names = [], [], [], []
+    for seg in segments:
+        part = energies[..., seg]
+        centers += [part.argmin(axis=2) + seg.start, part.argmax(axis=2) + seg.start]
+        starts.append(seg.start)
+        stops.append(seg.stop)
+        names.append(f"{labels[seg.start]}-{labels[seg.stop - 1]}")
+    nseg = len(segments)
+    # (segment, kind, spin, band)
+    center = np.array(centers, dtype=int).reshape(nseg, 2, nspin, nband)
+    start = np.array(starts).reshape(nseg, 1, 1, 1)
+    last = np.array(stops).reshape(nseg, 1, 1, 1) - 1
+
+    # window positions mirrored at the segment ends
+    offsets = np.arange(-npoints, npoints + 1)
+    idx = center[..., None] + offsets
+    idx = np.where(idx < start[..., None], 2 * start[..., None] - idx, idx)
+    idx = np.where(idx > last[..., None], 2 * last[..., None] - idx, idx)
+    idx = np.clip(idx, start[..., None], last[..., None])
+    x = np.sign(offsets) * np.abs(distances[idx] - distances[center][..., None])
+    spin = np.arange(nspin).reshape(1, 1, nspin, 1, 1)
+    bidx = np.arange(nband).reshape(1, 1, 1, nband, 1)
+    y = energies[spin, bidx, idx] - energies[spin[..., 0], bidx[..., 0], center][..., None]
+
+    # batched least squares of the polynomial fits
+    design = x[..., None] ** np.arange(order + 1)
+    coef = (np.linalg.pinv(design) @ y[..., None])[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rmse = np.sqrt(np.mean((np.einsum("...mi,...i->...m", design, coef) - y) ** 2, axis=-1))
+        mass = HBAR2_OVER_ME / (2 * coef[..., 2])
+
+    # rows ordered by spin, band, segment and kind
+    order_axes = (2, 3, 0, 1)
+    grid = [g.transpose(order_axes).ravel() for g in np.indices(center.shape)]
+    kpoint = center.transpose(order_axes).ravel()
+    spins = np.array([s or "none" for s in band.spins])
+    return pl.DataFrame(
+        {
+            "spin": spins[grid[2]],
+            "band": grid[3] + band.first_band,
+            "segment": np.array(names, dtype=str)[grid[0]] if nseg else [],
+            "kind": np.array(["min", "max"])[grid[1]],
+            "kpoint": kpoint + band.first_kpoint,
+            "label": labels[kpoint],
+            "energy": energies[grid[2], grid[3], kpoint],
+            "mass": mass.transpose(order_axes).ravel(),
+            "rmse": rmse.transpose(order_axes).ravel(),
+        },
+        schema_overrides={"band": pl.Int64, "kpoint": pl.Int64},
+    )
@@ -0,0 +1,165 @@
+"""Interpolate band energies onto a denser k-path, segment by segment."""
+
+import numpy as np
+from loguru import logger
+
+from ddpc.analysis.kpath import kpath_segments
+from ddpc.io.band import BandStructure
+from ddpc.io.instrument import stage
+
+INTERPOLATIONS = ("spline", "fourier")
+# relative tolerance on the k-point spacing of a segment for Fourier interpolation
+_UNIFORM_RTOL = 1e-3
+
+
+@logger.catch
+def interpolate_bands(
+    band: BandStructure, factor: int = 4, method: str = "spline"
+) -> BandStructure:
+    """Upsample every band onto a k-path ``factor`` times denser.
+
+    Each straight segment of the path (see
+    :func:`ddpc.analysis.kpath.kpath_segments`) is interpolated on its own,
+    so bands keep their kinks at the high-symmetry points. Every interval is
+    split into ``factor`` equal steps, which keeps the original k-points;
+    all spins and bands of a segment are interpolated together.
+
+    - ``"spline"`` is a not-a-knot cubic spline through the points of the
+      segment, natural for segments of fewer than four points.
+    - ``"fourier"`` is a band-smooth cosine series: the segment is mirrored
+      about its ends and zero-padded in Fourier space, which gives bands
+      with zero slope at the high-symmetry points. The k-points of a
+      segment must be evenly spaced.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`.
+    factor : int, default 4
+        Number of interpolated steps per original k-point interval.
+    method : {"spline", "fourier"}, default "spline"
+        Interpolation method.
+
+    Returns
+    -------
+    BandStructure
+        Band structure on the dense path, with linearly interpolated
+        k-points and the original labels. Projections are not
+        interpolated; ``first_kpoint`` is 1 as the k-points are no longer
+        those of the file.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is unknown, ``factor`` is below 1, or a segment is not
+        evenly spaced for Fourier interpolation.
+
+    Examples
+    --------
+    >>> dense = interpolate_bands(load_band("band.h5", projections=False), factor=8)
+    >>> df = dense.to_polars(mode=0)
+    """
+    if method not in INTERPOLATIONS:
+        raise ValueError(f"{method=} must be one of {INTERPOLATIONS}")
+    if factor < 1:
+        raise ValueError(f"{factor=} must be at least 1")
+    energies = np.asarray(band.energies, dtype=float)
+    nspin, nband, _ = energies.shape
+    distances, segments = kpath_segments(band)
+    kpoints = np.asarray(band.kpoints, dtype=float)
+
+    parts: dict[str, list[np.ndarray]] = {
+        "energies": [],
+        "distances": [],
+        "kpoints": [],
+        "labels": [],
+    }
+    with stage("interpolate_bands", energies.nbytes * factor):
+        for seg in segments:
+            x = distances[seg]
+            # fractional position of every dense point on the original points
+            position = np.arange((len(x) - 1) * factor + 1) / factor
+            left = np.minimum(position.astype(int), max(len(x) - 2, 0))
+            frac = position - left
+            right = np.minimum(left + 1, len(x) - 1)
+            dense = x[left] + frac * (x[right] - x[left])
+            y = energies[..., seg].reshape(nspin * nband, len(x))
+            if len(x) < 2:
+                values = y
+            elif method == "spline":
+                values = _spline(x, y, dense)
+            else:
+                values = _fourier(x, y, len(dense))
+            labels = np.full(len(dense), "", dtype=object)
+            labels[::factor] = np.asarray(band.labels)[seg]
+            parts["energies"].append(values.reshape(nspin, nband, -1))
+            parts["distances"].append(dense)
+            parts["kpoints"].append(
+                kpoints[seg][left] + frac[:, None] * (kpoints[seg][right] - kpoints[seg][left])
+            )
+            parts["labels"].append(labels)
+
+    kpath = {
+        "kpoints": np.concatenate(parts["kpoints"]),
+        "distances": np.concatenate(parts["distances"]),
+        "labels": np.concatenate(parts["labels"]).astype(str),
+    }
+    info = {
+        "efermi": band.efermi,
+        "spin_type": band.spin_type,
+        "projected": band.projected,
+        "first_band": band.first_band,
+    }
+    return BandStructure(np.concatenate(parts["energies"], axis=-1), None, kpath, band.axes, info)
+
+
+@logger.catch
+def _spline(x: np.ndarray, y: np.ndarray, dense: np.ndarray) -> np.ndarray:
+    """Evaluate cubic splines through the rows of ``y`` at the ``dense`` positions."""
+    n = len(x)
+    h = np.diff(x)
+    # second derivatives at the knots solve one system shared by every row
+    system = np.zeros((n, n))
+    rhs = np.zeros((n, len(y)))
+    inner = np.arange(1, n - 1)
+    system[inner, inner - 1] = h[:-1]
+    system[inner, inner] = 2 * (h[:-1] + h[1:])
+    system[inner, inner + 1] = h[1:]
+    slopes = np.diff(y, axis=1) / h
+    rhs[inner] = 6 * (slopes[:, 1:] - slopes[:, :-1]).T
+    if n < 4:
+        # natural ends
+        system[0, 0] = system[-1, -1] = 1.0
+    else:
+        # not-a-knot ends, the third derivative is continuous at the second knots
+        system[0, :3] = [h[1], -(h[0] + h[1]), h[0]]
+        system[-1, -3:] = [h[-1], -(h[-2] + h[-1]), h[-2]]
+    second = np.linalg.solve(system, rhs).T
+
+    i = np.clip(np.searchsorted(x, dense, side="right") - 1, 0, n - 2)
+    step = h[i]
+    after = dense - x[i]
+    before = x[i + 1] - dense
+    return (
+        second[:, i] * before**3 / (6 * step)
+        + second[:, i + 1] * after**3 / (6 * step)
+        + (y[:, i] / step - second[:, i] * step / 6) * before
+        + (y[:, i + 1] / step - second[:, i + 1] * step / 6) * after
+    )
+
+
+@logger.catch
+def _fourier(x: np.ndarray, y: np.ndarray, npoints: int) -> np.ndarray:
+    """Interpolate evenly spaced rows of ``y`` onto ``npoints`` by a mirrored cosine series."""
+    steps = np.diff(x)
+    if not np.allclose(steps, steps.mean(), rtol=_UNIFORM_RTOL):
+        raise ValueError("Fourier interpolation needs evenly spaced k-points in every segment")
+    n = y.shape[1]
+    # even extension of period 2 (n - 1), then zero padding to period 2 (npoints - 1)
+    period, dense_period = 2 * (n - 1), 2 * (npoints - 1)
+    spectrum = np.fft.rfft(np.concatenate([y, y[:, -2:0:-1]], axis=1), axis=1)
+    if dense_period > period:
+        # the Nyquist term is shared between positive and negative frequencies
+        spectrum[:, -1] /= 2
+    values = np.fft.irfft(spectrum, dense_period, axis=1) * (dense_period / period)
+    return values[:, :npoints]
@@ -0,0 +1,48 @@
+"""Cartesian distances and segments of a band structure k-path."""
+
+from itertools import pairwise
+
+import numpy as np
+from loguru import logger
+
+from ddpc.io.band import BandStructure
+
+# consecutive k-points closer than this (1/Angstrom or fractional) are one point
+_SAME_KPOINT = 1e-8
+
+
+@logger.catch
+def kpath_segments(
+    band: BandStructure, lattice: np.ndarray | None = None
+) -> tuple[np.ndarray, list[slice]]:
+    """Split the k-path of a band structure into its straight segments.
+
+    DS-PAW repeats the high-symmetry point that ends one segment at the start
+    of the next; the path is cut between such repeated k-points.
+
+    Parameters
+    ----------
+    band : BandStructure
+        Loaded band structure, see :func:`ddpc.io.band.load_band`.
+    lattice : numpy.ndarray, optional
+        Real-space lattice vectors as rows, in Angstrom. DS-PAW k-points are
+        fractional, so the lattice is needed for distances in 1/Angstrom
+        (including the factor 2 pi); without it the cumulative distances of
+        the band structure are used as they are.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, list of slice)
+        Cumulative distance of every k-point along the path, and the
+        k-point positions of every segment.
+    """
+    if lattice is None:
+        distances = np.asarray(band.distances, dtype=float)
+        steps = np.diff(distances)
+    else:
+        reciprocal = 2 * np.pi * np.linalg.inv(np.asarray(lattice, dtype=float)).T
+        steps = np.linalg.norm(np.diff(band.kpoints @ reciprocal, axis=0), axis=1)
+        distances = np.concatenate([[0.0], np.cumsum(steps)])
+    cuts = np.flatnonzero(steps < _SAME_KPOINT) + 1
+    bounds = [0, *cuts.tolist(), len(distances)]
+    return distances, [slice(start, stop) for start, stop in pairwise(bounds) if stop > start]
@@ -1,7 +1,7 @@
 """Read band data from output files."""
 
-import sys
-from json import load
+import json
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 
 import h5py
@@ -9,12 +9,32 @@ import numpy as np
 import polars as pl
 from loguru import logger
 
+from ddpc.io.batch import read_many
+from ddpc.io.cache import CACHE_CONFIG, cache_key, fetch_entry, store_entry
+from ddpc.io.instrument import add_bytes, stage
+from ddpc.io.jsonio import JsonArrays, _skeleton, load_json_skeleton
+from ddpc.io.projection import (
+    BAND_MODES,
+    aggregate,
+    aggregate_chunked,
+    memory_budget,
+    merge_atoms,
+    merge_channels,
+    mode_rule,
+    projection_axes,
+)
+from ddpc.io.symmetry import merge_equivalent
 from ddpc.io.utils import (
-    _format_float_columns_as_str_mapelements,
-    _get_ao_spin,
-    _inplace_update_data,
-    _split_atomindex_orbital,
+    _deprecated,
+    _energy_bands,
+    _read_h5_segments,
+    _select_axes,
+    _select_projections,
+    _select_spins,
+    _select_window,
+    _window_segments,
     absf,
+    format_float_columns,
     get_h5_str,
 )
 
@@ -22,8 +42,10 @@ from ddpc.io.utils import (
 @logger.catch
 def read_band(
     p: str | Path,
-    mode: int = 5,
-    fmt: str = "8.3f",
+    mode: int | dict = 5,
+    fmt: str | None = "8.3f",
+    select: dict | None = None,
+    layout: str = "wide",
 ) -> tuple[pl.DataFrame, float, bool]:
     """Read and process electronic band structure data from HDF5 or JSON files.
 
@@ -36,13 +58,44 @@ def read_band(
     p : str or pathlib.Path
         Path to the band structure data file. Supported formats are HDF5 (.h5)
         and JSON (.json) files from DFT calculations.
-    mode : int, default 5
+    mode : int or dict, default 5
         Projection mode for projected band structure data. Only relevant when
         the file contains orbital-projected information. Different modes
-        correspond to different orbital groupings (s, p, d, f, etc.).
-    fmt : str, default "8.3f"
+        correspond to different orbital groupings (s, p, d, f, etc.). A dict
+        of named channel groups, e.g. ``{"Fe-d": "1-8 Fe d"}``, builds one
+        channel per group, see :func:`ddpc.io.projection.compile_groups`.
+    fmt : str or None, default "8.3f"
         Format string for floating-point number display in the output DataFrame.
-        Controls decimal precision and field width for pretty printing.
+        Controls decimal precision and field width for pretty printing. Use
+        None to keep native float columns for further numeric work; they can
+        be formatted later with :func:`ddpc.io.utils.format_float_columns`.
+    select : dict, optional
+        Projection selectors, any of:
+
+        - ``"atoms"``: 1-based indices of the atoms to read
+        - ``"elements"``: element symbols to read, e.g. ``["Fe"]``
+        - ``"orbitals"``: orbitals to read; shell names (``"d"``) select every
+          orbital of the shell, full names (``"dxy"``) select one
+        - ``"spins"``: spin channels to read for collinear data, ``"up"``
+          and/or ``"down"``
+        - ``"bands"``, ``"kpoints"``: ``(first, last)`` 1-based inclusive
+          range of bands or k-points to read
+        - ``"energies"``: ``(emin, emax)`` inclusive energy window in eV;
+          bands that never enter it, at any selected spin and k-point, are
+          dropped before their projections are read
+        - ``"relative_to_fermi"``: whether ``"energies"`` is relative to
+          the Fermi energy, default False
+        - ``"equivalent"``: ``"sum"`` or ``"average"`` the projections of
+          symmetry-equivalent atoms (see
+          :func:`ddpc.io.symmetry.equivalent_atoms`), so modes 4 and 5 have
+          one channel per orbit, named after its first atom
+        - ``"symprec"``: symmetry precision of ``"equivalent"`` in Angstrom,
+          default 1e-3
+    layout : {"wide", "long"}, default "wide"
+        ``"wide"`` returns one column per band (and channel). ``"long"``
+        returns one row per k-point, band and spin (and channel) with columns
+        ``kpoint, band, spin, energy`` (plus ``channel`` and ``weight`` for
+        projected data), which stays narrow for large projected files.
 
     Returns
     -------
@@ -56,6 +109,8 @@ def read_band(
     ------
     TypeError
         If the input file is neither HDF5 nor JSON format.
+    ValueError
+        If ``layout`` is neither "wide" nor "long".
 
     Notes
     -----
@@ -64,51 +119,596 @@ def read_band(
     parameter determines which orbital contributions are included in the output.
     The DataFrame includes k-point coordinates, distances, and band energies,
     with spin-polarized calculations having separate up/down columns.
+
+    The selectors are applied before any projection dataset is read, so only
+    the matching projections are loaded. Use :func:`load_band` to keep the
+    arrays in a :class:`BandStructure` instead.
+
+    When a memory budget is set with
+    :func:`ddpc.io.projection.set_memory_budget` or ``$DDPC_MEMORY_BUDGET``,
+    projections are streamed into their channels by :func:`load_band_channels`
+    and the cache is not used.
     """
-    absfile = str(absf(p))
+    with stage("read_band"):
+        if mode != 0 and memory_budget() is not None:
+            band = load_band_channels(p, mode, select)
+        else:
+            band = load_band(p, select, projections=mode != 0)
+        df = band.to_polars(mode, layout)
+        if fmt is not None:
+            with stage("format"):
+                df = format_float_columns(df, fmt)
 
-    if absfile.endswith(".h5"):
-        df, efermi, isproj = read_band_h5(absfile, mode)
-    elif absfile.endswith(".json"):
-        df, efermi, isproj = read_band_json(absfile, mode)
-    else:
-        raise TypeError(f"{absfile} must be h5 or json file!")
+    return df, band.efermi, band.projected
+
+
+@logger.catch
+def read_band_modes(
+    p: str | Path,
+    modes: tuple[int, ...] = tuple(BAND_MODES),
+    fmt: str | None = "8.3f",
+    select: dict | None = None,
+    layout: str = "wide",
+) -> tuple[dict[int, pl.DataFrame], float, bool]:
+    """Read a band structure file once and build the frames of several modes.
 
-    df = _format_float_columns_as_str_mapelements(df, fmt)
+    Calling :func:`read_band` once per mode re-opens the file and re-reads
+    every projection each time. This function loads the file a single time
+    and shares the raw projection arrays between all requested modes.
 
-    return df, efermi, isproj
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the band structure data file, HDF5 (.h5) or JSON (.json).
+    modes : tuple of int, default all modes of :data:`ddpc.io.projection.BAND_MODES`
+        Projection modes to build, 0 gives the total bands.
+    fmt : str or None, default "8.3f"
+        Format string for float columns, None keeps native floats, see
+        :func:`read_band`.
+    select : dict, optional
+        Projection selectors, see :func:`read_band`.
+    layout : {"wide", "long"}, default "wide"
+        Output layout, see :func:`read_band`.
+
+    Returns
+    -------
+    tuple of (dict of int to polars.DataFrame, float, bool)
+
+        - DataFrame of every requested mode, in request order
+        - Fermi energy in eV
+        - Boolean indicating whether the data contains orbital projections
+
+    Examples
+    --------
+    >>> frames, efermi, isproj = read_band_modes("band.h5", modes=(1, 2))
+    >>> frames[2]
+    """
+    with stage("read_band_modes"):
+        data = load_band(p, select, projections=any(mode != 0 for mode in modes))
+        frames = {}
+        for mode in modes:
+            df = data.to_polars(mode, layout)
+            if fmt is not None:
+                with stage("format"):
+                    df = format_float_columns(df, fmt)
+            frames[mode] = df
+
+    return frames, data.efermi, data.projected
 
 
 @logger.catch
-def read_band_h5(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
-    """Read band structure data from HDF5 file format.
+def read_band_many(
+    paths: str | Path | Iterable[str | Path],
+    workers: int | None = None,
+    ordered: bool = True,
+    **kwargs,
+) -> Iterator[tuple[Path, tuple | None, str | None]]:
+    """Read many band structure files in parallel with :func:`read_band`.
+
+    The files are read by a pool of ``workers`` processes; results are
+    streamed back so only a few frames are held in memory at a time. A file
+    that cannot be read is reported with its error and the others still are.
+    Workers are spawned, so scripts calling this function need an
+    ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+    paths : str, pathlib.Path or iterable of them
+        Glob pattern such as ``"runs/**/band.h5"``, or the files to read.
+    workers : int, optional
+        Number of worker processes, defaults to the CPU count. One worker
+        reads the files in the calling process.
+    ordered : bool, default True
+        Yield results in the order of ``paths``; otherwise yield each result
+        as soon as its file is read.
+    **kwargs
+        Keyword arguments of :func:`read_band`, e.g. ``mode``, ``fmt``,
+        ``select`` or ``layout``.
+
+    Yields
+    ------
+    tuple of (pathlib.Path, tuple or None, str or None)
+        Path of the file, the ``(df, efermi, isproj)`` tuple of
+        :func:`read_band` (None on failure) and the error message (None on
+        success).
+
+    Examples
+    --------
+    >>> for path, result, error in read_band_many("runs/*/band.h5", workers=8, fmt=None):
+    ...     if error is not None:
+    ...         print(path, error)
+    """
+    yield from read_many(read_band, paths, workers, ordered, kwargs)
 
-    This function processes HDF5 files containing electronic band structure
-    data from DFT calculations, handling both total and projected band
-    structures with proper metadata extraction.
+
+class BandStructure:
+    """Band energies and orbital projections of one band structure calculation.
+
+    The container keeps the arrays as read from the file, so analysis code can
+    work on contiguous NumPy arrays and only build DataFrames on demand with
+    :meth:`to_polars`.
 
     Parameters
     ----------
-    absfile : str or pathlib.Path
-        Path to the HDF5 band structure file (typically with .h5 extension).
-    mode : int
-        Projection mode for orbital-projected band structure data. Mode 0
-        forces total band structure regardless of projection availability.
+    energies : numpy.ndarray
+        Band energies of shape ``(spin, band, kpoint)`` in eV.
+    projections : numpy.ndarray or None
+        Orbital projections of shape ``(spin, atom, orbital, band, kpoint)``,
+        None when the file has no projections or they were not loaded.
+    kpath : dict
+        ``kpoints`` (``(kpoint, 3)`` coordinates), ``distances`` (cumulative
+        path length) and ``labels`` (high-symmetry labels, empty elsewhere).
+    axes : dict
+        ``spins``, ``atoms``, ``elements`` and ``orbitals`` labelling the spin,
+        atom and orbital axes, see :func:`ddpc.io.projection.projection_axes`.
+    info : dict
+        ``efermi`` (Fermi energy in eV), ``spin_type`` ("none", "collinear"
+        or "noncollinear") and ``projected`` (whether the file holds
+        projections). Optional ``first_band`` and ``first_kpoint`` give the
+        1-based index of the first band and k-point when only a window of
+        the file was read.
+
+    Attributes
+    ----------
+    energies, projections, kpoints, distances, labels : numpy.ndarray
+        Arrays described above; ``labels`` is a list of str.
+    spins, atoms, elements, orbitals : list
+        Labels of the spin, atom and orbital axes. Without projections
+        ``atoms`` and ``elements`` describe the whole structure and
+        ``orbitals`` is empty.
+    efermi : float
+        Fermi energy in eV.
+    spin_type : str
+        Spin treatment of the calculation.
+    projected : bool
+        Whether the source file contains orbital projections.
+    first_band, first_kpoint : int
+        1-based index of the first band and k-point of the arrays in the file.
+    channels : tuple or None
+        ``(mode, labels, weights)`` when the projections were aggregated
+        while reading, see :func:`load_band_channels`; ``weights`` has shape
+        ``(spin, channel, band, kpoint)``. Only ``mode`` can then be built.
+    """
+
+    __slots__ = (
+        "atoms",
+        "channels",
+        "distances",
+        "efermi",
+        "elements",
+        "energies",
+        "first_band",
+        "first_kpoint",
+        "kpoints",
+        "labels",
+        "orbitals",
+        "projected",
+        "projections",
+        "spin_type",
+        "spins",
+    )
+
+    def __init__(
+        self,
+        energies: np.ndarray,
+        projections: np.ndarray | None,
+        kpath: dict,
+        axes: dict,
+        info: dict,
+    ) -> None:
+        """Store the arrays of a band structure, see the class docstring."""
+        self.energies = energies
+        self.projections = projections
+        self.kpoints = kpath["kpoints"]
+        self.distances = kpath["distances"]
+        self.labels = kpath["labels"]
+        self.spins = axes["spins"]
+        self.atoms = axes["atoms"]
+        self.elements = axes["elements"]
+        self.orbitals = axes["orbitals"]
+        self.efermi = info["efermi"]
+        self.spin_type = info["spin_type"]
+        self.projected = info["projected"]
+        self.first_band = info.get("first_band", 1)
+        self.first_kpoint = info.get("first_kpoint", 1)
+        self.channels: tuple[int | dict, list[tuple[str, str]], np.ndarray] | None = None
+
+    def __repr__(self) -> str:
+        """Summarise the array shapes."""
+        nspin, nband, nkpt = self.energies.shape
+        return (
+            f"BandStructure(nspin={nspin}, nband={nband}, nkpt={nkpt}, "
+            f"spin_type={self.spin_type!r}, projected={self.projections is not None})"
+        )
+
+    @property
+    def axes(self) -> dict:
+        """Labels of the spin, atom and orbital axes of :attr:`projections`."""
+        return {
+            "spins": self.spins,
+            "atoms": self.atoms,
+            "elements": self.elements,
+            "orbitals": self.orbitals,
+        }
+
+    def subset(self, select: dict | None = None) -> "BandStructure":
+        """Select spins, atoms, orbitals, bands and k-points of a loaded band structure.
+
+        Parameters
+        ----------
+        select : dict, optional
+            Selectors, see :func:`read_band`. ``"atoms"``, ``"bands"`` and
+            ``"kpoints"`` refer to indices in the file. None returns the band
+            structure itself.
+
+        Returns
+        -------
+        BandStructure
+            Band structure restricted to the selection, sharing memory with
+            this one where possible.
+
+        Raises
+        ------
+        ValueError
+            If the selection reaches outside the loaded arrays, or selects
+            atoms or orbitals of aggregated :attr:`channels`.
+        """
+        if not select:
+            return self
+        if self.channels is not None and any(
+            select.get(key) is not None for key in ("atoms", "elements", "orbitals")
+        ):
+            raise ValueError("cannot select atoms or orbitals of aggregated channels")
+        projected = self.projections is not None
+        sidx, ais, ois, axes = _select_axes(self.axes, self.spin_type, select, projected)
+        _, nband, nkpt = self.energies.shape
+        bs = _select_window(select, "bands", nband, self.first_band)
+        ks = _select_window(select, "kpoints", nkpt, self.first_kpoint)
+        eb = _energy_bands(self.energies[sidx][:, bs, ks], select, self.efermi)
+        bs = slice(bs.start + eb.start, bs.start + eb.stop)
+        projections = None
+        if self.projections is not None:
+            projections = self.projections[np.ix_(sidx, ais, ois)][..., bs, ks]
+        kpath = {
+            "kpoints": self.kpoints[ks],
+            "distances": self.distances[ks],
+            "labels": self.labels[ks],
+        }
+        info = {
+            "efermi": self.efermi,
+            "spin_type": self.spin_type,
+            "projected": self.projected,
+            "first_band": self.first_band + bs.start,
+            "first_kpoint": self.first_kpoint + ks.start,
+        }
+        band = BandStructure(self.energies[sidx][:, bs, ks], projections, kpath, axes, info)
+        if self.channels is not None:
+            mode, labels, weights = self.channels
+            band.channels = (mode, labels, weights[sidx][..., bs, ks])
+        return band
+
+    def merge_atoms(self, equivalent: np.ndarray, how: str = "sum") -> "BandStructure":
+        """Merge the projections of symmetry-equivalent atoms.
+
+        Parameters
+        ----------
+        equivalent : numpy.ndarray
+            0-based representative atom of every atom of the file, see
+            :func:`ddpc.io.symmetry.equivalent_atoms`.
+        how : {"sum", "average"}, default "sum"
+            Whether the atoms of an orbit are summed or averaged.
+
+        Returns
+        -------
+        BandStructure
+            Band structure with one entry per orbit along the atom axis,
+            labelled by the id of its first atom. Aggregated
+            :attr:`channels` of atom modes are merged the same way.
+
+        Raises
+        ------
+        ValueError
+            If aggregated channels of an element mode are to be averaged,
+            or aggregated channels are channel groups.
+        """
+        projections, axes = merge_atoms(self.projections, self.axes, equivalent, how)
+        kpath = {"kpoints": self.kpoints, "distances": self.distances, "labels": self.labels}
+        info = {
+            "efermi": self.efermi,
+            "spin_type": self.spin_type,
+            "projected": self.projected,
+            "first_band": self.first_band,
+            "first_kpoint": self.first_kpoint,
+        }
+        band = BandStructure(self.energies, projections, kpath, axes, info)
+        if self.channels is not None:
+            mode, labels, weights = self.channels
+            rule = mode_rule(mode, BAND_MODES)
+            if isinstance(rule, dict):
+                raise ValueError("cannot merge equivalent atoms of streamed channel groups")
+            if rule[0] == "atom":
+                labels, weights = merge_channels(labels, weights, equivalent, how)
+            elif how != "sum":
+                raise ValueError(f"cannot average equivalent atoms in the channels of {mode=}")
+            band.channels = (mode, labels, weights)
+        return band
+
+    def to_polars(self, mode: int | dict = 5, layout: str = "wide") -> pl.DataFrame:
+        """Build a DataFrame view of the band structure.
+
+        Parameters
+        ----------
+        mode : int or dict, default 5
+            Projection mode, a key of :data:`ddpc.io.projection.BAND_MODES`,
+            or channel groups, see :func:`read_band`. Mode 0, or a band
+            structure without projections, gives total bands.
+        layout : {"wide", "long"}, default "wide"
+            Output layout, see :func:`read_band`.
+
+        Returns
+        -------
+        polars.DataFrame
+            Band structure with native float columns. The wide layout starts
+            with ``label, kx, ky, kz, dist`` followed by ``band{b}[-{spin}]``
+            or ``band{b}-{channel}[-{spin}]`` columns.
+
+        Raises
+        ------
+        ValueError
+            If ``layout`` is neither "wide" nor "long".
+        RuntimeError
+            If ``mode`` is not a supported projection mode, or not the mode
+            of :attr:`channels`.
+        """
+        with stage("dataframe"):
+            if layout not in ("wide", "long"):
+                raise ValueError(f"{layout=} must be 'wide' or 'long'")
+            total = mode == 0 or (self.projections is None and self.channels is None)
+            channels = None if total else self._aggregate(mode)
+            if layout == "long":
+                df = _long_band(self.energies, self.spins, channels)
+                if (self.first_band, self.first_kpoint) == (1, 1):
+                    return df
+                return df.with_columns(
+                    pl.col("kpoint") + (self.first_kpoint - 1),
+                    pl.col("band") + (self.first_band - 1),
+                )
+
+            data = {
+                "label": self.labels,
+                "kx": self.kpoints[:, 0],
+                "ky": self.kpoints[:, 1],
+                "kz": self.kpoints[:, 2],
+                "dist": self.distances,
+            }
+            if channels is None:
+                # only collinear system has Spin2
+                for si, updown in enumerate(self.spins):
+                    for i in range(self.energies.shape[1]):
+                        b = self.first_band + i
+                        key = f"band{b}-{updown}" if updown else f"band{b}"
+                        data[key] = self.energies[si, i]
+            else:
+                labels, weights = channels
+                data.update(_refactor_band(labels, weights, self.spins, self.first_band))
+            return pl.DataFrame(data)
+
+    def _aggregate(self, mode: int | dict) -> tuple[list[tuple[str, str]], np.ndarray]:
+        """Return the channel labels and ``(spin, channel, band, kpoint)`` weights of a mode."""
+        if self.channels is not None:
+            if self.channels[0] != mode:
+                raise RuntimeError(f"projections were aggregated for mode {self.channels[0]}")
+            return self.channels[1], self.channels[2]
+        if self.projections is None:
+            raise RuntimeError("the band structure holds no projections")
+        return aggregate(self.projections, self.axes, mode_rule(mode, BAND_MODES))
+
+
+@logger.catch
+def load_band(
+    p: str | Path,
+    select: dict | None = None,
+    projections: bool = True,
+    cache: bool | None = None,
+) -> BandStructure:
+    """Load a band structure from an HDF5 or JSON file into a container.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the band structure data file, HDF5 (.h5) or JSON (.json).
+    select : dict, optional
+        Projection selectors, see :func:`read_band`.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
+        Skipping them makes total band reads of projected files cheap.
+    cache : bool, optional
+        Whether to use the on-disk cache of :mod:`ddpc.io.cache`, defaults to
+        its global setting. Cached entries hold the whole file; selectors
+        are applied to the memory-mapped arrays.
 
     Returns
     -------
-    tuple of (polars.DataFrame, float, bool)
+    BandStructure
+        Band energies, k-path, projections and metadata of the file.
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    """
+    with stage("load"):
+        absfile = str(absf(p))
+        if not (CACHE_CONFIG["enabled"] if cache is None else cache):
+            band, atom_info = _load_band_file(absfile, select, projections)
+            return merge_equivalent(band, absfile, select, atom_info)
+
+        # an entry with projections also serves total reads
+        for flag in (True,) if projections else (False, True):
+            with stage("cache"):
+                hit = fetch_entry(cache_key(absfile, f"band-{flag:d}"))
+            if hit is not None:
+                band = _band_from_cache(*hit).subset(select)
+                return merge_equivalent(band, absfile, select, hit[1].get("atom_info"))
+
+        band, atom_info = _load_band_file(absfile, None, projections)
+        with stage("cache"):
+            arrays, meta = _band_to_cache(band)
+            meta["atom_info"] = atom_info
+            store_entry(cache_key(absfile, f"band-{projections:d}"), arrays, meta)
+        return merge_equivalent(band.subset(select), absfile, select, atom_info)
+
+
+@logger.catch
+def load_band_channels(
+    p: str | Path, mode: int | dict = 5, select: dict | None = None, budget: int | None = None
+) -> BandStructure:
+    """Load a band structure, aggregating its projections while they are read.
+
+    The projection tensor is never held as a whole: chunks of atoms, or of
+    one atom and a window of bands, are read and summed into the channels of
+    ``mode`` by :func:`ddpc.io.projection.aggregate_chunked`. Peak memory is
+    then bounded by ``budget`` plus the energies and the channels themselves,
+    and for JSON files the text of the document.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the band structure data file, HDF5 (.h5) or JSON (.json).
+    mode : int or dict, default 5
+        Projection mode, a key of :data:`ddpc.io.projection.BAND_MODES`,
+        or channel groups, see :func:`read_band`.
+    select : dict, optional
+        Projection selectors, see :func:`read_band`.
+    budget : int, optional
+        Memory budget in bytes, defaults to
+        :func:`ddpc.io.projection.memory_budget`.
+
+    Returns
+    -------
+    BandStructure
+        Band structure without :attr:`~BandStructure.projections`, with
+        :attr:`~BandStructure.channels` set when the file is projected.
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    RuntimeError
+        If ``mode`` is not a supported projection mode.
+    """
+    mode_rule(mode, BAND_MODES)
+    with stage("load"):
+        absfile = str(absf(p))
+        band, atom_info = _load_band_file(absfile, select, True, (mode, budget))
+        return merge_equivalent(band, absfile, select, atom_info)
+
+
+def _load_band_file(
+    absfile: str,
+    select: dict | None,
+    projections: bool,
+    stream: tuple[int | dict, int | None] | None = None,
+) -> tuple[BandStructure, dict | None]:
+    """Dispatch to the HDF5 or JSON loader by file extension.
+
+    The ``AtomInfo`` section of a JSON file is returned along with the band
+    structure, so the ``"equivalent"`` selector does not parse the file again.
+    """
+    if absfile.endswith(".h5"):
+        return load_band_h5(absfile, select, projections, stream), None
+    if absfile.endswith(".json"):
+        band, arrays = _parse_band_json(absfile)
+        return _band_from_json(band, arrays, select, projections, stream), band.get("AtomInfo")
+    raise TypeError(f"{absfile} must be h5 or json file!")
+
+
+@logger.catch
+def _stream_channels(
+    band: BandStructure,
+    read: Callable[[slice, slice], np.ndarray],
+    shape: tuple[int, ...],
+    stream: tuple[int | dict, int | None],
+) -> BandStructure:
+    """Aggregate projections read chunk by chunk into the channels of a band structure.
 
-        - DataFrame containing processed band structure data
-        - Fermi energy in eV extracted from the file
-        - Boolean indicating presence of orbital projection data
+    Parameters
+    ----------
+    band : BandStructure
+        Band structure without projections, with the axes of the selection.
+    read : callable
+        ``read(atoms, bands)`` returns the ``(spin, atom, orbital, band,
+        kpoint)`` projections of the selected atoms and bands, positions
+        relative to the selection.
+    shape : tuple of int
+        Shape of the whole selected projection tensor.
+    stream : tuple of (int or dict, int or None)
+        Projection mode and memory budget.
+
+    Returns
+    -------
+    BandStructure
+        ``band`` with :attr:`~BandStructure.channels` set.
+    """
+    mode, budget = stream
+    labels, weights = aggregate_chunked(read, shape, band.axes, mode_rule(mode, BAND_MODES), budget)
+    band.channels = (mode, labels, weights)
+    return band
+
+
+@logger.catch
+def load_band_h5(
+    absfile: str,
+    select: dict | None = None,
+    projections: bool = True,
+    stream: tuple[int | dict, int | None] | None = None,
+) -> BandStructure:
+    """Load a band structure from an HDF5 file.
+
+    Parameters
+    ----------
+    absfile : str
+        Path to the HDF5 band structure file (typically with .h5 extension).
+    select : dict, optional
+        Projection selectors, see :func:`read_band`. Datasets outside the
+        selection are never read, and only the band and k-point window of
+        the selected datasets is read through one hyperslab selection.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
+    stream : tuple of (int or dict, int or None), optional
+        Projection mode and memory budget; the projections are then
+        aggregated chunk by chunk, see :func:`load_band_channels`.
+
+    Returns
+    -------
+    BandStructure
+        Band energies, k-path, projections and metadata of the file.
 
     Raises
     ------
     TypeError
-        If the HDF5 file doesn't contain the required 'BandInfo' group.
-    SystemExit
-        If critical metadata (Fermi energy or projection info) cannot be read.
+        If the HDF5 file doesn't contain the required 'BandInfo' group, or if
+        critical metadata (Fermi energy or projection info) cannot be read.
 
     Notes
     -----
@@ -117,480 +717,502 @@ def read_band_h5(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
     - /BandInfo/EFermi: Fermi energy value
     - /BandInfo/IsProject: Boolean indicating orbital projections
     - Band energy datasets organized by spin channels
-
-    For projected data, the mode parameter determines which orbital
-    contributions are included in the final DataFrame.
+    - /BandInfo/Spin{s}/ProjectBand/1/{atom}/{orbital}: projections
     """
     with h5py.File(absfile, "r") as band:
         bandinfo = band["BandInfo"]
-        if isinstance(bandinfo, h5py.Group):
-            efermi_list = bandinfo["EFermi"]
-            if isinstance(efermi_list, h5py.Dataset):
-                efermi = efermi_list[0]
-            else:
-                logger.error("cannot read /BandInfo/EFermi")
-                sys.exit(1)
-
-            proj = bandinfo["IsProject"]
-            if isinstance(proj, h5py.Dataset):
-                iproj = proj[0]
-            else:
-                logger.error("cannot read /BandInfo/IsProject")
-                sys.exit(1)
+        if not isinstance(bandinfo, h5py.Group):
+            raise TypeError("h5 file must contain 'BandInfo' group!")
 
-            if mode == 0:
-                df = read_tband(band)
-            elif iproj:
-                df = read_pband_h5(band, mode)
-            else:
-                df = read_tband(band)
+        efermi_list = bandinfo["EFermi"]
+        if isinstance(efermi_list, h5py.Dataset):
+            efermi = efermi_list[0]
         else:
-            raise TypeError("h5 file must contain 'BandInfo' group!")
+            raise TypeError("cannot read /BandInfo/EFermi")
 
-    return df, efermi, bool(iproj)
+        proj = bandinfo["IsProject"]
+        if isinstance(proj, h5py.Dataset):
+            iproj = bool(proj[0])
+        else:
+            raise TypeError("cannot read /BandInfo/IsProject")
+
+        kpath, nkpt, nband, spin_type = _kpath(band)
+        bs = _select_window(select, "bands", nband)
+        ks = _select_window(select, "kpoints", nkpt)
+        kpath = {key: value[ks] for key, value in kpath.items()}
+        spins = _select_spins(spin_type == "collinear", select)
+        energies = _band_energies(band, spins, nband, nkpt)
+        add_bytes(energies.nbytes)
+        # bands outside the energy window are dropped before any projection is read
+        eb = _energy_bands(energies[:, bs, ks], select, efermi)
+        bs = slice(bs.start + eb.start, bs.start + eb.stop)
+        energies = np.ascontiguousarray(energies[:, bs, ks])
+        elements: list[str] = get_h5_str(band, "/AtomInfo/Elements")
+        info = {
+            "efermi": efermi,
+            "spin_type": spin_type,
+            "projected": iproj,
+            "first_band": bs.start + 1,
+            "first_kpoint": ks.start + 1,
+        }
+        if not (iproj and projections):
+            axes = projection_axes(spins, list(range(len(elements))), [], elements, [])
+            return BandStructure(energies, None, kpath, axes, info)
+
+        orbits: list[str] = get_h5_str(band, "/BandInfo/Orbit")
+        norb: int = band["/BandInfo/Spin1/ProjectBand/OrbitIndexs"][0]
+        ais, ois = _select_projections(elements, orbits[:norb], select)
+        axes = projection_axes(spins, ais, ois, elements, orbits)
+
+        def read(atoms: slice, bands: slice) -> np.ndarray:
+            # projections are stored band-fastest, i.e. as (nkpt, nband) in C order
+            bands = slice(bs.start + bands.start, bs.start + bands.stop)
+            segments = _window_segments(nband, ks, bands)
+            nk, nb = ks.stop - ks.start, bands.stop - bands.start
+            chunk = np.empty((len(spins), len(ais[atoms]), len(ois), nk, nb))
+            with stage("projections", chunk.nbytes):
+                for si, (ispin, _) in enumerate(spins):
+                    for i, ai in enumerate(ais[atoms]):
+                        for j, oi in enumerate(ois):
+                            dataset = band[f"/BandInfo/Spin{ispin}/ProjectBand/1/{ai + 1}/{oi + 1}"]
+                            _read_h5_segments(dataset, segments, chunk[si, i, j])
+            return chunk.swapaxes(-1, -2)
+
+        shape = (len(spins), len(ais), len(ois), bs.stop - bs.start, ks.stop - ks.start)
+        if stream is not None:
+            result = BandStructure(energies, None, kpath, axes, info)
+            return _stream_channels(result, read, shape, stream)
+        proj = np.ascontiguousarray(read(slice(0, len(ais)), slice(0, shape[3])))
+
+    return BandStructure(energies, proj, kpath, axes, info)
 
 
 @logger.catch
-def read_band_json(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
-    """Read band structure data from JSON file format.
-
-    This function processes JSON files containing electronic band structure
-    data from DFT calculations, providing an alternative to HDF5 format
-    with the same functionality for band structure analysis.
+def load_band_json(
+    absfile: str,
+    select: dict | None = None,
+    projections: bool = True,
+    stream: tuple[int | dict, int | None] | None = None,
+) -> BandStructure:
+    """Load a band structure from a JSON file.
 
     Parameters
     ----------
-    absfile : str or pathlib.Path
+    absfile : str
         Path to the JSON band structure file (typically with .json extension).
-    mode : int
-        Projection mode for orbital-projected band structure data. Mode 0
-        forces total band structure regardless of projection availability.
+    select : dict, optional
+        Projection selectors, see :func:`read_band`. Only the numbers inside
+        the band and k-point window are parsed.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
+    stream : tuple of (int or dict, int or None), optional
+        Projection mode and memory budget; the projections are then
+        decoded and aggregated chunk by chunk, see :func:`load_band_channels`.
 
     Returns
     -------
-    tuple of (polars.DataFrame, float, bool)
-
-        - DataFrame containing processed band structure data
-        - Fermi energy in eV extracted from the file
-        - Boolean indicating presence of orbital projection data
+    BandStructure
+        Band energies, k-path, projections and metadata of the file.
 
     Notes
     -----
     The function expects JSON files with the same logical structure as HDF5
-    files but in JSON format. The data organization includes:
+    files. ``Contribution`` arrays are cut out before parsing and decoded
+    straight into the projection buffer, see
+    :func:`ddpc.io.jsonio.load_json_skeleton`. JSON format may be preferred
+    for smaller datasets or when HDF5 is not available, though it's generally
+    less efficient for large band structures.
+    """
+    band, arrays = _parse_band_json(absfile)
+    return _band_from_json(band, arrays, select, projections, stream)
 
-    - BandInfo/EFermi: Fermi energy value
-    - BandInfo/IsProject: Boolean indicating orbital projections
-    - Band energy arrays organized by spin channels
 
-    JSON format may be preferred for smaller datasets or when HDF5 is not
-    available, though it's generally less efficient for large band structures.
-    """
-    with open(absfile, encoding="utf-8") as fin:
-        band = load(fin)
-        efermi = band["BandInfo"]["EFermi"]
-
-    iproj = band["BandInfo"]["IsProject"]
-    if mode == 0:
-        df = read_tband(band, h5=False)
-    elif iproj:
-        df = read_pband_json(band, mode)
-    else:
-        df = read_tband(band, h5=False)
+def _parse_band_json(absfile: str) -> tuple[dict, JsonArrays]:
+    """Parse the skeleton of a band structure JSON file, see :func:`load_band_json`."""
+    with stage("parse"):
+        band, arrays = load_json_skeleton(absfile)
+        add_bytes(len(arrays.buffer))
+    return band, arrays
+
 
-    return df, efermi, bool(iproj)
+@logger.catch
+def _band_from_json(
+    band: dict,
+    arrays: JsonArrays,
+    select: dict | None,
+    projections: bool,
+    stream: tuple[int | dict, int | None] | None,
+) -> BandStructure:
+    """Build a band structure from a parsed JSON skeleton, see :func:`load_band_json`."""
+    kpath, nkpt, nband, spin_type = _kpath(band, h5=False)
+    bs = _select_window(select, "bands", nband)
+    ks = _select_window(select, "kpoints", nkpt)
+    kpath = {key: value[ks] for key, value in kpath.items()}
+    spins = _select_spins(spin_type == "collinear", select)
+    energies = _band_energies(band, spins, nband, nkpt)
+    # bands outside the energy window are dropped before any projection is parsed
+    eb = _energy_bands(energies[:, bs, ks], select, band["BandInfo"]["EFermi"])
+    bs = slice(bs.start + eb.start, bs.start + eb.stop)
+    energies = np.ascontiguousarray(energies[:, bs, ks])
+    elements: list[str] = [atom["Element"] for atom in band["AtomInfo"]["Atoms"]]
+    iproj = bool(band["BandInfo"]["IsProject"])
+    info = {
+        "efermi": band["BandInfo"]["EFermi"],
+        "spin_type": spin_type,
+        "projected": iproj,
+        "first_band": bs.start + 1,
+        "first_kpoint": ks.start + 1,
+    }
+    if not (iproj and projections):
+        axes = projection_axes(spins, list(range(len(elements))), [], elements, [])
+        return BandStructure(energies, None, kpath, axes, info)
+
+    orbits: list[str] = band["BandInfo"]["Orbit"]
+    ais, ois = _select_projections(elements, orbits, select)
+    index = {(ai + 1, oi + 1): (i, j) for i, ai in enumerate(ais) for j, oi in enumerate(ois)}
+    axes = projection_axes(spins, ais, ois, elements, orbits)
+    # placeholder of the Contribution array of every (spin, atom, orbital)
+    entries = {}
+    for si, (ispin, _) in enumerate(spins):
+        for p in band["BandInfo"][f"Spin{ispin}"]["ProjectBand"]:
+            ij = index.get((p["AtomIndex"], p["OrbitIndex"]))
+            if ij is not None:
+                entries[(si, *ij)] = p["Contribution"]
+
+    def read(atoms: slice, bands: slice) -> np.ndarray:
+        # projections are stored band-fastest, i.e. as (nkpt, nband) in C order
+        bands = slice(bs.start + bands.start, bs.start + bands.stop)
+        nk, nb = ks.stop - ks.start, bands.stop - bands.start
+        chunk = np.zeros((len(spins), len(ais[atoms]), len(ois), nk, nb))
+        indices, outs = [], []
+        for (si, i, j), entry in entries.items():
+            if atoms.start <= i < atoms.stop:
+                indices.append(entry)
+                outs.append(chunk[si, i - atoms.start, j])
+        source = arrays
+        segments = _window_segments(nband, ks, bands)
+        if segments != [(0, nkpt * nband)]:
+            # only the numbers inside the window are parsed
+            source = arrays.window(indices, segments)
+            splits = np.cumsum([stop - start for start, stop in segments])[:-1]
+            outs = [piece for out in outs for piece in np.split(out.reshape(-1), splits)]
+            indices = list(range(len(outs)))
+        with stage("projections", sum(source.spans[i][1] - source.spans[i][0] for i in indices)):
+            source.read_many(indices, outs)
+        return chunk.swapaxes(-1, -2)
+
+    shape = (len(spins), len(ais), len(ois), bs.stop - bs.start, ks.stop - ks.start)
+    if stream is not None:
+        result = BandStructure(energies, None, kpath, axes, info)
+        return _stream_channels(result, read, shape, stream)
+    proj = np.ascontiguousarray(read(slice(0, len(ais)), slice(0, shape[3])))
+    return BandStructure(energies, proj, kpath, axes, info)
 
 
 @logger.catch
-def read_tband(band: h5py.File | dict, h5: bool = True) -> pl.DataFrame:
-    """Read total (non-projected) band structure data from file.
+def read_band_h5(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
+    """Read band structure data from an HDF5 file.
 
-    This function extracts and processes total electronic band structure data
-    without orbital projections, handling both spin-polarized and non-spin-
-    polarized calculations from HDF5 or JSON sources.
+    Deprecated, use :func:`load_band_h5` and :meth:`BandStructure.to_polars`,
+    or :func:`read_band` with ``fmt=None``.
 
     Parameters
     ----------
-    band : h5py.File or dict
-        Band structure data container, either an opened HDF5 file object
-        or a dictionary loaded from JSON.
-    h5 : bool, default True
-        Flag indicating the data source format. True for HDF5, False for JSON.
+    absfile : str
+        Path to the HDF5 band structure file (typically with .h5 extension).
+    mode : int
+        Projection mode, mode 0 gives total bands.
 
     Returns
     -------
-    polars.DataFrame
-        DataFrame containing band structure with columns:
+    tuple of (polars.DataFrame, float, bool)
+        Band structure with native float columns, Fermi energy in eV and
+        whether the file holds orbital projections.
+    """
+    _deprecated("read_band_h5", "load_band_h5(absfile).to_polars(mode)")
+    band = load_band_h5(absfile, projections=mode != 0)
+    return band.to_polars(mode), band.efermi, band.projected
 
-        - label: High-symmetry k-point labels
-        - kx, ky, kz: k-point coordinates
-        - dist: Cumulative distance along k-path
-        - band1, band2, ...: Band energies (with -up/-down suffix for spin-polarized)
 
-    Notes
-    -----
-    The function handles different data layouts between HDF5 and JSON formats,
-    automatically detecting spin polarization and organizing band energies
-    accordingly. For collinear spin calculations, separate up and down spin
-    channels are included with appropriate column naming.
+@logger.catch
+def read_band_json(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
+    """Read band structure data from a JSON file.
+
+    Deprecated, use :func:`load_band_json` and :meth:`BandStructure.to_polars`,
+    or :func:`read_band` with ``fmt=None``.
+
+    Parameters
+    ----------
+    absfile : str
+        Path to the JSON band structure file (typically with .json extension).
+    mode : int
+        Projection mode, mode 0 gives total bands.
 
-    K-point distances are calculated as cumulative path lengths between
-    consecutive k-points, useful for band structure plotting.
+    Returns
+    -------
+    tuple of (polars.DataFrame, float, bool)
+        Band structure with native float columns, Fermi energy in eV and
+        whether the file holds orbital projections.
     """
-    kc: list[float] = band["BandInfo"]["CoordinatesOfKPoints"]
-    nok: int = band["BandInfo"]["NumberOfKpoints"]
-    if isinstance(nok, int):
-        nkpt = nok
-    else:
-        nkpt = nok[0]
+    _deprecated("read_band_json", "load_band_json(absfile).to_polars(mode)")
+    band = load_band_json(absfile, projections=mode != 0)
+    return band.to_polars(mode), band.efermi, band.projected
 
-    nob = band["BandInfo"]["NumberOfBand"]
-    if isinstance(nob, int):
-        nband = nob
-    else:
-        nband = nob[0]
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
-    # distance should be sum of diff
-    diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
 
-    if h5:
-        collinear = band["BandInfo"]["SpinType"] == "collinear"
-        sk: list[str] = get_h5_str(band, "/BandInfo/SymmetryKPoints")
-        # h5py bands is a nband*nkpt 2d array with C order, have to flatten and reshape it
-        bands = (
-            np.asarray(band["BandInfo"]["Spin1"]["BandEnergies"])
-            .flatten()
-            .reshape(nband, nkpt, order="F")
-        )
-    else:
-        collinear = band["BandInfo"]["IsProject"] == "collinear"
-        sk = band["BandInfo"]["SymmetryKPoints"]
-        bands = np.asarray(band["BandInfo"]["Spin1"]["BandEnergies"]).reshape(
-            nband, nkpt, order="F"
-        )
-    ski = band["BandInfo"]["SymmetryKPointsIndex"]
-    sk_column = [""] * nkpt
-    for i, symbol in zip(ski, sk, strict=True):
-        sk_column[i - 1] = symbol
-    data = {
-        "label": sk_column,
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": dist,
-    }
+@logger.catch
+def read_tband(band: h5py.File | dict, h5: bool = True) -> pl.DataFrame:
+    """Read total (non-projected) band structure data from an opened file.
 
-    # only collinear system has Spin2
-    if collinear:
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}-up"] = bands[i, :]
-        bands = np.asarray(band["BandInfo"]["Spin2"]["BandEnergies"]).reshape(
-            nband, nkpt, order="F"
-        )
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}-down"] = bands[i, :]
-    else:
-        for i in range(bands.shape[0]):
-            data[f"band{i + 1}"] = bands[i, :]
+    Deprecated, use :func:`load_band` with ``projections=False`` and
+    :meth:`BandStructure.to_polars` with mode 0.
+
+    Parameters
+    ----------
+    band : h5py.File or dict
+        Opened HDF5 file, or the document loaded from a JSON file.
+    h5 : bool, default True
+        Unused, the type of ``band`` tells the format.
 
-    return pl.DataFrame(data)
+    Returns
+    -------
+    polars.DataFrame
+        Total band structure with native float columns.
+    """
+    _deprecated("read_tband", "load_band(p, projections=False).to_polars(0)")
+    return _legacy_band(band, False).to_polars(0)
 
 
 @logger.catch
 def read_pband_h5(band: h5py.File, mode: int) -> pl.DataFrame:
-    """Read orbital-projected band structure data from HDF5 file.
+    """Read orbital-projected band structure data from an opened HDF5 file.
 
-    This function extracts and processes orbital-projected electronic band
-    structure data, providing detailed information about atomic orbital
-    contributions to each band at every k-point.
+    Deprecated, use :func:`load_band_h5` and :meth:`BandStructure.to_polars`.
 
     Parameters
     ----------
     band : h5py.File
-        Opened HDF5 file object containing projected band structure data.
+        Opened HDF5 file containing projected band structure data.
     mode : int
-        Projection mode determining which orbital contributions to include.
-        Different modes correspond to different orbital groupings and
-        processing schemes for the projection data.
+        Projection mode, see :func:`read_band`.
 
     Returns
     -------
     polars.DataFrame
-        DataFrame containing projected band structure with columns:
+        Projected band structure with native float columns.
+    """
+    _deprecated("read_pband_h5", "load_band_h5(absfile).to_polars(mode)")
+    return _legacy_band(band, True).to_polars(mode)
 
-        - label: High-symmetry k-point labels
-        - kx, ky, kz: k-point coordinates
-        - dist: Cumulative distance along k-path
-        - Orbital projection columns:
-            - "{atom_index}{orbital}-{spin}" for spin-polarized
-            - "{atom_index}{orbital}" for non-spin-polarized
 
-    Notes
-    -----
-    The function processes orbital projection data organized by atom indices
-    and orbital types (s, p, d, f, etc.). For spin-polarized calculations,
-    separate up and down spin projections are included.
+@logger.catch
+def read_pband_json(band: dict, mode: int) -> pl.DataFrame:
+    """Read orbital-projected band structure data from a loaded JSON document.
 
-    The projection data represents the weight of each atomic orbital in
-    the electronic wavefunctions, useful for analyzing chemical bonding
-    and orbital character of electronic states.
-    """
-    kc = band["/BandInfo/CoordinatesOfKPoints"]
-    nkpt: int = band["/BandInfo/NumberOfKpoints"][0]
-    nband: int = band["/BandInfo/NumberOfBand"][0]
-    sk: list[str] = get_h5_str(band, "/BandInfo/SymmetryKPoints")
-    ski: list[int] = band["BandInfo/SymmetryKPointsIndex"]
+    Deprecated, use :func:`load_band_json` and :meth:`BandStructure.to_polars`.
 
-    sk_column = [""] * nkpt
-    for i, symbol in zip(ski, sk, strict=True):
-        sk_column[i - 1] = symbol
+    Parameters
+    ----------
+    band : dict
+        Document loaded from a JSON band structure file.
+    mode : int
+        Projection mode, see :func:`read_band`.
 
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
-    # distance should be sum of diff
-    diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
-
-    data = {
-        "label": sk_column,
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": dist,
-    }
-    orbitals: list[str] = get_h5_str(band, "/BandInfo/Orbit")
-    atom_index = band["/BandInfo/Spin1/ProjectBand/AtomIndex"][0]
-    orb_index = band["/BandInfo/Spin1/ProjectBand/OrbitIndexs"][0]
-
-    # only collinear system has Spin2
-    if band["/BandInfo/SpinType"] == "collinear":
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-up": np.asarray(
-                            band[f"/BandInfo/Spin1/ProjectBand/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-down": np.asarray(
-                            band[f"/BandInfo/Spin2/ProjectBand/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
-    else:
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}": np.asarray(
-                            band[f"/BandInfo/Spin1/ProjectBand/1/{ai + 1}/{oi + 1}"]
-                        ).flatten()
-                    }
-                )
+    Returns
+    -------
+    polars.DataFrame
+        Projected band structure with native float columns.
+    """
+    _deprecated("read_pband_json", "load_band_json(absfile).to_polars(mode)")
+    return _legacy_band(band, True).to_polars(mode)
 
-    elements: list[str] = get_h5_str(band, "/AtomInfo/Elements")
-    _data = _refactor_band(data, nkpt, nband, elements, mode)
 
-    return pl.DataFrame(_data)
+@logger.catch
+def _legacy_band(band: h5py.File | dict, projections: bool) -> BandStructure:
+    """Load the band structure of an opened HDF5 file or a loaded JSON document."""
+    if isinstance(band, h5py.File):
+        return load_band_h5(band.filename, projections=projections)
+    # the document is encoded again so its arrays take the skeleton path
+    return _band_from_json(*_skeleton(json.dumps(band).encode()), None, projections, None)
 
 
 @logger.catch
-def read_pband_json(band: dict, mode: int) -> pl.DataFrame:
-    """Read orbital-projected band structure data from JSON file.
-
-    This function extracts and processes orbital-projected electronic band
-    structure data from JSON format files, providing the same functionality
-    as the HDF5 reader but for JSON-based data storage.
+def _refactor_band(
+    labels: list[tuple[str, str]], out: np.ndarray, spins: list[str], first_band: int = 1
+) -> dict:
+    """Name the per-band columns of aggregated projections.
 
     Parameters
     ----------
-    band : dict
-        Dictionary containing projected band structure data loaded from JSON.
-    mode : int
-        Projection mode determining which orbital contributions to include
-        and how they are processed and grouped in the output.
+    labels : list of tuple of (str, str)
+        Channel labels, see :func:`ddpc.io.projection.aggregate`.
+    out : numpy.ndarray
+        Aggregated projections of shape ``(spin, channel, band, kpoint)``.
+    spins : list of str
+        Column suffix of every spin entry, empty for non-spin-polarized data.
+    first_band : int, default 1
+        1-based index of the first band of ``out`` in the file.
 
     Returns
     -------
-    polars.DataFrame
-        DataFrame containing projected band structure with columns:
+    dict
+        ``band{b}-{channel}[-{spin}]`` column name to ``(nkpt,)`` array.
+    """
+    channels = ["-".join(filter(None, label)) for label in labels]
+
+    _data = {}
+    for si, updown in enumerate(spins):
+        for ci, channel in enumerate(channels):
+            for i in range(out.shape[2]):
+                b = first_band + i
+                key = f"band{b}-{channel}-{updown}" if updown else f"band{b}-{channel}"
+                _data[key] = out[si, ci, i]
+    return _data
 
-        - label: High-symmetry k-point labels
-        - kx, ky, kz: k-point coordinates
-        - dist: Cumulative distance along k-path
-        - Processed orbital projections based on the specified mode
 
-    Notes
-    -----
-    The function processes JSON-formatted orbital projection data with the
-    same logical structure as HDF5 files. The mode parameter determines
-    the level of detail and grouping for orbital contributions.
+@logger.catch
+def _kpath(band: h5py.File | dict, h5: bool = True) -> tuple[dict, int, int, str]:
+    """Read the k-path and band dimensions shared by all band readers.
+
+    Parameters
+    ----------
+    band : h5py.File or dict
+        Opened HDF5 file or dictionary loaded from JSON.
+    h5 : bool, default True
+        Flag indicating the data source format. True for HDF5, False for JSON.
+
+    Returns
+    -------
+    tuple of (dict, int, int, str)
+        ``kpoints``, ``distances`` and ``labels`` of the k-path, number of
+        k-points, number of bands and the spin type of the calculation.
     """
-    kc: list[float] = band["BandInfo"]["CoordinatesOfKPoints"]
-    nkpt: int = band["BandInfo"]["NumberOfKpoints"]
-    nband: int = band["BandInfo"]["NumberOfBand"]
+    nok = band["BandInfo"]["NumberOfKpoints"]
+    nkpt = nok if isinstance(nok, int) else int(nok[0])
+    nob = band["BandInfo"]["NumberOfBand"]
+    nband = nob if isinstance(nob, int) else int(nob[0])
 
-    sk: list[str] = band["BandInfo"]["SymmetryKPoints"]
-    ski: list[int] = band["BandInfo"]["SymmetryKPointsIndex"]
+    if h5:
+        spin_type = get_h5_str(band, "/BandInfo/SpinType")[0]
+        sk: list[str] = get_h5_str(band, "/BandInfo/SymmetryKPoints")
+    else:
+        spin_type = band["BandInfo"]["SpinType"]
+        sk = band["BandInfo"]["SymmetryKPoints"]
+    ski = band["BandInfo"]["SymmetryKPointsIndex"]
     sk_column = [""] * nkpt
     for i, symbol in zip(ski, sk, strict=True):
         sk_column[i - 1] = symbol
 
-    kcoord = np.array(kc).reshape(nkpt, 3)
-    kx = kcoord[:, 0]
-    ky = kcoord[:, 1]
-    kz = kcoord[:, 2]
+    kcoord = np.asarray(band["BandInfo"]["CoordinatesOfKPoints"], dtype=float).reshape(nkpt, 3)
     # distance should be sum of diff
     diff = np.diff(kcoord, axis=0)  # n-1
-    dist = [0.0]
-    dist.extend(np.cumsum(np.linalg.norm(diff, axis=1)).tolist())
-
-    data = {
-        "label": sk_column,
-        "kx": kx,
-        "ky": ky,
-        "kz": kz,
-        "dist": dist,
-    }
-    orbitals: list[str] = band["BandInfo"]["Orbit"]
-    if band["BandInfo"]["SpinType"] == "collinear":
-        project1 = band["BandInfo"]["Spin1"]["ProjectBand"]
-        project2 = band["BandInfo"]["Spin2"]["ProjectBand"]
-        for p in project1:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-up": contrib})
-        for p in project2:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-down": contrib})
-    else:
-        project = band["BandInfo"]["Spin1"]["ProjectBand"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}": contrib})
-
-    elements: list[str] = [atom["Element"] for atom in band["AtomInfo"]["Atoms"]]
-    _data = _refactor_band(data, nkpt, nband, elements, mode)
-
-    return pl.DataFrame(_data)
-
+    dist = np.concatenate([[0.0], np.cumsum(np.linalg.norm(diff, axis=1))])
 
-@logger.catch
-def _band_ele(data: dict, nkpt: int, nband: int, elements: list[str], _data: dict) -> None:
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, _ = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}"
-                _inplace_update_data(_data, key, cont[b])
+    return {"kpoints": kcoord, "distances": dist, "labels": sk_column}, nkpt, nband, spin_type
 
 
 @logger.catch
-def _band_elespdf(data: dict, nkpt: int, nband: int, elements: list[str], _data: dict) -> None:
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o[0]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o[0]}"
-                _inplace_update_data(_data, key, cont[b])
+def _band_energies(
+    band: h5py.File | dict, spins: list[tuple[int, str]], nband: int, nkpt: int
+) -> np.ndarray:
+    """Read band energies of the selected spins as a ``(spin, band, kpoint)`` array."""
+    energies = np.empty((len(spins), nband, nkpt))
+    for si, (ispin, _) in enumerate(spins):
+        # h5py bands is a nband*nkpt 2d array with C order, have to flatten and reshape it
+        energies[si] = (
+            np.asarray(band["BandInfo"][f"Spin{ispin}"]["BandEnergies"])
+            .flatten()
+            .reshape(nband, nkpt, order="F")
+        )
+    return energies
 
 
 @logger.catch
-def _band_elepxpy(data: dict, nkpt: int, nband: int, elements: list[str], _data: dict) -> None:
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o}-{updown}"
-                else:
-                    key = f"band{b + 1}-{elements[a - 1]}-{o}"
-                _inplace_update_data(_data, key, cont[b])
+def _long_band(
+    energies: np.ndarray,
+    spins: list[str],
+    channels: tuple[list[tuple[str, str]], np.ndarray] | None = None,
+) -> pl.DataFrame:
+    """Build the long layout of total or projected bands straight from arrays.
 
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        Band energies of shape ``(spin, band, kpoint)``.
+    spins : list of str
+        Column suffix of every spin entry, empty for non-spin-polarized data.
+    channels : tuple of (list of tuple of (str, str), numpy.ndarray), optional
+        Channel labels and aggregated projections of shape ``(spin, channel,
+        band, kpoint)``, see :func:`ddpc.io.projection.aggregate`. Total
+        bands are returned when omitted.
 
-@logger.catch
-def _band_atomspdf(data: dict, nkpt: int, nband: int, _data: dict) -> None:
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{a}-{o[0]}-{updown}"
-                else:
-                    key = f"band{b + 1}-{a}-{o[0]}"
-                _inplace_update_data(_data, key, cont[b])
+    Returns
+    -------
+    polars.DataFrame
+        ``kpoint, band, spin, energy`` rows ordered by spin, band and k-point;
+        projected data adds ``channel`` and ``weight`` columns and is ordered
+        by spin, channel, band and k-point. k-point and band indices are
+        1-based, spin and channel are enums.
+    """
+    nspin, nband, nkpt = energies.shape
+    nchannel = 1
+    channel = {}
+    weight = {}
+    if channels is not None:
+        labels, out = channels
+        nchannel = len(labels)
+        names = ["-".join(filter(None, label)) for label in labels]
+        codes = np.repeat(np.arange(nchannel, dtype=np.uint32), nband * nkpt)
+        channel["channel"] = pl.Series(np.tile(codes, nspin)).cast(pl.Enum(names))
+        weight["weight"] = np.ascontiguousarray(out).ravel()
+        energies = np.broadcast_to(energies[:, None], out.shape)
+
+    nrow = nspin * nchannel * nband * nkpt
+    kpoint = np.arange(1, nkpt + 1, dtype=np.uint32)
+    bands = np.repeat(np.arange(1, nband + 1, dtype=np.uint32), nkpt)
+    spin = np.repeat(np.arange(nspin, dtype=np.uint32), nrow // nspin)
+    return pl.DataFrame(
+        {
+            "kpoint": np.tile(kpoint, nrow // nkpt),
+            "band": np.tile(bands, nrow // (nband * nkpt)),
+            "spin": pl.Series(spin).cast(pl.Enum([s or "none" for s in spins])),
+            **channel,
+            "energy": np.ascontiguousarray(energies).ravel(),
+            **weight,
+        }
+    )
 
 
 @logger.catch
-def _band_atompxpy(data: dict, nkpt: int, nband: int, _data: dict) -> None:
-    for k, v in data.items():
-        if k.startswith(("k", "label", "dist")):
-            _data[k] = v
-        else:
-            cont = np.asarray(v).reshape(nband, nkpt, order="F")
-            ao, updown = _get_ao_spin(k)
-            a, o = _split_atomindex_orbital(ao)
-            for b in range(nband):
-                if updown:
-                    key = f"band{b + 1}-{a}-{o}-{updown}"
-                else:
-                    key = f"band{b + 1}-{a}-{o}"
-                _inplace_update_data(_data, key, cont[b])
+def _band_to_cache(band: BandStructure) -> tuple[dict, dict]:
+    """Split a band structure into cache arrays and JSON metadata."""
+    arrays = {
+        "energies": band.energies,
+        "kpoints": band.kpoints,
+        "distances": band.distances,
+    }
+    if band.projections is not None:
+        arrays["projections"] = band.projections
+    meta = {
+        **band.axes,
+        "labels": band.labels,
+        "efermi": float(band.efermi),
+        "numpy_efermi": isinstance(band.efermi, np.generic),
+        "spin_type": band.spin_type,
+        "projected": band.projected,
+        "first_band": band.first_band,
+        "first_kpoint": band.first_kpoint,
+    }
+    return arrays, meta
 
 
 @logger.catch
-def _refactor_band(data: dict, nkpt: int, nband: int, elements: list[str], mode: int) -> dict:
-    _data: dict = {}
-    if mode == 1:
-        _band_ele(data, nkpt, nband, elements, _data)
-    elif mode == 2:
-        _band_elespdf(data, nkpt, nband, elements, _data)
-    elif mode == 3:
-        _band_elepxpy(data, nkpt, nband, elements, _data)
-    elif mode == 4:
-        _band_atomspdf(data, nkpt, nband, _data)
-    elif mode == 5:
-        _band_atompxpy(data, nkpt, nband, _data)
-    else:
-        print(f"{mode=} not supported yet")
-        raise RuntimeError(f"Unsupported mode: {mode}")
-
-    return _data
+def _band_from_cache(arrays: dict, meta: dict) -> BandStructure:
+    """Rebuild a band structure from memory-mapped cache arrays."""
+    kpath = {
+        "kpoints": arrays["kpoints"],
+        "distances": arrays["distances"],
+        "labels": meta["labels"],
+    }
+    efermi = np.float64(meta["efermi"]) if meta["numpy_efermi"] else meta["efermi"]
+    info = {**meta, "efermi": efermi}
+    return BandStructure(arrays["energies"], arrays.get("projections"), kpath, meta, info)
@@ -0,0 +1,139 @@
+"""Read many band/DOS files across a pool of worker processes.
+
+Used by :func:`ddpc.io.band.read_band_many` and
+:func:`ddpc.io.dos.read_dos_many`. Workers are started with the ``spawn``
+method, since forking a process that already runs the Polars thread pool can
+deadlock; as usual with ``spawn``, scripts using the pool need an
+``if __name__ == "__main__":`` guard. A file that fails to read is reported
+with its error message and does not stop the other files.
+"""
+
+import glob
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+# tasks submitted per worker ahead of the consumer, bounds the buffered results
+_TASKS_PER_WORKER = 2
+
+
+@logger.catch
+def expand_paths(paths: str | Path | Iterable[str | Path]) -> list[Path]:
+    """Expand a glob pattern or a collection of paths into a list of paths.
+
+    Parameters
+    ----------
+    paths : str, pathlib.Path or iterable of them
+        A single path or glob pattern (``**`` matches directories
+        recursively), or an iterable of paths that is used as is.
+
+    Returns
+    -------
+    list of pathlib.Path
+        The matching paths, sorted for a pattern and in the given order
+        otherwise.
+    """
+    if isinstance(paths, str | Path):
+        return [Path(p) for p in sorted(glob.glob(str(paths), recursive=True))]
+    return [Path(p) for p in paths]
+
+
+@logger.catch
+def read_many(
+    reader: Callable,
+    paths: str | Path | Iterable[str | Path],
+    workers: int | None = None,
+    ordered: bool = True,
+    kwargs: dict | None = None,
+) -> Iterator[tuple[Path, Any, str | None]]:
+    """Apply a reader to many files with a bounded process pool.
+
+    Parameters
+    ----------
+    reader : callable
+        Module-level reader, e.g. :func:`ddpc.io.band.read_band`, called as
+        ``reader(path, **kwargs)``.
+    paths : str, pathlib.Path or iterable of them
+        Files to read, see :func:`expand_paths`.
+    workers : int, optional
+        Number of worker processes, defaults to the CPU count. With one worker
+        (or one file) the files are read in the calling process.
+    ordered : bool, default True
+        Yield results in the order of ``paths``; otherwise yield each result
+        as soon as its file is read.
+    kwargs : dict, optional
+        Keyword arguments passed on to ``reader``.
+
+    Yields
+    ------
+    tuple of (pathlib.Path, object, str or None)
+        Path, result of the reader (None on failure) and error message (None
+        on success) of every file.
+    """
+    paths = expand_paths(paths)
+    kwargs = kwargs or {}
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield (path, *_read_one(reader, path, kwargs))
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        todo = iter(paths)
+        pending: deque[tuple[Path, Future]] = deque()
+
+        def submit() -> None:
+            for path in todo:
+                pending.append((path, pool.submit(_read_one, reader, path, kwargs)))
+                if len(pending) >= workers * _TASKS_PER_WORKER:
+                    return
+
+        submit()
+        while pending:
+            if ordered:
+                path, future = pending.popleft()
+            else:
+                wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                path, future = next(item for item in pending if item[1].done())
+                pending.remove((path, future))
+            yield (path, *_collect(future))
+            submit()
+
+
+def _collect(future: Future) -> tuple[object, str | None]:
+    """Return the result of a worker, or the error of a crashed worker."""
+    try:
+        return future.result()
+    except Exception as exc:  # e.g. BrokenProcessPool
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def _read_one(reader: Callable, path: Path, kwargs: dict) -> tuple[object, str | None]:
+    """Read one file and turn errors caught by ``logger.catch`` into a message."""
+    errors: list[str] = []
+
+    def record(message) -> None:
+        exception = message.record["exception"]
+        if exception is not None and exception.value is not None:
+            errors.append(f"{exception.type.__name__}: {exception.value}")
+
+    sink = logger.add(record, level="ERROR", catch=False)
+    try:
+        result = reader(path, **kwargs)
+    except Exception as exc:  # readers without logger.catch
+        errors.append(f"{type(exc).__name__}: {exc}")
+        result = None
+    finally:
+        logger.remove(sink)
+
+    if result is None:
+        # the innermost catch logs first and holds the original error
+        return None, errors[0] if errors else f"{reader.__name__} returned no result"
+    return result, None
@@ -0,0 +1,177 @@
+"""On-disk cache of decoded band/DOS arrays.
+
+Every cache entry is a directory holding one ``.npy`` file per array and a
+``meta.json`` file with the remaining fields. Later reads memory-map the
+arrays instead of parsing JSON or walking HDF5 datasets again. The cache is
+opt-in, see :func:`enable_cache`, and evicts the least recently used entries
+once its directory grows beyond ``max_bytes``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+# settings of the cache, changed with enable_cache/disable_cache
+CACHE_CONFIG: dict = {
+    "enabled": bool(os.environ.get("DDPC_CACHE")),
+    "directory": Path(os.environ.get("DDPC_CACHE_DIR", Path.home() / ".cache" / "ddpc")),
+    "max_bytes": 2 * 1024**3,
+}
+
+# bytes hashed at the start, middle and end of a file for its content digest
+_SAMPLE_BYTES = 1 << 20
+
+
+@logger.catch
+def enable_cache(directory: str | Path | None = None, max_bytes: int | None = None) -> None:
+    """Turn the on-disk cache on for :func:`~ddpc.io.band.read_band` and friends.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, optional
+        Cache directory, defaults to ``$DDPC_CACHE_DIR`` or ``~/.cache/ddpc``.
+    max_bytes : int, optional
+        Size limit of the cache directory, 2 GiB by default. Least recently
+        used entries are removed once it is exceeded.
+    """
+    CACHE_CONFIG["enabled"] = True
+    if directory is not None:
+        CACHE_CONFIG["directory"] = Path(directory)
+    if max_bytes is not None:
+        CACHE_CONFIG["max_bytes"] = max_bytes
+
+
+@logger.catch
+def disable_cache() -> None:
+    """Turn the on-disk cache off, existing entries are kept."""
+    CACHE_CONFIG["enabled"] = False
+
+
+@logger.catch
+def clear_cache() -> None:
+    """Remove every entry of the cache directory."""
+    shutil.rmtree(CACHE_CONFIG["directory"], ignore_errors=True)
+
+
+@logger.catch
+def cache_key(p: str | Path, tag: str) -> str:
+    """Build the cache key of a file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the source file.
+    tag : str
+        What is cached from the file, e.g. ``"band-proj"``.
+
+    Returns
+    -------
+    str
+        Hex digest of the tag, absolute path, size, modification time and a
+        content digest of the file.
+
+    Notes
+    -----
+    The content digest covers the size and three 1 MiB samples at the start,
+    middle and end of the file, so keys stay cheap for files of several GB
+    while rewrites that keep the size and mtime are still detected.
+    """
+    path = Path(p).resolve()
+    stat = path.stat()
+    content = hashlib.blake2b(str(stat.st_size).encode())
+    with open(path, "rb") as fin:
+        for offset in (0, stat.st_size // 2, stat.st_size - _SAMPLE_BYTES):
+            fin.seek(max(offset, 0))
+            content.update(fin.read(_SAMPLE_BYTES))
+
+    key = f"{tag}|{path}|{stat.st_size}|{stat.st_mtime_ns}|{content.hexdigest()}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@logger.catch
+def fetch_entry(key: str) -> tuple[dict, dict] | None:
+    """Memory-map the arrays of a cache entry.
+
+    Parameters
+    ----------
+    key : str
+        Cache key, see :func:`cache_key`.
+
+    Returns
+    -------
+    tuple of (dict, dict) or None
+        Read-only memory-mapped arrays and metadata of the entry, None when
+        the entry does not exist.
+    """
+    entry = Path(CACHE_CONFIG["directory"]) / key
+    meta_file = entry / "meta.json"
+    if not meta_file.is_file():
+        return None
+
+    meta = json.loads(meta_file.read_text(encoding="utf-8"))
+    arrays = {name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]}
+    # the modification time of meta.json records the last use for eviction
+    os.utime(meta_file)
+    return arrays, meta
+
+
+@logger.catch
+def store_entry(key: str, arrays: dict, meta: dict) -> None:
+    """Write a cache entry and evict old entries beyond the size limit.
+
+    Parameters
+    ----------
+    key : str
+        Cache key, see :func:`cache_key`.
+    arrays : dict
+        Name to NumPy array, every array is saved as ``{name}.npy``.
+    meta : dict
+        JSON-serialisable fields stored in ``meta.json``.
+    """
+    root = Path(CACHE_CONFIG["directory"])
+    entry = root / key
+    tmp = root / f"{key}.tmp{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+    meta = {**meta, "arrays": list(arrays)}
+    (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    try:
+        tmp.rename(entry)
+    except OSError:
+        # another process stored the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+    evict(CACHE_CONFIG["max_bytes"], keep=key)
+
+
+@logger.catch
+def evict(max_bytes: int, keep: str | None = None) -> None:
+    """Remove least recently used entries until the cache fits ``max_bytes``.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Size limit of the cache directory.
+    keep : str, optional
+        Key of an entry that is never removed, e.g. the one just stored.
+    """
+    root = Path(CACHE_CONFIG["directory"])
+    entries = []
+    for entry in root.glob("*/meta.json"):
+        size = sum(f.stat().st_size for f in entry.parent.iterdir())
+        entries.append((entry.stat().st_mtime_ns, size, entry.parent))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        if entry.name != keep:
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -1,7 +1,7 @@
 """Read data from output files."""
 
-import sys
-from json import load
+import json
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import h5py
@@ -9,12 +9,21 @@ import numpy as np
 import polars as pl
 from loguru import logger
 
+from ddpc.io.batch import read_many
+from ddpc.io.cache import CACHE_CONFIG, cache_key, fetch_entry, store_entry
+from ddpc.io.instrument import add_bytes, stage
+from ddpc.io.jsonio import JsonArrays, _skeleton, load_json_skeleton
+from ddpc.io.projection import DOS_MODES, aggregate, merge_atoms, mode_rule, projection_axes
+from ddpc.io.symmetry import merge_equivalent
 from ddpc.io.utils import (
-    _format_float_columns_as_str_mapelements,
-    _get_ao_spin,
-    _inplace_update_data,
-    _split_atomindex_orbital,
+    _deprecated,
+    _energy_window,
+    _read_h5_segments,
+    _select_axes,
+    _select_projections,
+    _select_spins,
     absf,
+    format_float_columns,
     get_h5_str,
 )
 
@@ -22,8 +31,10 @@ from ddpc.io.utils import (
 @logger.catch
 def read_dos(
     p: str | Path,
-    mode: int = 5,
-    fmt: str = "8.3f",
+    mode: int | dict = 5,
+    fmt: str | None = "8.3f",
+    select: dict | None = None,
+    layout: str = "wide",
 ) -> tuple[pl.DataFrame, float, bool]:
     """Read and process electronic density of states data from HDF5 or JSON files.
 
@@ -36,13 +47,42 @@ def read_dos(
     p : str or pathlib.Path
         Path to the DOS data file. Supported formats are HDF5 (.h5) and
         JSON (.json) files from DFT calculations.
-    mode : int, default 5
+    mode : int or dict, default 5
         Projection mode for projected density of states data. Only relevant
         when the file contains orbital-projected information. Different modes
-        correspond to different orbital groupings (s, p, d, f, etc.).
-    fmt : str, default "8.3f"
+        correspond to different orbital groupings (s, p, d, f, etc.). A dict
+        of named channel groups, e.g. ``{"O-p-top": "1-16 O p"}``, builds one
+        channel per group, see :func:`ddpc.io.projection.compile_groups`.
+    fmt : str or None, default "8.3f"
         Format string for floating-point number display in the output DataFrame.
-        Controls decimal precision and field width for pretty printing.
+        Controls decimal precision and field width for pretty printing. Use
+        None to keep native float columns for further numeric work; they can
+        be formatted later with :func:`ddpc.io.utils.format_float_columns`.
+    select : dict, optional
+        Projection selectors, any of:
+
+        - ``"atoms"``: 1-based indices of the atoms to read
+        - ``"elements"``: element symbols to read, e.g. ``["Fe"]``
+        - ``"orbitals"``: orbitals to read; shell names (``"d"``) select every
+          orbital of the shell, full names (``"dxy"``) select one
+        - ``"spins"``: spin channels to read for collinear data, ``"up"``
+          and/or ``"down"``
+        - ``"energies"``: ``(emin, emax)`` inclusive energy window in eV
+        - ``"grid"``: energies in eV to resample the DOS onto by linear
+          interpolation, zero outside the file grid and the window; only the
+          file points bracketing the grid are read
+        - ``"relative_to_fermi"``: whether ``"energies"`` and ``"grid"`` are
+          relative to the Fermi energy, default False
+        - ``"equivalent"``: ``"sum"`` or ``"average"`` the projections of
+          symmetry-equivalent atoms (see
+          :func:`ddpc.io.symmetry.equivalent_atoms`), so modes 4 and 5 have
+          one channel per orbit, named after its first atom
+        - ``"symprec"``: symmetry precision of ``"equivalent"`` in Angstrom,
+          default 1e-3
+    layout : {"wide", "long"}, default "wide"
+        ``"wide"`` returns one column per channel. ``"long"`` returns one row
+        per energy, spin and channel with columns ``energy, spin, channel,
+        dos``; the total DOS is the ``"tdos"`` channel.
 
     Returns
     -------
@@ -56,6 +96,8 @@ def read_dos(
     ------
     TypeError
         If the input file is neither HDF5 nor JSON format.
+    ValueError
+        If ``layout`` is neither "wide" nor "long".
 
     Notes
     -----
@@ -64,385 +106,815 @@ def read_dos(
     determines which orbital contributions are included in the output.
     The DataFrame includes energy points and DOS values, with spin-polarized
     calculations having separate up/down columns.
+
+    The selectors are applied before any projection dataset is read, so only
+    the matching projections are loaded. Use :func:`load_dos` to keep the
+    arrays in a :class:`DensityOfStates` instead.
     """
-    absfile = str(absf(p))
+    with stage("read_dos"):
+        dos = load_dos(p, select, projections=mode != 0)
+        df = dos.to_polars(mode, layout)
+        if fmt is not None:
+            with stage("format"):
+                df = format_float_columns(df, fmt)
 
-    if absfile.endswith(".h5"):
-        df, efermi, isproj = read_dos_h5(absfile, mode)
-    elif absfile.endswith(".json"):
-        df, efermi, isproj = read_dos_json(absfile, mode)
-    else:
-        raise TypeError(f"{absfile} must be h5 or json file!")
+    return df, dos.efermi, dos.projected
+
+
+@logger.catch
+def read_dos_modes(
+    p: str | Path,
+    modes: tuple[int, ...] = tuple(DOS_MODES),
+    fmt: str | None = "8.3f",
+    select: dict | None = None,
+    layout: str = "wide",
+) -> tuple[dict[int, pl.DataFrame], float, bool]:
+    """Read a density of states file once and build the frames of several modes.
+
+    Calling :func:`read_dos` once per mode re-opens the file and re-reads
+    every projection each time. This function loads the file a single time
+    and shares the raw projection arrays between all requested modes.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the density of states data file, HDF5 (.h5) or JSON (.json).
+    modes : tuple of int, default all modes of :data:`ddpc.io.projection.DOS_MODES`
+        Projection modes to build, 0 gives the total DOS.
+    fmt : str or None, default "8.3f"
+        Format string for float columns, None keeps native floats, see
+        :func:`read_dos`.
+    select : dict, optional
+        Projection selectors, see :func:`read_dos`.
+    layout : {"wide", "long"}, default "wide"
+        Output layout, see :func:`read_dos`.
+
+    Returns
+    -------
+    tuple of (dict of int to polars.DataFrame, float, bool)
+
+        - DataFrame of every requested mode, in request order
+        - Fermi energy in eV
+        - Boolean indicating whether the data contains orbital projections
 
-    df = _format_float_columns_as_str_mapelements(df, fmt)
+    Examples
+    --------
+    >>> frames, efermi, isproj = read_dos_modes("dos.h5", modes=(1, 2))
+    >>> frames[2]
+    """
+    with stage("read_dos_modes"):
+        data = load_dos(p, select, projections=any(mode != 0 for mode in modes))
+        frames = {}
+        for mode in modes:
+            df = data.to_polars(mode, layout)
+            if fmt is not None:
+                with stage("format"):
+                    df = format_float_columns(df, fmt)
+            frames[mode] = df
 
-    return df, efermi, isproj
+    return frames, data.efermi, data.projected
 
 
 @logger.catch
-def read_dos_h5(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
-    """Read density of states data from HDF5 file format.
+def read_dos_many(
+    paths: str | Path | Iterable[str | Path],
+    workers: int | None = None,
+    ordered: bool = True,
+    **kwargs,
+) -> Iterator[tuple[Path, tuple | None, str | None]]:
+    """Read many density of states files in parallel with :func:`read_dos`.
+
+    The files are read by a pool of ``workers`` processes; results are
+    streamed back so only a few frames are held in memory at a time. A file
+    that cannot be read is reported with its error and the others still are.
+    Workers are spawned, so scripts calling this function need an
+    ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+    paths : str, pathlib.Path or iterable of them
+        Glob pattern such as ``"runs/**/dos.h5"``, or the files to read.
+    workers : int, optional
+        Number of worker processes, defaults to the CPU count. One worker
+        reads the files in the calling process.
+    ordered : bool, default True
+        Yield results in the order of ``paths``; otherwise yield each result
+        as soon as its file is read.
+    **kwargs
+        Keyword arguments of :func:`read_dos`, e.g. ``mode``, ``fmt``,
+        ``select`` or ``layout``.
+
+    Yields
+    ------
+    tuple of (pathlib.Path, tuple or None, str or None)
+        Path of the file, the ``(df, efermi, isproj)`` tuple of
+        :func:`read_dos` (None on failure) and the error message (None on
+        success).
+
+    Examples
+    --------
+    >>> for path, result, error in read_dos_many("runs/*/dos.h5", workers=8, fmt=None):
+    ...     if error is not None:
+    ...         print(path, error)
+    """
+    yield from read_many(read_dos, paths, workers, ordered, kwargs)
+
+
+class DensityOfStates:
+    """Total and orbital-projected density of states of one calculation.
+
+    The container keeps the arrays as read from the file, so analysis code can
+    work on contiguous NumPy arrays and only build DataFrames on demand with
+    :meth:`to_polars`.
+
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        Energy grid of shape ``(energy,)`` in eV.
+    dos : numpy.ndarray
+        Total DOS of shape ``(spin, energy)``.
+    projections : numpy.ndarray or None
+        Projected DOS of shape ``(spin, atom, orbital, energy)``, None when the
+        file has no projections or they were not loaded.
+    axes : dict
+        ``spins``, ``atoms``, ``elements`` and ``orbitals`` labelling the spin,
+        atom and orbital axes, see :func:`ddpc.io.projection.projection_axes`.
+    info : dict
+        ``efermi`` (Fermi energy in eV), ``spin_type`` ("none", "collinear"
+        or "noncollinear") and ``projected`` (whether the file holds
+        projections).
+
+    Attributes
+    ----------
+    energies, dos, projections : numpy.ndarray
+        Arrays described above.
+    spins, atoms, elements, orbitals : list
+        Labels of the spin, atom and orbital axes. Without projections
+        ``atoms`` and ``elements`` describe the whole structure and
+        ``orbitals`` is empty.
+    efermi : float
+        Fermi energy in eV.
+    spin_type : str
+        Spin treatment of the calculation.
+    projected : bool
+        Whether the source file contains orbital projections.
+    """
+
+    __slots__ = (
+        "atoms",
+        "dos",
+        "efermi",
+        "elements",
+        "energies",
+        "orbitals",
+        "projected",
+        "projections",
+        "spin_type",
+        "spins",
+    )
+
+    def __init__(
+        self,
+        energies: np.ndarray,
+        dos: np.ndarray,
+        projections: np.ndarray | None,
+        axes: dict,
+        info: dict,
+    ) -> None:
+        """Store the arrays of a density of states, see the class docstring."""
+        self.energies = energies
+        self.dos = dos
+        self.projections = projections
+        self.spins = axes["spins"]
+        self.atoms = axes["atoms"]
+        self.elements = axes["elements"]
+        self.orbitals = axes["orbitals"]
+        self.efermi = info["efermi"]
+        self.spin_type = info["spin_type"]
+        self.projected = info["projected"]
+
+    def __repr__(self) -> str:
+        """Summarise the array shapes."""
+        nspin, nenergy = self.dos.shape
+        return (
+            f"DensityOfStates(nspin={nspin}, nenergy={nenergy}, "
+            f"spin_type={self.spin_type!r}, projected={self.projections is not None})"
+        )
+
+    @property
+    def axes(self) -> dict:
+        """Labels of the spin, atom and orbital axes of :attr:`projections`."""
+        return {
+            "spins": self.spins,
+            "atoms": self.atoms,
+            "elements": self.elements,
+            "orbitals": self.orbitals,
+        }
+
+    def subset(self, select: dict | None = None) -> "DensityOfStates":
+        """Select spins, atoms, orbitals and energies of a loaded density of states.
+
+        Parameters
+        ----------
+        select : dict, optional
+            Selectors, see :func:`read_dos`. ``"atoms"`` refers to atom ids of
+            the structure. None returns the DOS itself.
+
+        Returns
+        -------
+        DensityOfStates
+            DOS restricted to the selection, sharing memory with this one
+            where possible.
+        """
+        if not select:
+            return self
+        projected = self.projections is not None
+        sidx, ais, ois, axes = _select_axes(self.axes, self.spin_type, select, projected)
+        es = _energy_window(self.energies, select, self.efermi)
+        projections = None
+        if self.projections is not None:
+            projections = self.projections[np.ix_(sidx, ais, ois)][..., es]
+        info = {"efermi": self.efermi, "spin_type": self.spin_type, "projected": self.projected}
+        return DensityOfStates(self.energies[es], self.dos[sidx][:, es], projections, axes, info)
+
+    def merge_atoms(self, equivalent: np.ndarray, how: str = "sum") -> "DensityOfStates":
+        """Merge the projections of symmetry-equivalent atoms.
+
+        Parameters
+        ----------
+        equivalent : numpy.ndarray
+            0-based representative atom of every atom of the file, see
+            :func:`ddpc.io.symmetry.equivalent_atoms`.
+        how : {"sum", "average"}, default "sum"
+            Whether the atoms of an orbit are summed or averaged.
+
+        Returns
+        -------
+        DensityOfStates
+            DOS with one entry per orbit along the atom axis, labelled by the
+            id of its first atom.
+        """
+        projections, axes = merge_atoms(self.projections, self.axes, equivalent, how)
+        info = {"efermi": self.efermi, "spin_type": self.spin_type, "projected": self.projected}
+        return DensityOfStates(self.energies, self.dos, projections, axes, info)
+
+    def resample(self, grid: np.ndarray) -> "DensityOfStates":
+        """Interpolate the total and projected DOS linearly onto another energy grid.
+
+        Every channel is interpolated at once: the grid is located in
+        :attr:`energies` by binary search and each point is the weighted sum
+        of its two neighbours.
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            Energies in eV, in any order. Points outside :attr:`energies`
+            get zero DOS.
+
+        Returns
+        -------
+        DensityOfStates
+            DOS on ``grid``.
+
+        Raises
+        ------
+        ValueError
+            If the DOS has fewer than two energies.
+        """
+        grid = np.asarray(grid, dtype=float)
+        nenergy = len(self.energies)
+        if nenergy < 2:
+            raise ValueError(f"cannot resample a DOS of {nenergy} energies")
+        with stage("resample"):
+            upper = np.clip(np.searchsorted(self.energies, grid, side="right"), 1, nenergy - 1)
+            lower = upper - 1
+            inside = (grid >= self.energies[0]) & (grid <= self.energies[-1])
+            step = self.energies[upper] - self.energies[lower]
+            right = np.where(inside, (grid - self.energies[lower]) / step, 0.0)
+            left = np.where(inside, 1.0 - right, 0.0)
+
+            def interpolate(values: np.ndarray) -> np.ndarray:
+                return values[..., lower] * left + values[..., upper] * right
+
+            projections = None if self.projections is None else interpolate(self.projections)
+            info = {"efermi": self.efermi, "spin_type": self.spin_type, "projected": self.projected}
+            return DensityOfStates(grid, interpolate(self.dos), projections, self.axes, info)
+
+    def to_polars(self, mode: int | dict = 5, layout: str = "wide") -> pl.DataFrame:
+        """Build a DataFrame view of the density of states.
+
+        Parameters
+        ----------
+        mode : int or dict, default 5
+            Projection mode, a key of :data:`ddpc.io.projection.DOS_MODES`,
+            or channel groups, see :func:`read_dos`. Mode 0, or a DOS without
+            projections, gives the total DOS.
+        layout : {"wide", "long"}, default "wide"
+            Output layout, see :func:`read_dos`.
+
+        Returns
+        -------
+        polars.DataFrame
+            DOS with native float columns. The wide total DOS has ``energy``
+            and ``dos`` or ``up``/``down`` columns; the wide projected DOS has
+            ``energy``, ``tdos[-{spin}]`` and ``{channel}[-{spin}]`` columns.
+
+        Raises
+        ------
+        ValueError
+            If ``layout`` is neither "wide" nor "long".
+        RuntimeError
+            If ``mode`` is not a supported projection mode.
+        """
+        with stage("dataframe"):
+            if layout not in ("wide", "long"):
+                raise ValueError(f"{layout=} must be 'wide' or 'long'")
+            projections = None if mode == 0 else self.projections
+            if layout == "long":
+                return _long_dos(self.energies, self.axes, self.dos, projections, mode)
+
+            data = {"energy": self.energies}
+            if projections is None:
+                for si, updown in enumerate(self.spins):
+                    data[updown or "dos"] = self.dos[si]
+                return pl.DataFrame(data)
+
+            for si, updown in enumerate(self.spins):
+                data[f"tdos-{updown}" if updown else "tdos"] = self.dos[si]
+            data.update(_refactor_dos(projections, self.axes, mode))
+            return pl.DataFrame(data)
+
+
+@logger.catch
+def load_dos(
+    p: str | Path,
+    select: dict | None = None,
+    projections: bool = True,
+    cache: bool | None = None,
+) -> DensityOfStates:
+    """Load a density of states from an HDF5 or JSON file into a container.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the DOS data file, HDF5 (.h5) or JSON (.json).
+    select : dict, optional
+        Projection selectors, see :func:`read_dos`.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
+        Skipping them makes total DOS reads of projected files cheap.
+    cache : bool, optional
+        Whether to use the on-disk cache of :mod:`ddpc.io.cache`, defaults to
+        its global setting. Cached entries hold the whole file; selectors
+        are applied to the memory-mapped arrays.
+
+    Returns
+    -------
+    DensityOfStates
+        Energy grid, total and projected DOS and metadata of the file,
+        resampled onto the ``"grid"`` selector when given.
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    """
+    with stage("load"):
+        absfile = str(absf(p))
+        if not (CACHE_CONFIG["enabled"] if cache is None else cache):
+            dos, atom_info = _load_dos_file(absfile, select, projections)
+            return _resample(merge_equivalent(dos, absfile, select, atom_info), select)
+
+        # an entry with projections also serves total reads
+        for flag in (True,) if projections else (False, True):
+            with stage("cache"):
+                hit = fetch_entry(cache_key(absfile, f"dos-{flag:d}"))
+            if hit is not None:
+                dos = _dos_from_cache(*hit).subset(select)
+                dos = merge_equivalent(dos, absfile, select, hit[1].get("atom_info"))
+                return _resample(dos, select)
+
+        dos, atom_info = _load_dos_file(absfile, None, projections)
+        with stage("cache"):
+            arrays, meta = _dos_to_cache(dos)
+            meta["atom_info"] = atom_info
+            store_entry(cache_key(absfile, f"dos-{projections:d}"), arrays, meta)
+        dos = merge_equivalent(dos.subset(select), absfile, select, atom_info)
+        return _resample(dos, select)
+
+
+@logger.catch
+def _resample(dos: DensityOfStates, select: dict | None) -> DensityOfStates:
+    """Resample a loaded DOS onto the ``"grid"`` selector, if any."""
+    select = select or {}
+    grid = select.get("grid")
+    if grid is None or dos is None:
+        return dos
+    shift = dos.efermi if select.get("relative_to_fermi") else 0.0
+    return dos.resample(np.asarray(grid, dtype=float) + shift)
+
+
+def _load_dos_file(
+    absfile: str, select: dict | None, projections: bool
+) -> tuple[DensityOfStates, dict | None]:
+    """Dispatch to the HDF5 or JSON loader by file extension.
+
+    The ``AtomInfo`` section of a JSON file is returned along with the DOS,
+    so the ``"equivalent"`` selector does not parse the file again.
+    """
+    if absfile.endswith(".h5"):
+        return load_dos_h5(absfile, select, projections), None
+    if absfile.endswith(".json"):
+        dos, arrays = _parse_dos_json(absfile)
+        return _dos_from_json(dos, arrays, select, projections), dos.get("AtomInfo")
+    raise TypeError(f"{absfile} must be h5 or json file!")
+
+
+@logger.catch
+def load_dos_h5(
+    absfile: str, select: dict | None = None, projections: bool = True
+) -> DensityOfStates:
+    """Load a density of states from an HDF5 file.
 
     Parameters
     ----------
     absfile : str
         Path to the HDF5 DOS file (typically with .h5 extension).
-    mode : int
-        Projection mode for orbital-projected DOS data. Mode 0 forces
-        total DOS regardless of projection availability.
+    select : dict, optional
+        Projection selectors, see :func:`read_dos`. Datasets outside the
+        selection are never read, and only the energy window of the selected
+        datasets is read.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
 
     Returns
     -------
-    tuple of (polars.DataFrame, float, bool)
+    DensityOfStates
+        Energy grid, total and projected DOS and metadata of the file.
 
-        - DataFrame containing processed DOS data
-        - Fermi energy in eV extracted from the file
-        - Boolean indicating presence of orbital projection data
+    Raises
+    ------
+    TypeError
+        If the HDF5 file doesn't contain the required 'DosInfo' group, or if
+        critical metadata (Fermi energy or projection info) cannot be read.
     """
     with h5py.File(absfile, "r") as dos:
         dosinfo = dos["DosInfo"]
-        if isinstance(dosinfo, h5py.Group):
-            efermi_list = dosinfo["EFermi"]
-            if isinstance(efermi_list, h5py.Dataset):
-                efermi = efermi_list[0]
-            else:
-                logger.error("cannot read /BandInfo/EFermi")
-                sys.exit(1)
-
-            proj = dosinfo["Project"]
-            if isinstance(proj, h5py.Dataset):
-                iproj = proj[0]
-            else:
-                logger.error("cannot read /DosInfo/Project")
-                sys.exit(1)
-            if mode == 0:
-                df = read_tdos(dos)
-            elif iproj:
-                df = read_pdos_h5(dos, mode)
-            else:
-                df = read_tdos(dos)
-        else:
+        if not isinstance(dosinfo, h5py.Group):
             raise TypeError("h5 file must contain 'DosInfo' group!")
 
-    return df, efermi, bool(iproj)
+        efermi_list = dosinfo["EFermi"]
+        if isinstance(efermi_list, h5py.Dataset):
+            efermi = efermi_list[0]
+        else:
+            raise TypeError("cannot read /DosInfo/EFermi")
+
+        proj = dosinfo["Project"]
+        if isinstance(proj, h5py.Dataset):
+            iproj = bool(proj[0])
+        else:
+            raise TypeError("cannot read /DosInfo/Project")
+
+        energies = np.asarray(dos["/DosInfo/DosEnergy"], dtype=float)
+        es = _energy_window(energies, select, efermi)
+        add_bytes(energies.nbytes)
+        energies = energies[es]
+        spin_type = get_h5_str(dos, "/DosInfo/SpinType")[0]
+        spins = _select_spins(spin_type == "collinear", select)
+        tdos = np.array([dos[f"/DosInfo/Spin{ispin}/Dos"][es] for ispin, _ in spins], dtype=float)
+        add_bytes(tdos.nbytes)
+        elements: list[str] = get_h5_str(dos, "/AtomInfo/Elements")
+        info = {"efermi": efermi, "spin_type": spin_type, "projected": iproj}
+        if not (iproj and projections):
+            axes = projection_axes(spins, list(range(len(elements))), [], elements, [])
+            return DensityOfStates(energies, tdos, None, axes, info)
+
+        orbits: list[str] = get_h5_str(dos, "/DosInfo/Orbit")
+        norb: int = dos["/DosInfo/Spin1/ProjectDos/OrbitIndexs"][0]
+        ais, ois = _select_projections(elements, orbits[:norb], select)
+
+        proj = np.empty((len(spins), len(ais), len(ois), len(energies)))
+        with stage("projections", proj.nbytes):
+            for si, (ispin, _) in enumerate(spins):
+                for i, ai in enumerate(ais):
+                    for j, oi in enumerate(ois):
+                        dataset = dos[f"/DosInfo/Spin{ispin}/ProjectDos{ai + 1}/{oi + 1}"]
+                        _read_h5_segments(dataset, [(es.start, es.stop)], proj[si, i, j])
+
+    axes = projection_axes(spins, ais, ois, elements, orbits)
+    return DensityOfStates(energies, tdos, proj, axes, info)
 
 
 @logger.catch
-def read_dos_json(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
-    """Read density of states data from JSON file format.
+def load_dos_json(
+    absfile: str, select: dict | None = None, projections: bool = True
+) -> DensityOfStates:
+    """Load a density of states from a JSON file.
 
     Parameters
     ----------
     absfile : str
         Path to the JSON DOS file (typically with .json extension).
+    select : dict, optional
+        Projection selectors, see :func:`read_dos`. Only the numbers inside
+        the energy window are parsed.
+    projections : bool, default True
+        Whether to read orbital projections when the file contains them.
+
+    Returns
+    -------
+    DensityOfStates
+        Energy grid, total and projected DOS and metadata of the file.
+
+    Notes
+    -----
+    ``Contribution`` arrays are cut out before parsing and decoded straight
+    into the projection buffer, see :func:`ddpc.io.jsonio.load_json_skeleton`.
+    """
+    dos, arrays = _parse_dos_json(absfile)
+    return _dos_from_json(dos, arrays, select, projections)
+
+
+def _parse_dos_json(absfile: str) -> tuple[dict, JsonArrays]:
+    """Parse the skeleton of a DOS JSON file, see :func:`load_dos_json`."""
+    with stage("parse"):
+        dos, arrays = load_json_skeleton(absfile)
+        add_bytes(len(arrays.buffer))
+    return dos, arrays
+
+
+@logger.catch
+def _dos_from_json(
+    dos: dict, arrays: JsonArrays, select: dict | None, projections: bool
+) -> DensityOfStates:
+    """Build a density of states from a parsed JSON skeleton, see :func:`load_dos_json`."""
+    energies = np.asarray(dos["DosInfo"]["DosEnergy"], dtype=float)
+    nenergy = len(energies)
+    es = _energy_window(energies, select, dos["DosInfo"]["EFermi"])
+    energies = energies[es]
+    spin_type = dos["DosInfo"]["SpinType"]
+    spins = _select_spins(spin_type == "collinear", select)
+    tdos = np.array([dos["DosInfo"][f"Spin{ispin}"]["Dos"] for ispin, _ in spins], dtype=float)
+    tdos = tdos[:, es]
+    elements: list[str] = [atom["Element"] for atom in dos["AtomInfo"]["Atoms"]]
+    iproj = bool(dos["DosInfo"]["Project"])
+    info = {"efermi": dos["DosInfo"]["EFermi"], "spin_type": spin_type, "projected": iproj}
+    if not (iproj and projections):
+        axes = projection_axes(spins, list(range(len(elements))), [], elements, [])
+        return DensityOfStates(energies, tdos, None, axes, info)
+
+    orbits: list[str] = dos["DosInfo"]["Orbit"]
+    ais, ois = _select_projections(elements, orbits, select)
+    index = {(ai + 1, oi + 1): (i, j) for i, ai in enumerate(ais) for j, oi in enumerate(ois)}
+
+    proj = np.zeros((len(spins), len(ais), len(ois), len(energies)))
+    indices, outs = [], []
+    for si, (ispin, _) in enumerate(spins):
+        for p in dos["DosInfo"][f"Spin{ispin}"]["ProjectDos"]:
+            ij = index.get((p["AtomIndex"], p["OrbitIndex"]))
+            if ij is not None:
+                indices.append(p["Contribution"])
+                outs.append(proj[si, ij[0], ij[1]])
+    if len(energies) < nenergy:
+        # only the numbers inside the energy window are parsed
+        arrays = arrays.window(indices, [(es.start, es.stop)])
+        indices = list(range(len(outs)))
+    if len(energies):
+        with stage("projections", sum(arrays.spans[i][1] - arrays.spans[i][0] for i in indices)):
+            arrays.read_many(indices, outs)
+
+    axes = projection_axes(spins, ais, ois, elements, orbits)
+    return DensityOfStates(energies, tdos, proj, axes, info)
+
+
+@logger.catch
+def read_dos_h5(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
+    """Read density of states data from an HDF5 file.
+
+    Deprecated, use :func:`load_dos_h5` and :meth:`DensityOfStates.to_polars`,
+    or :func:`read_dos` with ``fmt=None``.
+
+    Parameters
+    ----------
+    absfile : str
+        Path to the HDF5 DOS file (typically with .h5 extension).
     mode : int
-        Projection mode for orbital-projected DOS data. Mode 0 forces
-        total DOS regardless of projection availability.
+        Projection mode, mode 0 gives the total DOS.
 
     Returns
     -------
     tuple of (polars.DataFrame, float, bool)
-
-        - DataFrame containing processed DOS data
-        - Fermi energy in eV extracted from the file
-        - Boolean indicating presence of orbital projection data
+        DOS with native float columns, Fermi energy in eV and whether the
+        file holds orbital projections.
     """
-    with open(absfile, encoding="utf-8") as fin:
-        dos = load(fin)
-        efermi = dos["DosInfo"]["EFermi"]
-    iproj = dos["DosInfo"]["Project"]
-    if mode == 0:
-        df = read_tdos(dos, h5=False)
-    elif iproj:
-        df = read_pdos_json(dos, mode)
-    else:
-        df = read_tdos(dos, h5=False)
+    _deprecated("read_dos_h5", "load_dos_h5(absfile).to_polars(mode)")
+    dos = load_dos_h5(absfile, projections=mode != 0)
+    return dos.to_polars(mode), dos.efermi, dos.projected
 
-    return df, efermi, bool(iproj)
+
+@logger.catch
+def read_dos_json(absfile: str, mode: int) -> tuple[pl.DataFrame, float, bool]:
+    """Read density of states data from a JSON file.
+
+    Deprecated, use :func:`load_dos_json` and :meth:`DensityOfStates.to_polars`,
+    or :func:`read_dos` with ``fmt=None``.
+
+    Parameters
+    ----------
+    absfile : str
+        Path to the JSON DOS file (typically with .json extension).
+    mode : int
+        Projection mode, mode 0 gives the total DOS.
+
+    Returns
+    -------
+    tuple of (polars.DataFrame, float, bool)
+        DOS with native float columns, Fermi energy in eV and whether the
+        file holds orbital projections.
+    """
+    _deprecated("read_dos_json", "load_dos_json(absfile).to_polars(mode)")
+    dos = load_dos_json(absfile, projections=mode != 0)
+    return dos.to_polars(mode), dos.efermi, dos.projected
 
 
 @logger.catch
 def read_tdos(dos: h5py.File | dict, h5: bool = True) -> pl.DataFrame:
-    """Read total (non-projected) density of states data.
+    """Read total (non-projected) density of states data from an opened file.
+
+    Deprecated, use :func:`load_dos` with ``projections=False`` and
+    :meth:`DensityOfStates.to_polars` with mode 0.
 
     Parameters
     ----------
     dos : h5py.File or dict
-        DOS data container, either an opened HDF5 file object or
-        a dictionary loaded from JSON.
+        Opened HDF5 file, or the document loaded from a JSON file.
     h5 : bool, default True
-        Flag indicating the data source format. True for HDF5, False for JSON.
+        Unused, the type of ``dos`` tells the format.
 
     Returns
     -------
     polars.DataFrame
-        DataFrame containing total DOS with energy points and DOS values.
+        Total DOS with native float columns.
     """
-    energies = np.asarray(dos["DosInfo"]["DosEnergy"])
-
-    if h5:
-        spin_type = dos["DosInfo"]["SpinType"][0]
-    else:
-        spin_type = dos["DosInfo"]["SpinType"]
-
-    if spin_type == "collinear":
-        densities = {
-            "energy": energies,
-            "up": np.asarray(dos["DosInfo"]["Spin1"]["Dos"]),
-            "down": np.asarray(dos["DosInfo"]["Spin2"]["Dos"]),
-        }
-    else:
-        densities = {
-            "energy": energies,
-            "dos": np.asarray(dos["DosInfo"]["Spin1"]["Dos"]),
-        }
-    return pl.DataFrame(data=densities)
+    _deprecated("read_tdos", "load_dos(p, projections=False).to_polars(0)")
+    return _legacy_dos(dos, False).to_polars(0)
 
 
 @logger.catch
 def read_pdos_h5(dos: h5py.File, mode: int) -> pl.DataFrame:
-    """Read orbital-projected density of states data from HDF5 file.
+    """Read orbital-projected density of states data from an opened HDF5 file.
+
+    Deprecated, use :func:`load_dos_h5` and :meth:`DensityOfStates.to_polars`.
 
     Parameters
     ----------
     dos : h5py.File
-        Opened HDF5 file object containing projected DOS data.
+        Opened HDF5 file containing projected DOS data.
     mode : int
-        Projection mode determining which orbital contributions to include.
+        Projection mode, see :func:`read_dos`.
 
     Returns
     -------
     polars.DataFrame
-        DataFrame containing projected DOS with orbital contributions.
+        Projected DOS with native float columns.
     """
-    energies: list[float] = dos["/DosInfo/DosEnergy"]
-    data = {}
-    orbitals: list[str] = dos["/DosInfo/Orbit"]
-
-    atom_index: int = dos["/DosInfo/Spin1/ProjectDos/AtomIndexs"][0]  # 2
-    orb_index: int = dos["/DosInfo/Spin1/ProjectDos/OrbitIndexs"][0]  # 9
-    if dos["/DosInfo/SpinType"] == "collinear":
-        data.update(
-            {
-                "tdos-up": np.asarray(dos["/DosInfo/Spin1/Dos"]),
-                "tdos-down": np.asarray(dos["/DosInfo/Spin2/Dos"]),
-            },
-        )
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-up": dos[
-                            f"/DosInfo/Spin1/ProjectDos{ai + 1}/{oi + 1}"
-                        ]
-                    }
-                )
-                data.update(
-                    {
-                        f"{ai + 1}{orbitals[oi]}-down": dos[
-                            f"/DosInfo/Spin2/ProjectDos{ai + 1}/{oi + 1}"
-                        ]
-                    }
-                )
-    else:
-        data.update(
-            {"tdos": np.asarray(dos["/DosInfo/Spin1/Dos"])},
-        )
-        for ai in range(atom_index):
-            for oi in range(orb_index):
-                data.update(
-                    {f"{ai + 1}{orbitals[oi]}": dos[f"/DosInfo/Spin1/ProjectDos{ai + 1}/{oi + 1}"]}
-                )
-
-    if mode == 3:
-        elements: list[str] = get_h5_str(dos, "/AtomInfo/Elements")
-    else:
-        elements = []
-    _data = _refactor_dos(energies, data, mode, elements)
-    logger.info(f"{_data=}")
-
-    return pl.DataFrame(_data)
+    _deprecated("read_pdos_h5", "load_dos_h5(absfile).to_polars(mode)")
+    return _legacy_dos(dos, True).to_polars(mode)
 
 
 @logger.catch
 def read_pdos_json(dos: dict, mode: int) -> pl.DataFrame:
-    """Read orbital-projected density of states data from JSON file.
+    """Read orbital-projected density of states data from a loaded JSON document.
+
+    Deprecated, use :func:`load_dos_json` and :meth:`DensityOfStates.to_polars`.
 
     Parameters
     ----------
     dos : dict
-        Dictionary containing projected DOS data loaded from JSON.
+        Document loaded from a JSON DOS file.
     mode : int
-        Projection mode determining which orbital contributions to include.
+        Projection mode, see :func:`read_dos`.
 
     Returns
     -------
     polars.DataFrame
-        DataFrame containing projected DOS with orbital contributions.
+        Projected DOS with native float columns.
     """
-    energies: list[float] = dos["DosInfo"]["DosEnergy"]
-    data = {}
-    orbitals: list[str] = dos["DosInfo"]["Orbit"]
-
-    if dos["DosInfo"]["SpinType"] == "collinear":
-        data.update(
-            {
-                "tdos-up": dos["DosInfo"]["Spin1"]["Dos"],
-                "tdos-down": dos["DosInfo"]["Spin2"]["Dos"],
-            },
-        )
-        project = dos["DosInfo"]["Spin1"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-up": contrib})
-        project = dos["DosInfo"]["Spin2"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}-down": contrib})
-
-    else:
-        data.update(
-            {"tdos": dos["DosInfo"]["Spin1"]["Dos"]},
-        )
-        project = dos["DosInfo"]["Spin1"]["ProjectDos"]
-        for p in project:
-            atom_index = p["AtomIndex"]
-            orb_index = p["OrbitIndex"] - 1
-            contrib = p["Contribution"]
-            data.update({f"{atom_index}{orbitals[orb_index]}": contrib})
-
-    if mode == 3:
-        elements: list[str] = [atom["Element"] for atom in dos["AtomInfo"]["Atoms"]]
-    else:
-        elements = []
-    _data = _refactor_dos(energies, data, mode, elements)
-
-    return pl.DataFrame(_data)
-
-
-@logger.catch
-def _dos_spdf(data: dict, energies: np.ndarray) -> dict:
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):  # do not process total dos
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        _, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{o[0]}-{updown}"
-        else:
-            key = f"{o[0]}"
-        _inplace_update_data(_data, key, v)
-    return _data
+    _deprecated("read_pdos_json", "load_dos_json(absfile).to_polars(mode)")
+    return _legacy_dos(dos, True).to_polars(mode)
 
 
 @logger.catch
-def _dos_spxpy(data: dict, energies: np.ndarray) -> dict:
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):  # do not process total dos
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        _, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{o}-{updown}"
-        else:
-            key = f"{o}"
-        _inplace_update_data(_data, key, v)
-    return _data
+def _legacy_dos(dos: h5py.File | dict, projections: bool) -> DensityOfStates:
+    """Load the density of states of an opened HDF5 file or a loaded JSON document."""
+    if isinstance(dos, h5py.File):
+        return load_dos_h5(dos.filename, projections=projections)
+    # the document is encoded again so its arrays take the skeleton path
+    return _dos_from_json(*_skeleton(json.dumps(dos).encode()), None, projections)
 
 
 @logger.catch
-def _dos_element(data: dict, elements: list[str] | None, energies: np.ndarray) -> dict:
-    if not elements:
-        raise ValueError(f"{elements=}")
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):  # do not process total dos
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, _ = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{elements[a - 1]}-{updown}"
-        else:
-            key = f"{elements[a - 1]}"
-        _inplace_update_data(_data, key, v)
-    return _data
-
-
-@logger.catch
-def _dos_atomspdf(data: dict, energies: np.ndarray) -> dict:
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):  # do not process total dos
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, o = _split_atomindex_orbital(ao)
-        if updown:
-            key = f"{a}{o[0]}-{updown}"
-        else:
-            key = f"{a}{o[0]}"
-        _inplace_update_data(_data, key, v)
-    return _data
+def _refactor_dos(proj: np.ndarray, axes: dict, mode: int | dict) -> dict:
+    """Aggregate a projection tensor into named DOS columns.
 
+    Parameters
+    ----------
+    proj : numpy.ndarray
+        Projections of shape ``(spin, atom, orbital, energy)``.
+    axes : dict
+        Labels of the projection axes, see :func:`ddpc.io.projection.projection_axes`.
+    mode : int or dict
+        Projection mode, a key of :data:`ddpc.io.projection.DOS_MODES`, or
+        channel groups, see :func:`read_dos`.
 
-@logger.catch
-def _dos_atomt2geg(data: dict, energies: np.ndarray) -> dict:
-    _data = {"energy": energies}
-    for k, v in data.items():
-        if k.startswith("tdos"):  # do not process total dos
-            _data[k] = v
-            continue
-        ao, updown = _get_ao_spin(k)
-        a, o = _split_atomindex_orbital(ao)
-        if o in ["dxy", "dxz", "dyz"]:
-            if updown:
-                key = f"{a}t2g-{updown}"
-            else:
-                key = f"{a}t2g"
-            _inplace_update_data(_data, key, v)
-        elif o in ["dz2", "dx2y2"]:
-            if updown:
-                key = f"{a}eg-{updown}"
-            else:
-                key = f"{a}eg"
-            _inplace_update_data(_data, key, v)
+    Returns
+    -------
+    dict
+        ``{channel}[-{spin}]`` column name to ``(nenergy,)`` array.
+    """
+    labels, out = aggregate(proj, axes, mode_rule(mode, DOS_MODES))
+    channels = ["".join(label) for label in labels]
 
+    _data = {}
+    for si, updown in enumerate(axes["spins"]):
+        for ci, channel in enumerate(channels):
+            _data[f"{channel}-{updown}" if updown else channel] = out[si, ci]
     return _data
 
 
 @logger.catch
-def _refactor_dos(
-    energies: list | np.ndarray, data: dict, mode: int, elements: list[str] | None = None
-) -> dict:
-    energies = np.asarray(energies)
-    if mode == 1:  # spdf
-        _data = _dos_spdf(data, energies)
+def _long_dos(
+    energies: np.ndarray,
+    axes: dict,
+    tdos: np.ndarray,
+    proj: np.ndarray | None = None,
+    mode: int | dict = 5,
+) -> pl.DataFrame:
+    """Build the long layout of total or projected DOS straight from arrays.
 
-    elif mode == 2:  # spxpy...
-        _data = _dos_spxpy(data, energies)
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        Energy grid of shape ``(energy,)``.
+    axes : dict
+        Labels of the projection axes, see :func:`ddpc.io.projection.projection_axes`.
+        Only ``"spins"`` is needed for total DOS.
+    tdos : numpy.ndarray
+        Total DOS of shape ``(spin, energy)``.
+    proj : numpy.ndarray, optional
+        Projections of shape ``(spin, atom, orbital, energy)``. Only the total
+        DOS is returned when omitted.
+    mode : int or dict, default 5
+        Projection mode, a key of :data:`ddpc.io.projection.DOS_MODES`, or
+        channel groups, see :func:`read_dos`.
 
-    elif mode == 3:  # element
-        _data = _dos_element(data, elements, energies)
+    Returns
+    -------
+    polars.DataFrame
+        ``energy, spin, channel, dos`` rows ordered by spin, channel and
+        energy, with the total DOS as channel ``"tdos"`` first. Spin and
+        channel are enums.
+    """
+    channels = ["tdos"]
+    values = tdos[:, None]
+    if proj is not None:
+        labels, out = aggregate(proj, axes, mode_rule(mode, DOS_MODES))
+        channels += ["".join(label) for label in labels]
+        values = np.concatenate([values, out], axis=1)
+
+    nspin, nchannel, nenergy = values.shape
+    spin = np.repeat(np.arange(nspin, dtype=np.uint32), nchannel * nenergy)
+    channel = np.tile(np.repeat(np.arange(nchannel, dtype=np.uint32), nenergy), nspin)
+    return pl.DataFrame(
+        {
+            "energy": np.tile(energies, nspin * nchannel),
+            "spin": pl.Series(spin).cast(pl.Enum([s or "none" for s in axes["spins"]])),
+            "channel": pl.Series(channel).cast(pl.Enum(channels)),
+            "dos": values.ravel(),
+        }
+    )
 
-    elif mode == 4:  # atom+spdf
-        _data = _dos_atomspdf(data, energies)
 
-    elif mode == 5:  # atom+spxpy...
-        _data = {key: dataset[:] for key, dataset in data.items()}
-    elif mode == 6:  # atom+t2g/eg
-        _data = _dos_atomt2geg(data, energies)
+@logger.catch
+def _dos_to_cache(dos: DensityOfStates) -> tuple[dict, dict]:
+    """Split a density of states into cache arrays and JSON metadata."""
+    arrays = {"energies": dos.energies, "dos": dos.dos}
+    if dos.projections is not None:
+        arrays["projections"] = dos.projections
+    meta = {
+        **dos.axes,
+        "efermi": float(dos.efermi),
+        "numpy_efermi": isinstance(dos.efermi, np.generic),
+        "spin_type": dos.spin_type,
+        "projected": dos.projected,
+    }
+    return arrays, meta
 
-    else:
-        print(f"{mode=} not supported yet")
-        raise RuntimeError(f"Unsupported mode: {mode}")
 
-    return _data
+@logger.catch
+def _dos_from_cache(arrays: dict, meta: dict) -> DensityOfStates:
+    """Rebuild a density of states from memory-mapped cache arrays."""
+    efermi = np.float64(meta["efermi"]) if meta["numpy_efermi"] else meta["efermi"]
+    info = {"efermi": efermi, "spin_type": meta["spin_type"], "projected": meta["projected"]}
+    projections = arrays.get("projections")
+    return DensityOfStates(arrays["energies"], arrays["dos"], projections, meta, info)
@@ -0,0 +1,217 @@
+"""Stage-level timing and memory instrumentation of the readers and writers.
+
+Instrumentation is off unless an :func:`instrument` block is active in the
+current context; the stages of :func:`~ddpc.io.band.read_band`,
+:func:`~ddpc.io.dos.read_dos`, :func:`~ddpc.io.structure.read_structure`,
+:func:`~ddpc.io.structure.write_structure` and the functions they call are
+then recorded in a :class:`Report`. Outside such a block a stage costs one
+context variable lookup.
+
+Stages nest, and are reported by their path, e.g. ``read_band/load/projections``.
+Every stage records its number of calls, wall time, the bytes read from (or
+written to) files and, when memory tracing is on, the peak of the memory
+traced by :mod:`tracemalloc`. Traced memory covers NumPy buffers and Python
+objects, not the allocations made by Polars or HDF5 themselves; the peak RSS
+of the process is reported for the whole block.
+
+Stages run in worker processes, e.g. by
+:func:`~ddpc.io.band.read_band_many`, are not recorded.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from types import ModuleType
+
+# peak RSS comes from the POSIX resource module, missing on Windows
+_resource: ModuleType | None
+try:
+    import resource as _resource
+except ImportError:  # pragma: no cover - depends on the platform
+    _resource = None
+
+# report of the active instrument block
+_REPORT: ContextVar["Report | None"] = ContextVar("ddpc_report", default=None)
+# returned by stage() when nothing is recorded
+_NO_STAGE = nullcontext()
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class Report:
+    """Stages recorded by an :func:`instrument` block.
+
+    Attributes
+    ----------
+    stages : dict
+        Totals of every stage path: ``calls``, ``seconds``, ``bytes`` and
+        ``peak_bytes`` (None without memory tracing).
+    seconds : float
+        Wall time of the whole block.
+    peak_rss_bytes : int or None
+        Peak resident set size of the process at the end of the block, None
+        where the platform does not report it.
+    """
+
+    __slots__ = ("_stack", "memory", "peak_rss_bytes", "seconds", "stages")
+
+    def __init__(self, memory: bool) -> None:
+        """Start an empty report."""
+        self.memory = memory
+        self.stages: dict[str, dict] = {}
+        self.seconds = 0.0
+        self.peak_rss_bytes: int | None = 0
+        self._stack: list[_Stage] = []
+
+    def __repr__(self) -> str:
+        """Summarise the report."""
+        return f"Report(stages={len(self.stages)}, seconds={self.seconds:.3f})"
+
+    def to_dict(self) -> dict:
+        """Return the report as plain data.
+
+        Returns
+        -------
+        dict
+            ``seconds``, ``peak_rss_bytes`` and the list of ``stages``, each
+            with its ``stage`` path, in the order they were first entered.
+        """
+        return {
+            "seconds": self.seconds,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "stages": [{"stage": path, **totals} for path, totals in self.stages.items()],
+        }
+
+    def to_json(self, indent: int | None = None) -> str:
+        """Return the report as a JSON string, see :meth:`to_dict`."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+class _Stage:
+    """One entered stage, accumulated into its report on exit."""
+
+    __slots__ = ("name", "nbytes", "path", "peak", "report", "start")
+
+    def __init__(self, report: Report, name: str, nbytes: int) -> None:
+        self.report = report
+        self.name = name
+        self.nbytes = nbytes
+        self.path = ""
+        self.peak = 0
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        stack = self.report._stack
+        self.path = f"{stack[-1].path}/{self.name}" if stack else self.name
+        if self.report.memory:
+            # the peak so far belongs to the parent, restart counting for this stage
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        seconds = time.perf_counter() - self.start
+        stack = self.report._stack
+        stack.pop()
+        totals = self.report.stages.setdefault(
+            self.path, {"calls": 0, "seconds": 0.0, "bytes": 0, "peak_bytes": None}
+        )
+        totals["calls"] += 1
+        totals["seconds"] += seconds
+        totals["bytes"] += self.nbytes
+        if self.report.memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            totals["peak_bytes"] = max(totals["peak_bytes"] or 0, peak)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+
+
+@contextmanager
+def instrument(memory: bool = True) -> Iterator[Report]:
+    """Record the stages of the readers and writers called inside the block.
+
+    Parameters
+    ----------
+    memory : bool, default True
+        Trace memory with :mod:`tracemalloc` to report the peak of every
+        stage. Tracing slows Python allocations down noticeably.
+
+    Yields
+    ------
+    Report
+        Filled in as the stages run, complete when the block exits.
+
+    Examples
+    --------
+    >>> with instrument() as report:
+    ...     df, efermi, isproj = read_band("band.h5", mode=2)
+    >>> print(report.to_json(indent=2))
+    """
+    report = Report(memory)
+    token = _REPORT.set(report)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        report.peak_rss_bytes = _peak_rss()
+        if started:
+            tracemalloc.stop()
+        _REPORT.reset(token)
+
+
+def _peak_rss() -> int | None:
+    """Return the peak resident set size of the process, None without :mod:`resource`."""
+    if _resource is None:
+        return None
+    return _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def stage(name: str, nbytes: int = 0) -> _Stage | nullcontext:
+    """Open a stage of the active report, a no-op without one.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage, appended to the path of the enclosing stage.
+    nbytes : int, default 0
+        Bytes read or written by the stage, more can be added with
+        :func:`add_bytes`.
+
+    Returns
+    -------
+    context manager
+        Records the stage on exit.
+    """
+    report = _REPORT.get()
+    if report is None:
+        return _NO_STAGE
+    return _Stage(report, name, nbytes)
+
+
+def add_bytes(nbytes: int) -> None:
+    """Add bytes read or written to the innermost open stage, if recording."""
+    report = _REPORT.get()
+    if report is not None and report._stack:
+        report._stack[-1].nbytes += nbytes
+
+
+def file_bytes(p: str | Path) -> int:
+    """Return the size of a file for a stage, 0 when not recording or not a file.
+
+    Paths such as ASE's ``file@index`` are not stat'ed, so they count 0 bytes.
+    """
+    if _REPORT.get() is None:
+        return 0
+    path = Path(p)
+    return path.stat().st_size if path.is_file() else 0
@@ -0,0 +1,225 @@
+"""Load DS-PAW JSON output with the fastest available parser.
+
+orjson or msgspec are used when installed, the standard library ``json``
+module otherwise. Large numeric arrays can be left out of the parsed document
+and decoded straight into NumPy buffers with :func:`load_json_skeleton`.
+"""
+
+import json
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import polars as pl
+from loguru import logger
+
+# parse function of the backend
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        _loads = msgspec.json.decode
+    except ImportError:
+        JSON_BACKEND = "json"
+        _loads = json.loads
+
+
+# commas become line breaks and JSON whitespace is dropped, giving one number per line
+_TO_LINES = bytes.maketrans(b",", b"\n")
+_WHITESPACE = b" \t\r\n"
+# bytes of JSON text decoded per parse, bounds the temporary copies
+_CHUNK_BYTES = 1 << 25
+
+
+class JsonArrays:
+    """Numeric arrays cut out of a JSON document, decoded on demand.
+
+    Parameters
+    ----------
+    buffer : bytes
+        Raw JSON document.
+    spans : list of tuple of (int, int)
+        Byte range of the comma-separated numbers of every array, in
+        document order.
+    """
+
+    __slots__ = ("buffer", "spans")
+
+    def __init__(self, buffer: bytes, spans: list[tuple[int, int]]) -> None:
+        """Store the document and the array spans."""
+        self.buffer = buffer
+        self.spans = spans
+
+    def __len__(self) -> int:
+        """Return the number of arrays."""
+        return len(self.spans)
+
+    def read(self, index: int, out: np.ndarray) -> np.ndarray:
+        """Decode one array into a preallocated buffer, see :meth:`read_many`."""
+        self.read_many([index], [out])
+        return out
+
+    def window(self, indices: list[int], segments: list[tuple[int, int]]) -> "JsonArrays":
+        """Cut value ranges out of several arrays without decoding them.
+
+        Value boundaries are located with a vectorised scan for commas, so
+        only the numbers inside the ranges are parsed later on.
+
+        Parameters
+        ----------
+        indices : list of int
+            Arrays to cut.
+        segments : list of tuple of (int, int)
+            ``[start, stop)`` value ranges taken from every array.
+
+        Returns
+        -------
+        JsonArrays
+            Accessor of the pieces, ordered by array and then by segment.
+
+        Raises
+        ------
+        ValueError
+            If a range reaches past the end of an array.
+        """
+        spans = []
+        for index in indices:
+            start, end = self.spans[index]
+            text = np.frombuffer(self.buffer, np.uint8, end - start, start)
+            # value j spans the bytes between bounds[j] and bounds[j + 1]
+            bounds = np.concatenate([[start - 1], np.flatnonzero(text == ord(",")) + start, [end]])
+            for first, stop in segments:
+                if stop >= len(bounds):
+                    count = len(bounds) - 1
+                    raise ValueError(f"JSON array {index} has {count} values, need {stop}")
+                spans.append((int(bounds[first]) + 1, int(bounds[stop])))
+        return JsonArrays(self.buffer, spans)
+
+    def read_many(self, indices: list[int], outs: list[np.ndarray]) -> None:
+        """Decode several arrays into preallocated buffers.
+
+        The numbers of consecutive arrays are parsed together by the
+        multithreaded Polars CSV reader, in chunks of about 32 MB of text, so
+        no Python float or list is created.
+
+        Parameters
+        ----------
+        indices : list of int
+            Placeholders left in the skeleton document in place of the arrays.
+        outs : list of numpy.ndarray
+            Contiguous float64 destination of every array; each size must
+            match the length of its array.
+
+        Raises
+        ------
+        ValueError
+            If an array does not hold exactly as many numbers as its buffer;
+            an empty array holds none.
+        """
+        for index, out in zip(indices, outs, strict=True):
+            start, end = self.spans[index]
+            # an empty array has no separator and no number
+            empty = not self.buffer[start:end].strip(_WHITESPACE)
+            count = 0 if empty else self.buffer.count(b",", start, end) + 1
+            if count != out.size:
+                raise ValueError(f"JSON array {index} has {count} values, expected {out.size}")
+        # empty arrays would add a missing value to the joined text
+        filled = [(index, out) for index, out in zip(indices, outs, strict=True) if out.size]
+        indices, outs = [index for index, _ in filled], [out for _, out in filled]
+
+        first = 0
+        while first < len(indices):
+            last, size = first, 0
+            while last < len(indices) and (last == first or size < _CHUNK_BYTES):
+                start, end = self.spans[indices[last]]
+                size += end - start
+                last += 1
+            text = b",".join(self.buffer[slice(*self.spans[i])] for i in indices[first:last])
+            text = text.translate(_TO_LINES, _WHITESPACE)
+            frame = pl.read_csv(text, has_header=False, schema={"value": pl.Float64})
+            values = frame.to_series().to_numpy()
+            offset = 0
+            for out in outs[first:last]:
+                out.reshape(-1)[:] = values[offset : offset + out.size]
+                offset += out.size
+            first = last
+
+
+@logger.catch
+def load_json(p: str | Path) -> dict:
+    """Parse a whole JSON file with the fastest available backend.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the JSON file.
+
+    Returns
+    -------
+    dict
+        Parsed document.
+    """
+    return _loads(Path(p).read_bytes())
+
+
+@logger.catch
+def load_json_skeleton(p: str | Path, key: str = "Contribution") -> tuple[dict, JsonArrays]:
+    """Parse a JSON file while leaving the numeric arrays of one key undecoded.
+
+    Every ``"{key}": [...]`` array is replaced by its integer position before
+    parsing, so the parser only sees a small skeleton document and never
+    builds Python floats for the arrays. The arrays are then decoded with
+    :meth:`JsonArrays.read_many` straight into NumPy buffers.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the JSON file.
+    key : str, default "Contribution"
+        Object key whose flat numeric arrays are cut out.
+
+    Returns
+    -------
+    tuple of (dict, JsonArrays)
+        Skeleton document, with the array index in place of each array, and
+        the accessor of the arrays.
+
+    Raises
+    ------
+    ValueError
+        If an array of ``key`` holds nested arrays instead of numbers.
+
+    Examples
+    --------
+    >>> doc, arrays = load_json_skeleton("pdos.json")
+    >>> entry = doc["DosInfo"]["Spin1"]["ProjectDos"][0]
+    >>> values = arrays.read(entry["Contribution"], np.empty(doc["DosInfo"]["NumberOfDos"]))
+    """
+    return _skeleton(Path(p).read_bytes(), key)
+
+
+def _skeleton(buffer: bytes, key: str = "Contribution") -> tuple[dict, JsonArrays]:
+    """Parse a JSON document while leaving the arrays of one key undecoded."""
+    pattern = re.compile(rb'"' + re.escape(key.encode()) + rb'"\s*:\s*\[')
+    pieces = []
+    spans: list[tuple[int, int]] = []
+    last = 0
+    for match in pattern.finditer(buffer):
+        start = match.end()
+        end = buffer.index(b"]", start)
+        if buffer.find(b"[", start, end) != -1:
+            raise ValueError(f"JSON array of {key!r} at byte {start} is nested, expected numbers")
+        pieces += [buffer[last : match.end() - 1], str(len(spans)).encode()]
+        spans.append((start, end))
+        last = end + 1
+    pieces.append(buffer[last:])
+    return _loads(b"".join(pieces)), JsonArrays(buffer, spans)
@@ -0,0 +1,607 @@
+"""Aggregate orbital projections into output channels with grouping matrices."""
+
+import os
+import re
+from collections.abc import Callable
+
+import numpy as np
+from ase.data import chemical_symbols
+from loguru import logger
+
+from ddpc.io.instrument import stage
+
+# atom grouping, orbital grouping of every projection mode; a dict of channel
+# groups (see compile_groups) added under any key is a mode as well
+BAND_MODES: dict[int, tuple[str | None, str | None]] = {
+    1: ("element", None),
+    2: ("element", "shell"),
+    3: ("element", "orbital"),
+    4: ("atom", "shell"),
+    5: ("atom", "orbital"),
+}
+DOS_MODES: dict[int, tuple[str | None, str | None]] = {
+    1: (None, "shell"),
+    2: (None, "orbital"),
+    3: ("element", None),
+    4: ("atom", "shell"),
+    5: ("atom", "orbital"),
+    6: ("atom", "t2geg"),
+}
+
+# ways to merge the projections of symmetry-equivalent atoms
+MERGES = ("sum", "average")
+
+# DS-PAW names the dx2-y2 orbital "dx2"
+T2GEG = {"dxy": "t2g", "dxz": "t2g", "dyz": "t2g", "dz2": "eg", "dx2": "eg", "dx2y2": "eg"}
+# orbital terms of a channel group string: shells, t2g/eg and the orbital names of DS-PAW
+_ORBITAL_TERMS = frozenset(
+    ["s", "p", "d", "f", "t2g", "eg", "py", "pz", "px", *T2GEG] + [f"f{m}" for m in range(-3, 4)]
+)
+
+# selectors of a channel group, and the separators between the terms of its string form
+GROUP_KEYS = ("atoms", "elements", "orbitals", "spins")
+_GROUP_SEPARATORS = re.compile(r"[\s,+]+")
+_ATOM_RANGE = re.compile(r"(\d+)(?:-(\d+))?")
+
+# memory budget in bytes of aggregate_chunked, changed with set_memory_budget;
+# $DDPC_MEMORY_BUDGET is read by memory_budget when it is None
+MEMORY_CONFIG: dict = {"budget": None}
+# a chunk, its partial contraction and its channel sums are alive at the same time
+_CHUNK_COPIES = 3
+
+
+@logger.catch
+def projection_axes(
+    spins: list[tuple[int, str]],
+    ais: list[int],
+    ois: list[int],
+    elements: list[str],
+    orbitals: list[str],
+) -> dict:
+    """Label the axes of a projection tensor read for a selection.
+
+    Parameters
+    ----------
+    spins : list of tuple of (int, str)
+        Selected spin channels as returned by ``_select_spins``.
+    ais, ois : list of int
+        Selected 0-based atom and orbital indices.
+    elements : list of str
+        Element symbol of every atom in the file.
+    orbitals : list of str
+        Orbital names stored in the file.
+
+    Returns
+    -------
+    dict
+        ``spins`` (column suffixes), ``atoms`` (1-based indices), ``elements``
+        and ``orbitals`` of the tensor entries along axes 0, 1, 1 and 2.
+    """
+    return {
+        "spins": [updown for _, updown in spins],
+        "atoms": [ai + 1 for ai in ais],
+        "elements": [elements[ai] for ai in ais],
+        "orbitals": [orbitals[oi] for oi in ois],
+    }
+
+
+def mode_rule(mode: int | dict, modes: dict) -> tuple[str | None, str | None] | dict:
+    """Look up the grouping rule of a projection mode.
+
+    Parameters
+    ----------
+    mode : int or dict
+        Key of ``modes``, or channel groups used as they are, see
+        :func:`compile_groups`.
+    modes : dict
+        Mode table, :data:`BAND_MODES` or :data:`DOS_MODES`.
+
+    Returns
+    -------
+    tuple of (str or None, str or None) or dict
+        Atom and orbital grouping of :func:`group_matrix`, or channel groups.
+
+    Raises
+    ------
+    RuntimeError
+        If ``mode`` is neither channel groups nor a key of ``modes``.
+    """
+    if isinstance(mode, dict):
+        return mode
+    if mode not in modes:
+        raise RuntimeError(f"Unsupported mode: {mode}")
+    return modes[mode]
+
+
+@logger.catch
+def group_matrix(keys: list[str], kind: str | None) -> tuple[list[str], np.ndarray]:
+    """Build the 0/1 matrix mapping atoms or orbitals onto channel groups.
+
+    Parameters
+    ----------
+    keys : list of str
+        Atom ids, element symbols or orbital names of the projection axis,
+        depending on ``kind``.
+    kind : str or None
+        Grouping rule:
+
+        - None: sum the whole axis into a single unnamed group
+        - "atom", "element", "orbital": one group per distinct key
+        - "shell": one group per orbital shell (first letter of the name)
+        - "t2geg": d orbitals into t2g and eg, other orbitals are dropped
+
+    Returns
+    -------
+    tuple of (list of str, numpy.ndarray)
+        Group labels in first-seen order and the ``(ngroup, len(keys))``
+        grouping matrix.
+    """
+    if kind is None:
+        return [""], np.ones((1, len(keys)))
+    if kind == "shell":
+        groups = [k[0] for k in keys]
+    elif kind == "t2geg":
+        groups = [T2GEG.get(k, "") for k in keys]
+    elif kind in ("atom", "element", "orbital"):
+        groups = list(keys)
+    else:
+        raise ValueError(f"unknown grouping {kind=}")
+
+    labels = [g for g in dict.fromkeys(groups) if g]
+    index = {g: i for i, g in enumerate(labels)}
+    matrix = np.zeros((len(labels), len(keys)))
+    for j, g in enumerate(groups):
+        if g:
+            matrix[index[g], j] = 1.0
+    return labels, matrix
+
+
+@logger.catch
+def aggregate(
+    proj: np.ndarray, axes: dict, rule: tuple[str | None, str | None] | dict
+) -> tuple[list[tuple[str, str]], np.ndarray]:
+    """Contract a projection tensor into channels in one einsum.
+
+    Parameters
+    ----------
+    proj : numpy.ndarray
+        Projection tensor of shape ``(spin, atom, orbital, ...)``, trailing
+        axes are ``(band, kpoint)`` for bands and ``(energy,)`` for DOS.
+    axes : dict
+        Labels of the projection axes, see :func:`projection_axes`.
+    rule : tuple of (str or None, str or None) or dict
+        Atom and orbital grouping, see :func:`group_matrix`, or channel
+        groups, see :func:`compile_groups`.
+
+    Returns
+    -------
+    tuple of (list of tuple of (str, str), numpy.ndarray)
+        ``(atom group, orbital group)`` label of every channel, ``(name, "")``
+        for channel groups, and the aggregated array of shape
+        ``(spin, channel, ...)``.
+    """
+    if isinstance(rule, dict):
+        labels, columns, matrix = compile_groups(rule, axes)
+        nspin, natom, norb, *rest = proj.shape
+        flat = proj.reshape(nspin, natom * norb, -1)[:, columns]
+        with stage("aggregate"):
+            out = matrix @ flat
+        return labels, out.reshape(nspin, len(labels), *rest)
+    atom_labels, amat = group_matrix(_atom_keys(axes, rule[0]), rule[0])
+    orb_labels, omat = group_matrix(axes["orbitals"], rule[1])
+    with stage("aggregate"):
+        out = np.einsum("ga,ho,sao...->sgh...", amat, omat, proj, optimize=True)
+    labels = [(a, o) for a in atom_labels for o in orb_labels]
+    return labels, out.reshape(out.shape[0], len(labels), *out.shape[3:])
+
+
+@logger.catch
+def aggregate_chunked(
+    read: Callable[[slice, slice], np.ndarray],
+    shape: tuple[int, ...],
+    axes: dict,
+    rule: tuple[str | None, str | None] | dict,
+    budget: int | None = None,
+) -> tuple[list[tuple[str, str]], np.ndarray]:
+    """Aggregate a projection tensor read chunk by chunk into channels.
+
+    Same result as :func:`aggregate`, without ever holding the whole tensor:
+    chunks of atoms, or of a single atom and a window of the first trailing
+    axis (bands or energies), are read and summed straight into the output.
+
+    Parameters
+    ----------
+    read : callable
+        ``read(atoms, window)`` returns ``proj[:, atoms, :, window]`` for
+        slices of the atom axis and of the first trailing axis.
+    shape : tuple of int
+        Shape of the whole tensor, ``(spin, atom, orbital, ...)``.
+    axes : dict
+        Labels of the projection axes, see :func:`projection_axes`.
+    rule : tuple of (str or None, str or None) or dict
+        Atom and orbital grouping, see :func:`group_matrix`, or channel
+        groups, see :func:`compile_groups`.
+    budget : int, optional
+        Memory budget in bytes for the output and the chunks in flight,
+        defaults to :func:`memory_budget`; None reads a single chunk.
+
+    Returns
+    -------
+    tuple of (list of tuple of (str, str), numpy.ndarray)
+        Channel labels and aggregated array, see :func:`aggregate`.
+    """
+    budget = memory_budget() if budget is None else budget
+    nspin, natom, norb, nwindow, *rest = shape
+    if isinstance(rule, dict):
+        labels, columns, matrix = compile_groups(rule, axes)
+        out = np.zeros((nspin, len(labels), 1, nwindow, *rest))
+    else:
+        atom_labels, amat = group_matrix(_atom_keys(axes, rule[0]), rule[0])
+        orb_labels, omat = group_matrix(axes["orbitals"], rule[1])
+        labels = [(a, o) for a in atom_labels for o in orb_labels]
+        out = np.zeros((nspin, len(atom_labels), len(orb_labels), nwindow, *rest))
+
+    # bytes of one atom and one step of the window axis
+    unit = nspin * norb * int(np.prod(rest)) * np.dtype(float).itemsize
+    if budget is None:
+        atoms, window = natom, nwindow
+    else:
+        units = (budget - out.nbytes) // (_CHUNK_COPIES * max(unit, 1))
+        if units < 1:
+            logger.warning(f"memory budget of {budget} bytes is too small, reading minimal chunks")
+        atoms = int(min(natom, max(1, units // nwindow)))
+        window = int(min(nwindow, max(1, units)))
+
+    for a0 in range(0, natom, atoms):
+        aslice = slice(a0, min(a0 + atoms, natom))
+        if isinstance(rule, dict):
+            # the compressed columns of these atoms, relative to the chunk
+            span = np.searchsorted(columns, [aslice.start * norb, aslice.stop * norb])
+            local = columns[span[0] : span[1]] - aslice.start * norb
+            weights = matrix[..., span[0] : span[1]]
+            if not len(local):
+                continue
+        else:
+            # only the groups of these atoms receive something
+            rows = np.flatnonzero(amat[:, aslice].any(axis=1))
+        for w0 in range(0, nwindow, window):
+            wslice = slice(w0, min(w0 + window, nwindow))
+            chunk = read(aslice, wslice)
+            with stage("aggregate"):
+                if isinstance(rule, dict):
+                    flat = chunk.reshape(nspin, -1, chunk[0, 0, 0].size)[:, local]
+                    out[:, :, 0, wslice] += (weights @ flat).reshape(out[:, :, 0, wslice].shape)
+                else:
+                    out[:, rows, :, wslice] += np.einsum(
+                        "ga,ho,sao...->sgh...", amat[rows, aslice], omat, chunk, optimize=True
+                    )
+            del chunk
+    return labels, out.reshape(nspin, len(labels), nwindow, *rest)
+
+
+@logger.catch
+def set_memory_budget(budget: int | None) -> None:
+    """Set the memory budget of out-of-core projection reads.
+
+    Parameters
+    ----------
+    budget : int or None
+        Bytes that :func:`~ddpc.io.band.read_band` may spend on projections
+        and their aggregated channels; larger projection tensors are streamed
+        in chunks. None, the default, falls back to ``$DDPC_MEMORY_BUDGET``
+        and reads the whole tensor at once when that is not set either.
+    """
+    MEMORY_CONFIG["budget"] = budget
+
+
+@logger.catch
+def memory_budget() -> int | None:
+    """Return the memory budget of out-of-core projection reads.
+
+    Returns
+    -------
+    int or None
+        Budget in bytes set with :func:`set_memory_budget`, else the one of
+        ``$DDPC_MEMORY_BUDGET``; None when neither is set. A malformed
+        environment value is logged and ignored.
+    """
+    if MEMORY_CONFIG["budget"] is not None:
+        return MEMORY_CONFIG["budget"]
+    value = os.environ.get("DDPC_MEMORY_BUDGET", "")
+    try:
+        return int(value or 0) or None
+    except ValueError:
+        logger.warning(f"ignoring $DDPC_MEMORY_BUDGET={value!r}, expected a number of bytes")
+        return None
+
+
+@logger.catch
+def channel_members(
+    axes: dict, rule: tuple[str | None, str | None] | dict
+) -> list[tuple[tuple[str, str], list[int], list[int]]]:
+    """List the atoms and orbitals summed into every channel of :func:`aggregate`.
+
+    Parameters
+    ----------
+    axes : dict
+        Labels of the projection axes, see :func:`projection_axes`.
+    rule : tuple of (str or None, str or None) or dict
+        Atom and orbital grouping, see :func:`group_matrix`, or channel
+        groups, see :func:`compile_groups`.
+
+    Returns
+    -------
+    list of tuple of (tuple of (str, str), list of int, list of int)
+        Label of every channel, in the order of :func:`aggregate`, with the
+        positions along the atom and orbital axes that contribute to it.
+    """
+    if isinstance(rule, dict):
+        labels, columns, matrix = compile_groups(rule, axes)
+        norb = len(axes["orbitals"])
+        members = [columns[matrix[:, ci].any(axis=0)] for ci in range(len(labels))]
+        return [
+            (label, np.unique(m // norb).tolist(), np.unique(m % norb).tolist())
+            for label, m in zip(labels, members, strict=True)
+        ]
+    atom_labels, amat = group_matrix(_atom_keys(axes, rule[0]), rule[0])
+    orb_labels, omat = group_matrix(axes["orbitals"], rule[1])
+    return [
+        ((a, o), np.flatnonzero(amat[i]).tolist(), np.flatnonzero(omat[j]).tolist())
+        for i, a in enumerate(atom_labels)
+        for j, o in enumerate(orb_labels)
+    ]
+
+
+@logger.catch
+def parse_group(group: str | dict | list) -> list[dict]:
+    """Normalise a channel group into selectors whose union forms the channel.
+
+    Parameters
+    ----------
+    group : str, dict or list
+        A dict of any of ``"atoms"`` (1-based ids, ranges like ``"1-48"``
+        allowed), ``"elements"``, ``"orbitals"`` (shell names such as
+        ``"d"``, full names such as ``"dxy"``, or ``"t2g"``/``"eg"``) and
+        ``"spins"`` (``"up"``/``"down"``); missing keys match everything.
+        A string lists the same terms separated by spaces, commas or ``+``,
+        each term being recognised by its form, e.g. ``"Fe d"``,
+        ``"1-48 px+py"`` or ``"O p up"``. A list is the union of its groups.
+
+    Returns
+    -------
+    list of dict
+        Selectors with list values, ``"atoms"`` as sorted ints.
+
+    Raises
+    ------
+    ValueError
+        If a key or a term is not recognised.
+
+    Examples
+    --------
+    >>> parse_group("1-3 Fe px+py")
+    [{'atoms': [1, 2, 3], 'elements': ['Fe'], 'orbitals': ['px', 'py']}]
+    """
+    if isinstance(group, list):
+        return [selector for item in group for selector in parse_group(item)]
+    if isinstance(group, dict):
+        unknown = set(group) - set(GROUP_KEYS)
+        if unknown:
+            raise ValueError(f"unknown channel group keys {sorted(unknown)}, use {GROUP_KEYS}")
+        terms = {
+            key: _GROUP_SEPARATORS.split(value.strip()) if isinstance(value, str) else value
+            for key, value in group.items()
+            if value is not None
+        }
+    else:
+        terms = {}
+        for term in filter(None, _GROUP_SEPARATORS.split(group)):
+            terms.setdefault(_term_key(term), []).append(term)
+    selector: dict[str, list[str] | list[int]] = {
+        key: [str(value) for value in values] for key, values in terms.items() if key != "atoms"
+    }
+    if "atoms" in terms:
+        selector["atoms"] = _atom_ids([str(value) for value in terms["atoms"]])
+    return [selector]
+
+
+@logger.catch
+def compile_groups(
+    groups: dict, axes: dict
+) -> tuple[list[tuple[str, str]], np.ndarray, np.ndarray]:
+    """Compile named channel groups into a grouping matrix over the projections.
+
+    Every channel sums the projections of the atoms, orbitals and spins its
+    group selects, so one matrix product aggregates any number of channels.
+    Only the (atom, orbital) columns that some channel uses are kept, which
+    keeps the matrix small for channels of a few atoms in a large cell.
+
+    Parameters
+    ----------
+    groups : dict
+        Channel name to group, see :func:`parse_group`. Atoms are matched by
+        their ids in the file, so channels of atoms that were not read are
+        zero; ``"spins"`` is ignored for spinless and non-collinear data.
+    axes : dict
+        Labels of the projection axes, see :func:`projection_axes`.
+
+    Returns
+    -------
+    tuple of (list of tuple of (str, str), numpy.ndarray, numpy.ndarray)
+        ``(name, "")`` label of every channel, the sorted flat
+        ``atom * norb + orbital`` columns used, and the ``(spin, channel,
+        column)`` matrix of 0/1 weights.
+
+    Examples
+    --------
+    >>> groups = {"surface-Fe-d": "1-8 Fe d", "O-p": {"elements": ["O"], "orbitals": ["p"]}}
+    >>> labels, columns, matrix = compile_groups(groups, band.axes)
+    """
+    atoms = np.asarray(axes["atoms"])
+    elements = np.asarray(axes["elements"], dtype=object)
+    orbitals = axes["orbitals"]
+    polarized = all(axes["spins"])
+    spin, channel, column = [], [], []
+    for ci, group in enumerate(groups.values()):
+        for selector in parse_group(group):
+            amask = np.ones(len(atoms), dtype=bool)
+            if "atoms" in selector:
+                amask &= np.isin(atoms, selector["atoms"])
+            if "elements" in selector:
+                amask &= np.isin(elements, selector["elements"])
+            omask = np.ones(len(orbitals), dtype=bool)
+            if "orbitals" in selector:
+                wanted = set(selector["orbitals"])
+                omask = np.array([_orbital_matches(o, wanted) for o in orbitals], dtype=bool)
+            sidx = list(range(len(axes["spins"])))
+            if polarized and "spins" in selector:
+                sidx = [si for si, s in enumerate(axes["spins"]) if s in selector["spins"]]
+            cols = np.flatnonzero(np.outer(amask, omask))
+            for si in sidx:
+                spin.append(np.full(len(cols), si))
+                channel.append(np.full(len(cols), ci))
+                column.append(cols)
+
+    used, index = np.unique(np.concatenate([[], *column]).astype(int), return_inverse=True)
+    matrix = np.zeros((len(axes["spins"]), len(groups), len(used)))
+    if len(used):
+        matrix[np.concatenate(spin), np.concatenate(channel), index] = 1.0
+    return [(str(name), "") for name in groups], used, matrix
+
+
+@logger.catch
+def merge_matrix(keys: list, how: str = "sum") -> tuple[list, np.ndarray]:
+    """Build the matrix summing or averaging the entries with the same key.
+
+    Parameters
+    ----------
+    keys : list
+        Hashable key of every entry of the merged axis.
+    how : {"sum", "average"}, default "sum"
+        Whether merged entries are summed or averaged.
+
+    Returns
+    -------
+    tuple of (list, numpy.ndarray)
+        Distinct keys in first-seen order and the ``(nkey, len(keys))``
+        merging matrix.
+
+    Raises
+    ------
+    ValueError
+        If ``how`` is not one of :data:`MERGES`.
+    """
+    if how not in MERGES:
+        raise ValueError(f"{how=} must be one of {MERGES}")
+    unique = list(dict.fromkeys(keys))
+    index = {k: i for i, k in enumerate(unique)}
+    matrix = np.zeros((len(unique), len(keys)))
+    matrix[[index[k] for k in keys], np.arange(len(keys))] = 1.0
+    if how == "average":
+        matrix /= matrix.sum(axis=1, keepdims=True)
+    return unique, matrix
+
+
+@logger.catch
+def merge_atoms(
+    proj: np.ndarray | None, axes: dict, equivalent: np.ndarray, how: str = "sum"
+) -> tuple[np.ndarray | None, dict]:
+    """Merge the atom axis of a projection tensor into orbits of equivalent atoms.
+
+    Parameters
+    ----------
+    proj : numpy.ndarray or None
+        Projection tensor of shape ``(spin, atom, orbital, ...)``; None
+        merges the axes only.
+    axes : dict
+        Labels of the projection axes, see :func:`projection_axes`.
+    equivalent : numpy.ndarray
+        0-based representative atom of every atom of the file, see
+        :func:`ddpc.io.symmetry.equivalent_atoms`.
+    how : {"sum", "average"}, default "sum"
+        Whether the atoms of an orbit are summed or averaged.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray or None, dict)
+        Tensor of shape ``(spin, orbit, orbital, ...)`` and its axes; every
+        orbit is labelled by the 1-based id of its representative atom.
+    """
+    orbits, matrix = merge_matrix([int(equivalent[a - 1]) + 1 for a in axes["atoms"]], how)
+    merged = {
+        "spins": axes["spins"],
+        "atoms": orbits,
+        "elements": [axes["elements"][np.flatnonzero(row)[0]] for row in matrix],
+        "orbitals": axes["orbitals"],
+    }
+    if proj is None:
+        return None, merged
+    with stage("aggregate"):
+        out = np.einsum("ga,sao...->sgo...", matrix, proj, optimize=True)
+    return out, merged
+
+
+@logger.catch
+def merge_channels(
+    labels: list[tuple[str, str]], weights: np.ndarray, equivalent: np.ndarray, how: str = "sum"
+) -> tuple[list[tuple[str, str]], np.ndarray]:
+    """Merge the per-atom channels of :func:`aggregate` into orbits of equivalent atoms.
+
+    Parameters
+    ----------
+    labels : list of tuple of (str, str)
+        ``(atom id, orbital group)`` label of every channel of an atom mode.
+    weights : numpy.ndarray
+        Channels of shape ``(spin, channel, ...)``.
+    equivalent : numpy.ndarray
+        0-based representative atom of every atom of the file, see
+        :func:`ddpc.io.symmetry.equivalent_atoms`.
+    how : {"sum", "average"}, default "sum"
+        Whether the channels of an orbit are summed or averaged.
+
+    Returns
+    -------
+    tuple of (list of tuple of (str, str), numpy.ndarray)
+        Channel labels, the atom part being the representative atom id, and
+        the merged channels of shape ``(spin, channel, ...)``.
+    """
+    keys = [(str(int(equivalent[int(a) - 1]) + 1), o) for a, o in labels]
+    merged, matrix = merge_matrix(keys, how)
+    with stage("aggregate"):
+        out = np.einsum("gc,sc...->sg...", matrix, weights, optimize=True)
+    return merged, out
+
+
+def _atom_keys(axes: dict, kind: str | None) -> list[str]:
+    """Keys of the atom axis for an atom grouping: atom ids or element symbols."""
+    return [str(a) for a in axes["atoms"]] if kind == "atom" else axes["elements"]
+
+
+def _term_key(term: str) -> str:
+    """Tell which selector a term of a channel group string belongs to."""
+    if _ATOM_RANGE.fullmatch(term):
+        return "atoms"
+    if term in ("up", "down"):
+        return "spins"
+    if term in chemical_symbols[1:]:
+        return "elements"
+    if term in _ORBITAL_TERMS:
+        return "orbitals"
+    raise ValueError(f"cannot tell the selector of channel group term {term!r}")
+
+
+def _atom_ids(values: list[str]) -> list[int]:
+    """Expand atom ids and inclusive ``first-last`` ranges into sorted ids."""
+    ids: set[int] = set()
+    for value in values:
+        match = _ATOM_RANGE.fullmatch(value)
+        if match is None:
+            raise ValueError(f"{value!r} is neither an atom id nor a range of ids")
+        first = int(match[1])
+        ids.update(range(first, int(match[2] or first) + 1))
+    return sorted(ids)
+
+
+def _orbital_matches(orbital: str, wanted: set[str]) -> bool:
+    """Whether an orbital is one of the orbitals, shells or t2g/eg sets wanted."""
+    return orbital in wanted or orbital[0] in wanted or T2GEG.get(orbital) in wanted
@@ -0,0 +1,273 @@
+"""Lazy Polars scans of band and DOS files with pushdown into the readers.
+
+:func:`scan_band` and :func:`scan_dos` register the readers of
+:mod:`ddpc.io.band` and :mod:`ddpc.io.dos` as Polars IO sources producing the
+long layout. When the query is collected, the selected columns and the filter
+are turned into selectors, so the readers skip whatever the query discards:
+
+- filter terms on ``kpoint``, ``band``, ``spin`` and ``energy`` (bands) or
+  ``energy`` and ``spin`` (DOS) are first evaluated on the band energies or
+  the energy grid, and only the matching band, k-point and energy window is
+  read from the file;
+- filter terms on ``channel`` restrict the atoms and orbitals to those summed
+  into the matching channels;
+- without the ``weight`` or ``dos`` column no projection is read at all.
+
+Terms are taken from the top-level ``&`` of the filter. The whole filter is
+still applied to the rows that are read, so pushdown never changes a result.
+The file metadata is read when the scan is created.
+
+Polars hands the output of Python IO sources back with categorical instead of
+enum columns, so ``spin`` and ``channel`` are declared categorical here.
+"""
+
+import json
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+from loguru import logger
+from polars.io.plugins import register_io_source
+
+from ddpc.io.band import BandStructure, load_band
+from ddpc.io.dos import DensityOfStates, load_dos
+from ddpc.io.projection import BAND_MODES, DOS_MODES, channel_members, mode_rule
+from ddpc.io.utils import absf
+
+# how every kind of file is scanned
+_SCANS: dict[str, dict] = {
+    "band": {
+        "loader": load_band,
+        # a single band and k-point is enough to know the columns
+        "probe": {"bands": (1, 1), "kpoints": (1, 1), "energies": None},
+        "index": ("kpoint", "band", "spin", "energy"),
+        "order": ["spin", "channel", "band", "kpoint"],
+        "value": "weight",
+        "modes": BAND_MODES,
+        "join": lambda label: "-".join(filter(None, label)),
+    },
+    "dos": {
+        "loader": load_dos,
+        # an empty energy window
+        "probe": {"energies": (np.inf, np.inf), "grid": None},
+        "index": ("energy", "spin"),
+        "order": ["spin", "channel", "energy"],
+        "value": "dos",
+        "modes": DOS_MODES,
+        "join": "".join,
+    },
+}
+
+
+@logger.catch
+def scan_band(p: str | Path, mode: int | dict = 5, select: dict | None = None) -> pl.LazyFrame:
+    """Lazily read a band structure file in the long layout.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the band structure data file, HDF5 (.h5) or JSON (.json).
+    mode : int or dict, default 5
+        Projection mode, see :func:`ddpc.io.band.read_band`.
+    select : dict, optional
+        Selectors applied to every query, see :func:`ddpc.io.band.read_band`.
+
+    Returns
+    -------
+    polars.LazyFrame
+        Same rows as ``read_band(p, mode, fmt=None, select=select,
+        layout="long")``, with categorical ``spin`` and ``channel`` columns.
+        Column selections and filters are pushed down into the reader, see
+        :mod:`ddpc.io.scan`.
+
+    Examples
+    --------
+    >>> lf = scan_band("band.h5", mode=1)
+    >>> lf.filter(pl.col("energy").is_between(-1, 1), pl.col("channel") == "Fe").collect()
+    """
+    return _scan("band", str(absf(p)), mode, dict(select or {}))
+
+
+@logger.catch
+def scan_dos(p: str | Path, mode: int | dict = 5, select: dict | None = None) -> pl.LazyFrame:
+    """Lazily read a density of states file in the long layout.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to the DOS data file, HDF5 (.h5) or JSON (.json).
+    mode : int or dict, default 5
+        Projection mode, see :func:`ddpc.io.dos.read_dos`.
+    select : dict, optional
+        Selectors applied to every query, see :func:`ddpc.io.dos.read_dos`.
+
+    Returns
+    -------
+    polars.LazyFrame
+        Same rows as ``read_dos(p, mode, fmt=None, select=select,
+        layout="long")``, with categorical ``spin`` and ``channel`` columns.
+        Column selections and filters are pushed down into the reader, see
+        :mod:`ddpc.io.scan`.
+
+    Examples
+    --------
+    >>> lf = scan_dos("dos.h5", mode=3)
+    >>> lf.filter(pl.col("energy") < 0).group_by("channel").agg(pl.col("dos").sum()).collect()
+    """
+    return _scan("dos", str(absf(p)), mode, dict(select or {}))
+
+
+@logger.catch
+def _scan(kind: str, path: str, mode: int | dict, select: dict) -> pl.LazyFrame:
+    """Register the IO source of one file, see :func:`scan_band`."""
+    spec = {**_SCANS[kind], "path": path, "mode": mode}
+    probe = _load(spec["loader"], path, {**select, **spec["probe"]}, mode != 0)
+    schema = probe.to_polars(mode, "long").schema
+    spec["channel"] = schema.get("channel")
+    target = _categorical(pl.DataFrame(schema=schema)).schema
+
+    def source(
+        with_columns: list[str] | None,
+        predicate: pl.Expr | None,
+        n_rows: int | None,
+        batch_size: int | None,
+    ) -> Iterator[pl.DataFrame]:
+        needed = set(with_columns or target) | set(_roots(predicate))
+        window = _pushdown(spec, select, predicate, probe)
+        if window is None:
+            df = pl.DataFrame(schema=target)
+        else:
+            values = spec["value"] in needed
+            projections = window.pop("projections") and mode != 0 and values
+            data = _load(spec["loader"], path, window, projections)
+            df = data.to_polars(mode if projections else 0, "long")
+            if "channel" in target and not values:
+                df = _expand_channels(df, spec["channel"], spec)
+            df = _categorical(df).select(name for name in target if name in df.columns)
+
+        if predicate is not None:
+            df = df.filter(predicate)
+        if with_columns is not None:
+            df = df.select(with_columns)
+        if n_rows is not None:
+            df = df.head(n_rows)
+        if batch_size is None or df.height <= batch_size:
+            yield df
+        else:
+            yield from df.iter_slices(batch_size)
+
+    return register_io_source(source, schema=target)
+
+
+def _load(
+    loader: Callable, path: str, select: dict, projections: bool
+) -> BandStructure | DensityOfStates:
+    """Call a loader, raising when its error was caught and logged."""
+    data = loader(path, select, projections)
+    if data is None:
+        raise ValueError(f"cannot read {path} with {select=}")
+    return data
+
+
+def _pushdown(
+    spec: dict, select: dict, predicate: pl.Expr | None, probe: BandStructure | DensityOfStates
+) -> dict | None:
+    """Turn the filter terms that can be checked cheaply into selectors.
+
+    Returns
+    -------
+    dict or None
+        Selectors to read with, plus ``"projections"`` telling whether any
+        projected channel is kept; None when no row can match.
+    """
+    window = {**select, "projections": True}
+    index, channel = _split_predicate(predicate, spec["index"])
+
+    if index is not None:
+        total = _load(spec["loader"], spec["path"], select, False)
+        kept = _categorical(total.to_polars(0, "long").select(spec["index"])).filter(index)
+        if kept.is_empty():
+            return None
+        if total.spin_type == "collinear":
+            window["spins"] = kept["spin"].cast(pl.String).unique(maintain_order=True).to_list()
+        if "bands" in spec["probe"]:
+            # the band window already excludes the bands outside an energy window
+            window.pop("energies", None)
+            window["bands"] = (kept["band"].min(), kept["band"].max())
+            window["kpoints"] = (kept["kpoint"].min(), kept["kpoint"].max())
+        elif window.get("grid") is not None:
+            # the kept energies are points of the grid, read the ones in their range
+            shift = total.efermi if window.get("relative_to_fermi") else 0.0
+            grid = np.asarray(window["grid"], dtype=float)
+            energy = kept["energy"].to_numpy()
+            low, high = energy.min(), energy.max()
+            window["grid"] = grid[(grid + shift >= low) & (grid + shift <= high)]
+        else:
+            window["energies"] = (kept["energy"].min(), kept["energy"].max())
+            window["relative_to_fermi"] = False
+
+    rule = None if spec["mode"] == 0 else mode_rule(spec["mode"], spec["modes"])
+    if channel is not None and rule is not None and spec["channel"] is not None:
+        members = {
+            spec["join"](label): (ais, ois) for label, ais, ois in channel_members(probe.axes, rule)
+        }
+        channels = spec["channel"].categories.alias("channel").cast(pl.Categorical)
+        kept = channels.to_frame().filter(channel)["channel"].cast(pl.String).to_list()
+        if not kept:
+            return None
+        ais = sorted({ai for name in kept if name in members for ai in members[name][0]})
+        ois = sorted({oi for name in kept if name in members for oi in members[name][1]})
+        if not ais:
+            # only the total DOS is kept
+            window["projections"] = False
+        else:
+            window["atoms"] = [probe.atoms[ai] for ai in ais]
+            window["orbitals"] = [probe.orbitals[oi] for oi in ois]
+    return window
+
+
+def _split_predicate(
+    predicate: pl.Expr | None, index: tuple[str, ...]
+) -> tuple[pl.Expr | None, pl.Expr | None]:
+    """Collect the filter terms on index columns and those on ``channel``."""
+    on_index, on_channel = [], []
+    for term in _conjuncts(predicate) if predicate is not None else []:
+        roots = set(term.meta.root_names())
+        if roots and roots <= set(index):
+            on_index.append(term)
+        elif roots == {"channel"}:
+            on_channel.append(term)
+    return (
+        pl.all_horizontal(on_index) if on_index else None,
+        pl.all_horizontal(on_channel) if on_channel else None,
+    )
+
+
+def _conjuncts(predicate: pl.Expr) -> list[pl.Expr]:
+    """Split a filter into the terms joined by its top-level ``&``."""
+    try:
+        node = json.loads(predicate.meta.serialize(format="json"))
+    except Exception:  # the JSON form of expressions is not stable across versions
+        return [predicate]
+    if node.get("BinaryExpr", {}).get("op") in ("And", "LogicalAnd"):
+        right, left = predicate.meta.pop()
+        return _conjuncts(left) + _conjuncts(right)
+    return [predicate]
+
+
+def _roots(predicate: pl.Expr | None) -> list[str]:
+    """Columns read by a filter."""
+    return [] if predicate is None else predicate.meta.root_names()
+
+
+def _expand_channels(total: pl.DataFrame, channel: pl.Enum, spec: dict) -> pl.DataFrame:
+    """Repeat the index rows for every channel when no projection value is needed."""
+    channels = pl.Series("channel", channel.categories).cast(channel).to_frame()
+    index = total.select(spec["index"])
+    return index.join(channels, how="cross").sort(spec["order"], maintain_order=True)
+
+
+def _categorical(df: pl.DataFrame) -> pl.DataFrame:
+    """Turn enum columns into categoricals, the dtype Polars gives IO source output."""
+    return df.with_columns(pl.col(pl.Enum).cast(pl.Categorical))
@@ -6,6 +6,7 @@ from ase.atoms import Atoms
 from ase.io import read, write
 from loguru import logger
 
+from ddpc.io.instrument import add_bytes, file_bytes, stage
 from ddpc.io.read import dspaw_as as rda
 from ddpc.io.read import rescu_xyz as rrx
 from ddpc.io.write import dspaw_as as wda
@@ -44,11 +45,12 @@ def read_structure(p: str | Path):
     - Other formats: ASE's built-in readers
     """
     fn = str(p)
-    if fn.endswith(".as"):
-        return rda.read(fn)
-    if fn.endswith(".xyz"):
-        return rrx.read(fn)
-    return read(fn)
+    with stage("read_structure", file_bytes(fn)):
+        if fn.endswith(".as"):
+            return rda.read(fn)
+        if fn.endswith(".xyz"):
+            return rrx.read(fn)
+        return read(fn)
 
 
 @logger.catch
@@ -145,14 +147,18 @@ def write_structure(
     >>> content = write_structure("trajectory.xyz", atoms_list)
     """
     fn = str(p)
-    if file_format == "as" or fn.endswith(".as"):
-        if isinstance(atoms, Atoms):
-            return wda.write(fn, atoms)
-        raise ValueError("as format only support single Atoms object")
-    if file_format == "xyz" or fn.endswith(".xyz"):
-        if isinstance(atoms, Atoms):
-            return wrx.write(fn, atoms)
-        raise ValueError("xyz format only support single Atoms object")
-    write(fn, atoms, format=file_format, **kwargs)  # type: ignore
-    with open(fn, "r", encoding="utf-8") as f:
-        return f.read()
+    with stage("write_structure"):
+        if file_format == "as" or fn.endswith(".as"):
+            if not isinstance(atoms, Atoms):
+                raise ValueError("as format only support single Atoms object")
+            content = wda.write(fn, atoms)
+        elif file_format == "xyz" or fn.endswith(".xyz"):
+            if not isinstance(atoms, Atoms):
+                raise ValueError("xyz format only support single Atoms object")
+            content = wrx.write(fn, atoms)
+        else:
+            write(fn, atoms, format=file_format, **kwargs)  # type: ignore
+            with open(fn, "r", encoding="utf-8") as f:
+                content = f.read()
+        add_bytes(file_bytes(fn))
+    return content
@@ -0,0 +1,161 @@
+"""Symmetry-equivalent atoms of the structure stored in DS-PAW output files."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+import h5py
+import numpy as np
+from ase.data import atomic_numbers
+from loguru import logger
+from spglib import get_symmetry_dataset
+
+from ddpc.io.jsonio import load_json_skeleton
+from ddpc.io.utils import absf, get_h5_str
+
+if TYPE_CHECKING:
+    # band.py and dos.py import this module
+    from ddpc.io.band import BandStructure
+    from ddpc.io.dos import DensityOfStates
+
+# loaded data that merge_equivalent returns with the same type
+_Data = TypeVar("_Data", "BandStructure", "DensityOfStates")
+
+# default symmetry precision of spglib in Angstrom
+SYMPREC = 1e-3
+# decimals of the magnetic moments that make atoms of one element distinct
+_MAG_DECIMALS = 2
+
+
+@logger.catch
+def load_cell(
+    p: str | Path, atom_info: dict | None = None
+) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray | None]:
+    """Read the structure of the ``AtomInfo`` section of a DS-PAW output file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to a band structure or DOS file, HDF5 (.h5) or JSON (.json).
+    atom_info : dict, optional
+        ``AtomInfo`` section of a JSON file that was already parsed; the file
+        is then not read again.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray, list of str, numpy.ndarray or None)
+        Lattice vectors as rows in Angstrom, fractional positions of shape
+        ``(atom, 3)``, element symbols, and the initial magnetic moments of
+        shape ``(atom, component)`` when the file has them.
+
+    Raises
+    ------
+    TypeError
+        If the input file is neither HDF5 nor JSON format.
+    """
+    absfile = str(absf(p))
+    if atom_info is None and absfile.endswith(".h5"):
+        with h5py.File(absfile, "r") as f:
+            elements = get_h5_str(f, "/AtomInfo/Elements")
+            lattice = np.asarray(f["/AtomInfo/Lattice"], dtype=float).reshape(3, 3)
+            positions = np.asarray(f["/AtomInfo/Position"], dtype=float).reshape(-1, 3)
+            kind = "".join(get_h5_str(f, "/AtomInfo/CoordinateType"))
+            mag = np.asarray(f["/AtomInfo/Mag"], dtype=float) if "Mag" in f["AtomInfo"] else None
+    elif atom_info is not None or absfile.endswith(".json"):
+        if atom_info is None:
+            atom_info = load_json_skeleton(absfile)[0]["AtomInfo"]
+        atoms = atom_info["Atoms"]
+        elements = [atom["Element"] for atom in atoms]
+        lattice = np.asarray(atom_info["Lattice"], dtype=float).reshape(3, 3)
+        positions = np.asarray([atom["Position"] for atom in atoms], dtype=float)
+        kind = atom_info["CoordinateType"]
+        mag = None
+        if all("Mag" in atom for atom in atoms):
+            mag = np.asarray([atom["Mag"] for atom in atoms], dtype=float)
+    else:
+        raise TypeError(f"{absfile} must be h5 or json file!")
+
+    if kind.lower().startswith("cart"):
+        positions = positions @ np.linalg.inv(lattice)
+    if mag is not None:
+        mag = mag.reshape(len(elements), -1)
+    return lattice, positions, elements, mag
+
+
+@logger.catch
+def equivalent_atoms(
+    p: str | Path, symprec: float = SYMPREC, atom_info: dict | None = None
+) -> np.ndarray:
+    """Find the symmetry-equivalent atoms of the structure of a DS-PAW output file.
+
+    Atoms are only equivalent when they have the same element and initial
+    magnetic moment, so antiferromagnetic sublattices stay apart.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Path to a band structure or DOS file, HDF5 (.h5) or JSON (.json).
+    symprec : float, default 1e-3
+        Symmetry precision of spglib in Angstrom.
+    atom_info : dict, optional
+        ``AtomInfo`` section of a JSON file that was already parsed, see
+        :func:`load_cell`.
+
+    Returns
+    -------
+    numpy.ndarray
+        0-based index of the representative atom of every atom's orbit, the
+        ``equivalent_atoms`` of :func:`spglib.get_symmetry_dataset`.
+
+    Raises
+    ------
+    ValueError
+        If spglib cannot find the symmetry of the structure.
+
+    Examples
+    --------
+    >>> equivalent_atoms("pband.h5")
+    array([0, 0, 2, 2])
+    """
+    lattice, positions, elements, mag = load_cell(p, atom_info)
+    types = np.array([atomic_numbers[e] for e in elements], dtype=float)[:, None]
+    if mag is not None:
+        types = np.column_stack([types, np.round(mag, _MAG_DECIMALS)])
+    numbers = np.unique(types, axis=0, return_inverse=True)[1].ravel()
+    cell = (lattice.tolist(), positions.tolist(), numbers.tolist())
+    dataset = get_symmetry_dataset(cell, symprec=symprec)
+    if dataset is None:
+        raise ValueError(f"spglib found no symmetry for the structure of {p}")
+    return np.asarray(dataset.equivalent_atoms)
+
+
+@logger.catch
+def merge_equivalent(
+    data: _Data, absfile: str, select: dict | None, atom_info: dict | None = None
+) -> _Data:
+    """Apply the ``"equivalent"`` selector to a loaded band structure or DOS.
+
+    Parameters
+    ----------
+    data : BandStructure or DensityOfStates
+        Loaded data.
+    absfile : str
+        Path of the file the data was loaded from.
+    select : dict, optional
+        Selectors, see :func:`ddpc.io.band.read_band`; ``"equivalent"`` is
+        ``"sum"`` or ``"average"`` and ``"symprec"`` the spglib precision.
+    atom_info : dict, optional
+        ``AtomInfo`` section the loader already parsed from a JSON file, see
+        :func:`load_cell`.
+
+    Returns
+    -------
+    BandStructure or DensityOfStates
+        ``data`` with the projections of every orbit of equivalent atoms
+        merged, or ``data`` itself without the selector.
+    """
+    select = select or {}
+    how = select.get("equivalent")
+    if not how:
+        return data
+    equivalent = equivalent_atoms(absfile, select.get("symprec", SYMPREC), atom_info)
+    return data.merge_atoms(equivalent, how)
@@ -2,13 +2,13 @@
 
 import os
 import re
-import sys
+import warnings
 from pathlib import Path
-from typing import cast
+from typing import cast, overload
 
 import numpy as np
 import polars as pl
-from h5py import File
+from h5py import Dataset, File, h5s
 from loguru import logger
 
 
@@ -123,190 +123,454 @@ def remove_comments(p: str | Path, comment: str = "#") -> list:
     return lines
 
 
+# fixed-point specs such as "8.3f", "+08.3f" are formatted with integer arithmetic
+_FIXED_FMT = re.compile(r"(\+?)(0?)(\d*)\.(\d+)f")
+
+
+@overload
+def format_float_columns(df: pl.DataFrame, fmt: str) -> pl.DataFrame: ...
+
+
+@overload
+def format_float_columns(df: pl.LazyFrame, fmt: str) -> pl.LazyFrame: ...
+
+
 @logger.catch
-def _format_float_columns_as_str_mapelements(df: pl.DataFrame, fmt: str) -> pl.DataFrame:
-    """Format numeric columns in DataFrame as strings for pretty printing.
+def format_float_columns(df: pl.DataFrame | pl.LazyFrame, fmt: str) -> pl.DataFrame | pl.LazyFrame:
+    """Format float columns of a DataFrame as fixed-width strings for rendering.
 
-    This internal function converts all numeric columns in a polars DataFrame
-    to formatted string representations using the specified format string.
-    It's primarily used for creating human-readable output of scientific data.
+    Readers return native float columns with ``fmt=None``; this function is
+    the render/export step that turns them into text. It works column-wise
+    on whole arrays instead of calling Python per cell, and also accepts a
+    LazyFrame so the formatting only runs when the frame is collected.
 
     Parameters
     ----------
-    df : polars.DataFrame
-        Input DataFrame containing numeric data to format.
+    df : polars.DataFrame or polars.LazyFrame
+        Input frame containing float data to format.
     fmt : str
-        Python format string for numeric values (e.g., '8.3f', '.2e').
+        Python format spec for float values (e.g., '8.3f', '.2e').
 
     Returns
     -------
-    polars.DataFrame
-        DataFrame with numeric columns converted to formatted strings.
-        Non-numeric columns remain unchanged.
+    polars.DataFrame or polars.LazyFrame
+        Frame with float columns converted to formatted strings, in the
+        original column order. Other columns remain unchanged.
 
     Notes
     -----
-    This is an internal utility function for data presentation. The function:
-
-    - Identifies all numeric columns automatically
-    - Applies the format string to non-null values
-    - Converts null values to empty strings
-    - Preserves non-numeric columns unchanged
-    - Handles formatting errors gracefully
+    Fixed-point specs (``"{width}.{precision}f"``) are rendered from scaled
+    integers in NumPy and Polars string expressions; values that are not
+    finite, very large or within rounding error of a tie are re-formatted
+    with Python so the output is identical to ``f"{x:{fmt}}"``. Any other
+    spec falls back to Python formatting of each column batch. Null values
+    become empty strings.
     """
-    if not isinstance(df, pl.DataFrame):
+    if not isinstance(df, pl.DataFrame | pl.LazyFrame):
         logger.warning("Input is not a polars DataFrame. Returning as is.")
         return df
     if not isinstance(fmt, str):
         logger.warning(f"Format '{fmt}' is not a string. Skipping formatting.")
         return df
 
-    # Get numeric columns
-    numeric_cols = [col for col in df.columns if df[col].dtype.is_numeric()]
-
-    if not numeric_cols:
-        logger.info("No float/numeric columns found to format.")
+    # integer indices of the long layout keep their dtype
+    float_cols = [name for name, dtype in df.collect_schema().items() if dtype.is_float()]
+    if not float_cols:
+        logger.info("No float columns found to format.")
         return df
 
     try:
-        # Create expressions for formatting numeric columns
-        format_exprs = []
-        for col in numeric_cols:
-            format_expr = (
-                pl.when(pl.col(col).is_null())
-                .then(pl.lit(""))
-                .otherwise(pl.col(col).map_elements(lambda x: f"{x:{fmt}}", return_dtype=pl.String))
-                .alias(col)
-            )
-            format_exprs.append(format_expr)
-
-        # Keep non-numeric columns as they are
-        non_numeric_cols = [col for col in df.columns if col not in numeric_cols]
-        keep_exprs = [pl.col(col) for col in non_numeric_cols]
-
-        return df.select(keep_exprs + format_exprs)
+        f"{0.0:{fmt}}"
     except ValueError as e:
         logger.error(f"Error applying format '{fmt}': {e}. Skipping formatting.")
         return df
-    except Exception as e:
-        logger.error(f"An unexpected error occurred: {e}. Skipping formatting.")
-        return df
+
+    if isinstance(df, pl.LazyFrame):
+        texts = [
+            pl.col(col).map_batches(lambda s: _format_floats(s, fmt), return_dtype=pl.String)
+            for col in float_cols
+        ]
+    else:
+        # format all float columns in one pass over a column-major block
+        flat = pl.Series(df.select(float_cols).to_numpy(order="fortran").ravel(order="F"))
+        text = _format_floats(flat, fmt)
+        texts = [pl.lit(text.slice(i * df.height, df.height)) for i in range(len(float_cols))]
+
+    return df.with_columns(
+        pl.when(pl.col(col).is_null()).then(pl.lit("")).otherwise(expr).alias(col)
+        for col, expr in zip(float_cols, texts, strict=True)
+    )
+
+
+def _format_floats(series: pl.Series, fmt: str) -> pl.Series:
+    """Format a float Series with a Python format spec, vectorised where possible."""
+    values = series.cast(pl.Float64).fill_null(0.0).to_numpy()
+    match = _FIXED_FMT.fullmatch(fmt)
+    if match is None:
+        return pl.Series(series.name, [f"{x:{fmt}}" for x in values], dtype=pl.String)
+
+    plus, zero, width, prec = match[1], match[2], int(match[3] or 0), int(match[4])
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = np.abs(values) * 10.0**prec
+        digits = np.rint(scaled)  # round half to even, as Python does for exact ties
+        # the product is inexact, so near ties are left to Python
+        slow = ~np.isfinite(scaled) | (scaled >= 1e9) | (np.abs(scaled % 1.0 - 0.5) < 1e-6)
+    digits[slow] = 0
+    digits = digits.astype(np.int64)
+
+    sign = pl.Series(np.signbit(values)).replace_strict({True: "-", False: plus})
+    integer = pl.Series(digits // 10**prec).cast(pl.String)
+    text = sign + integer
+    if prec:
+        text = text + "." + pl.Series(digits % 10**prec).cast(pl.String).str.zfill(prec)
+    # zero padding goes after the sign
+    text = (text.str.zfill(width) if zero else text.str.pad_start(width)).alias(series.name)
+
+    index = np.flatnonzero(slow)
+    if index.size:
+        text = text.scatter(index, [f"{values[i]:{fmt}}" for i in index])
+    return text
 
 
 @logger.catch
-def _split_atomindex_orbital(s: str) -> tuple[int, str]:
-    """Split a string into atom index and orbital designation.
+def _select_projections(
+    elements: list[str], orbitals: list[str], select: dict | None = None
+) -> tuple[list[int], list[int]]:
+    """Resolve atom/element/orbital selectors into dataset indices.
+
+    Parameters
+    ----------
+    elements : list of str
+        Element symbol of every atom in the file, in atom order.
+    orbitals : list of str
+        Orbital names stored in the file, in orbital order.
+    select : dict, optional
+        Selectors, keys not listed here are ignored:
+
+        - ``"atoms"``: 1-based atom indices to keep
+        - ``"elements"``: element symbols to keep
+        - ``"orbitals"``: orbitals to keep; a shell name (``"s"``, ``"p"``,
+          ``"d"``, ``"f"``) keeps the whole shell, a full name (``"dxy"``)
+          keeps one orbital
+
+        Missing keys or None keep everything.
+
+    Returns
+    -------
+    tuple of (list of int, list of int)
+        0-based atom indices and 0-based orbital indices to read.
+
+    Raises
+    ------
+    ValueError
+        If an atom index is out of range or the selection is empty.
+    """
+    select = select or {}
+    atoms = select.get("atoms")
+    species = select.get("elements")
+    orbs = select.get("orbitals")
+
+    natom = len(elements)
+    if atoms is None:
+        ais = list(range(natom))
+    else:
+        bad = [a for a in atoms if not 1 <= a <= natom]
+        if bad:
+            raise ValueError(f"atom index {bad} out of range 1..{natom}")
+        ais = sorted({a - 1 for a in atoms})
+    if species is not None:
+        ais = [ai for ai in ais if elements[ai] in species]
+
+    if orbs is None:
+        ois = list(range(len(orbitals)))
+    else:
+        ois = [oi for oi, o in enumerate(orbitals) if o in orbs or o[0] in orbs]
+
+    if not ais or not ois:
+        raise ValueError(f"no projection matches {select=}")
+    return ais, ois
 
-    This internal function parses strings that combine atom indices with
-    orbital labels (e.g., "12s", "5px", "3dxy") and separates them into
-    numeric atom index and orbital string components.
+
+@logger.catch
+def _select_spins(collinear: bool, select: dict | None = None) -> list[tuple[int, str]]:
+    """Resolve the spin selector into (spin dataset index, column suffix) pairs.
 
     Parameters
     ----------
-    s : str
-        Input string containing atom index followed by orbital designation.
-        Examples: "12s", "5px", "3dxy", "1", "25f".
+    collinear : bool
+        Whether the file holds two collinear spin channels.
+    select : dict, optional
+        Selectors, only ``"spins"`` (any of ``"up"`` and ``"down"``) is used.
+        Missing or None keeps every channel. Ignored for spinless and
+        non-collinear data.
 
     Returns
     -------
-    tuple of (int, str)
-        Two-element tuple containing:
+    list of tuple of (int, str)
+        1-based ``Spin*`` group index and the ``up``/``down`` suffix used in
+        column names (empty for non-spin-polarized data).
 
-        - int: Atom index (numeric part)
-        - str: Orbital designation (alphabetic part, empty if none)
+    Raises
+    ------
+    ValueError
+        If an unknown spin channel is requested.
+    """
+    spins = (select or {}).get("spins")
+    if not collinear:
+        if spins is not None:
+            logger.warning(f"{spins=} ignored for non-collinear data")
+        return [(1, "")]
+    if spins is None:
+        return [(1, "up"), (2, "down")]
+    bad = [s for s in spins if s not in ("up", "down")]
+    if bad:
+        raise ValueError(f"unknown spin channel {bad}, expect 'up' or 'down'")
+    return [(i, s) for i, s in ((1, "up"), (2, "down")) if s in spins]
 
-    Notes
-    -----
-    This is an internal utility function for parsing projected band structure
-    and density of states data where atomic orbitals are labeled with both
-    atom indices and orbital types.
 
-    The function assumes the string starts with digits (atom index) followed
-    by letters (orbital designation). If no letters are found, the orbital
-    part is returned as an empty string.
+@logger.catch
+def _select_axes(
+    axes: dict, spin_type: str, select: dict | None, projected: bool
+) -> tuple[list[int], list[int], list[int], dict]:
+    """Resolve selectors against the axes of already loaded arrays.
+
+    Parameters
+    ----------
+    axes : dict
+        ``spins``, ``atoms`` (1-based ids), ``elements`` and ``orbitals`` of
+        the loaded arrays, see :func:`ddpc.io.projection.projection_axes`.
+    spin_type : str
+        Spin treatment of the calculation.
+    select : dict, optional
+        Selectors, see :func:`_select_projections` and :func:`_select_spins`.
+        ``"atoms"`` refers to atom ids of the original structure.
+    projected : bool
+        Whether the arrays hold projections; otherwise only ``"spins"`` is used.
+
+    Returns
+    -------
+    tuple of (list of int, list of int, list of int, dict)
+        Positions to keep along the spin, atom and orbital axes and the axes
+        of the selection.
+
+    Raises
+    ------
+    ValueError
+        If a selector does not match the loaded axes.
     """
-    first_letter_index = -1
-    for i, char in enumerate(s):
-        if not char.isdigit():
-            first_letter_index = i
-            break
+    spins = [updown for _, updown in _select_spins(spin_type == "collinear", select)]
+    missing = [s for s in spins if s not in axes["spins"]]
+    if missing:
+        raise ValueError(f"spin channel {missing} was not loaded")
+    sidx = [axes["spins"].index(s) for s in spins]
+
+    if projected:
+        select = dict(select or {})
+        if select.get("atoms") is not None:
+            missing = [a for a in select["atoms"] if a not in axes["atoms"]]
+            if missing:
+                raise ValueError(f"atom {missing} was not loaded")
+            select["atoms"] = [axes["atoms"].index(a) + 1 for a in select["atoms"]]
+        ais, ois = _select_projections(axes["elements"], axes["orbitals"], select)
+    else:
+        ais, ois = list(range(len(axes["atoms"]))), []
 
-    if first_letter_index == -1:  # No letters found, assume the whole string is the atomIndex
-        return int(s), ""
-    atom_index_str = s[:first_letter_index]
-    orbital_str = s[first_letter_index:]
-    return int(atom_index_str), orbital_str
+    subset = {
+        "spins": spins,
+        "atoms": [axes["atoms"][i] for i in ais],
+        "elements": [axes["elements"][i] for i in ais],
+        "orbitals": [axes["orbitals"][i] for i in ois],
+    }
+    return sidx, ais, ois, subset
 
 
 @logger.catch
-def _get_ao_spin(k: str) -> tuple[str, str]:
-    """Parse atomic orbital and spin information from formatted key strings.
-
-    This internal function extracts atomic orbital and spin channel information
-    from hyphen-separated key strings used in band structure and density of
-    states data processing.
+def _select_window(select: dict | None, key: str, n: int, first: int = 1) -> slice:
+    """Resolve a ``(first, last)`` selector of 1-based indices into a slice.
 
     Parameters
     ----------
-    k : str
-        Input key string in format "orbital" or "orbital-spin".
-        Examples: "s", "px", "dxy", "s-up", "px-down".
+    select : dict, optional
+        Selectors, only ``key`` is used. Missing or None keeps everything.
+    key : str
+        Selector name, ``"bands"`` or ``"kpoints"``.
+    n : int
+        Length of the axis.
+    first : int, default 1
+        Index of the first entry of the axis, larger than 1 for axes that
+        were loaded through a window.
 
     Returns
     -------
-    tuple of (str, str)
-        Two-element tuple containing:
-
-        - str: Orbital designation (e.g., "s", "px", "dxy")
-        - str: Spin channel ("up", "down", or empty string for non-spin-polarized)
+    slice
+        0-based positions along the axis, with the bounds set.
 
     Raises
     ------
-    SystemExit
-        If the input string format is invalid (contains more than one hyphen).
+    ValueError
+        If the window is empty or reaches outside the axis.
+    """
+    window = (select or {}).get(key)
+    if window is None:
+        return slice(0, n)
+    start, last = window
+    if not first <= start <= last < first + n:
+        raise ValueError(f"{key} window {window} outside {first}..{first + n - 1}")
+    return slice(start - first, last - first + 1)
 
-    Notes
-    -----
-    This is an internal utility function for parsing projected electronic
-    structure data where orbital contributions may be separated by spin channels.
+
+@logger.catch
+def _energy_window(energies: np.ndarray, select: dict | None, efermi: float = 0.0) -> slice:
+    """Resolve the ``"energies"`` and ``"grid"`` selectors into a slice of an energy grid.
+
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        Ascending energy grid in eV.
+    select : dict, optional
+        Selectors, only ``"energies"``, ``(emin, emax)`` in eV, ``"grid"``
+        and ``"relative_to_fermi"`` are used. Missing or None keeps the
+        whole grid.
+    efermi : float, default 0.0
+        Fermi energy in eV, the origin of the energies when
+        ``"relative_to_fermi"`` is true.
+
+    Returns
+    -------
+    slice
+        Grid points inside the inclusive window, narrowed to the points
+        bracketing ``"grid"`` when it is given. The bounds are found by
+        binary search.
     """
-    ls = k.split("-")
-    if len(ls) == 1:  # nospin
-        return ls[0], ""
-    if len(ls) == 2:  # spin-polarized
-        return ls[0], ls[1]
-    logger.error(f"get_ao_spin error: {k=}")
-    sys.exit(1)
+    select = select or {}
+    shift = efermi if select.get("relative_to_fermi") else 0.0
+    window, grid = select.get("energies"), select.get("grid")
+    start, stop = 0, len(energies)
+    if window is not None:
+        start = int(np.searchsorted(energies, window[0] + shift, side="left"))
+        stop = max(start, int(np.searchsorted(energies, window[1] + shift, side="right")))
+    if grid is not None and len(grid) > 0:
+        # one more point on each side, to interpolate at the ends of the grid
+        first = int(np.searchsorted(energies, np.min(grid) + shift, side="right")) - 1
+        last = int(np.searchsorted(energies, np.max(grid) + shift, side="left")) + 1
+        start, stop = max(start, first), max(start, min(stop, last))
+    return slice(start, stop)
 
 
 @logger.catch
-def _inplace_update_data(_data: dict, key: str, v: np.ndarray | list) -> None:
-    """Update data dictionary by adding values to existing keys or creating new ones.
+def _energy_bands(energies: np.ndarray, select: dict | None, efermi: float) -> slice:
+    """Resolve the ``"energies"`` selector into the range of bands entering the window.
+
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        Band energies of shape ``(spin, band, kpoint)`` in eV.
+    select : dict, optional
+        Selectors, only ``"energies"``, ``(emin, emax)`` in eV, and
+        ``"relative_to_fermi"`` are used. Missing or None keeps every band.
+    efermi : float
+        Fermi energy in eV, the origin of the window when
+        ``"relative_to_fermi"`` is true.
+
+    Returns
+    -------
+    slice
+        Positions of the first to the last band whose energies reach into
+        the inclusive window at some spin and k-point. Bands are energy
+        ordered at every k-point, so no band outside the range does.
+
+    Raises
+    ------
+    ValueError
+        If no band enters the window.
+    """
+    select = select or {}
+    window = select.get("energies")
+    if window is None:
+        return slice(0, energies.shape[1])
+    shift = efermi if select.get("relative_to_fermi") else 0.0
+    emin, emax = window[0] + shift, window[1] + shift
+    lows, highs = energies.min(axis=(0, 2)), energies.max(axis=(0, 2))
+    inside = np.flatnonzero((highs >= emin) & (lows <= emax))
+    if inside.size == 0:
+        raise ValueError(f"no band enters the energy window {window}")
+    return slice(int(inside[0]), int(inside[-1]) + 1)
 
-    This internal function performs in-place updates of a data dictionary by
-    either adding values to existing array entries or creating new entries.
-    It's used for accumulating projected band structure and DOS data.
+
+@logger.catch
+def _window_segments(nfast: int, slow: slice, fast: slice) -> list[tuple[int, int]]:
+    """Flat C-order ranges covering a window of a ``(slow, fast)`` array.
 
     Parameters
     ----------
-    _data : dict
-        Dictionary to update in-place. Values should be numpy arrays or
-        array-like objects that support addition.
-    key : str
-        Dictionary key to update or create.
-    v : array-like
-        Values to add to existing data or set as new data.
+    nfast : int
+        Length of the fast axis.
+    slow, fast : slice
+        Window along both axes, with the bounds set.
 
-    Notes
-    -----
-    This is an internal utility function for data accumulation during
-    electronic structure data processing. The function:
+    Returns
+    -------
+    list of tuple of (int, int)
+        ``[start, stop)`` flat ranges in increasing order, a single range
+        when the window spans the whole fast axis.
+    """
+    if fast.start == 0 and fast.stop == nfast:
+        return [(slow.start * nfast, slow.stop * nfast)]
+    return [(k * nfast + fast.start, k * nfast + fast.stop) for k in range(slow.start, slow.stop)]
+
+
+@logger.catch
+def _read_h5_segments(dataset: Dataset, segments: list[tuple[int, int]], out: np.ndarray) -> None:
+    """Read flat C-order ranges of a 1-d or 2-d dataset into a contiguous buffer.
 
-    - Adds values to existing keys using numpy array addition
-    - Creates new keys with numpy array values
-    - Modifies the input dictionary in-place
+    All ranges are combined into one hyperslab selection, so HDF5 only reads
+    the selected elements in a single call.
+
+    Parameters
+    ----------
+    dataset : h5py.Dataset
+        Source dataset; its elements are addressed in flat C order.
+    segments : list of tuple of (int, int)
+        Increasing ``[start, stop)`` flat ranges, see :func:`_window_segments`.
+    out : numpy.ndarray
+        C-contiguous float64 buffer with as many elements as the ranges.
     """
-    if key in _data:
-        _data[key] += np.asarray(v)
-    else:
-        _data[key] = np.asarray(v)
+    if out.size == dataset.size:
+        dataset.read_direct(out.reshape(dataset.shape))
+        return
+    if out.size == 0:
+        return
+
+    space = dataset.id.get_space()
+    space.select_none()
+    ncol = dataset.shape[-1]
+    for start, stop in segments:
+        row, col = divmod(start, ncol)
+        end_row, end_col = divmod(stop, ncol)
+        blocks = []
+        if row == end_row:
+            blocks.append((row, col, 1, end_col - col))
+        else:
+            if col:
+                blocks.append((row, col, 1, ncol - col))
+                row += 1
+            if end_row > row:
+                blocks.append((row, 0, end_row - row, ncol))
+            if end_col:
+                blocks.append((end_row, 0, 1, end_col))
+        for brow, bcol, nrow, nc in blocks:
+            if dataset.ndim == 1:
+                space.select_hyperslab((bcol,), (nc,), op=h5s.SELECT_OR)
+            else:
+                space.select_hyperslab((brow, bcol), (nrow, nc), op=h5s.SELECT_OR)
+    dataset.id.read(h5s.create_simple((out.size,)), space, out.reshape(-1))
+
+
+def _deprecated(name: str, replacement: str) -> None:
+    """Warn that a public function is deprecated in favour of another."""
+    # level 4 is the caller of the deprecated function, past its logger.catch wrapper
+    warnings.warn(
+        f"{name} is deprecated and will be removed, use {replacement} instead",
+        DeprecationWarning,
+        stacklevel=4,
+    )
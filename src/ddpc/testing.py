@@ -0,0 +1,322 @@
+"""Write synthetic DS-PAW band and DOS files of any size.
+
+The files follow the HDF5 and JSON layout read by :mod:`ddpc.io.band` and
+:mod:`ddpc.io.dos`. Arrays are generated and written in chunks of
+:data:`CHUNK_VALUES` numbers, so files much larger than the memory can be
+produced. The numbers are random but deterministic for a seed, and the HDF5
+and JSON files written with the same arguments hold the same numbers.
+"""
+
+import json
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+import h5py
+import numpy as np
+import polars as pl
+from loguru import logger
+
+# numbers generated and written at a time
+CHUNK_VALUES = 1 << 20
+
+# spin type stored in the file and number of spin channels
+SPIN_TYPES = {
+    "spinless": ("none", 1),
+    "collinear": ("collinear", 2),
+    "noncollinear": ("non-collinear", 1),
+}
+# DS-PAW lists every orbital up to f, while only s, p and d are projected
+ORBITALS = ["s", "py", "pz", "px", "dxy", "dyz", "dz2", "dxz", "dx2"]
+ORBITALS_H5 = [*ORBITALS, "f-3", "f-2", "f-1", "f0", "f1", "f2", "f3"]
+ELEMENTS = ("Fe", "O")
+EMIN, EMAX = -10.0, 10.0
+
+
+@logger.catch
+def write_band_file(
+    p: str | Path,
+    spin: str = "collinear",
+    shape: tuple[int, int, int] = (2, 16, 100),
+    projected: bool = True,
+    seed: int = 0,
+) -> Path:
+    """Write a synthetic band structure file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Output path; the extension, .h5 or .json, selects the format.
+    spin : {"spinless", "collinear", "noncollinear"}, default "collinear"
+        Spin type of the calculation.
+    shape : tuple of (int, int, int), default (2, 16, 100)
+        Number of atoms, bands and k-points.
+    projected : bool, default True
+        Whether to write orbital projections.
+    seed : int, default 0
+        Seed of the random projections.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the written file.
+
+    Examples
+    --------
+    >>> write_band_file("band.h5", "collinear", (64, 512, 1000))
+    """
+    path = Path(p)
+    natom, nband, nkpt = shape
+    spin_type, nspin = SPIN_TYPES[spin]
+    rng = np.random.default_rng(seed)
+    info = {
+        "BandGap": 0.0,
+        "CBM": 0.0,
+        "VBM": 0.0,
+        "EFermi": 0.0,
+        "IsProject": projected,
+        "NumberOfBand": nband,
+        "NumberOfKpoints": nkpt,
+        "SpinType": spin_type,
+        "SymmetryKPoints": ["G", "X"],
+        "SymmetryKPointsIndex": [1, nkpt],
+        # a straight path from G to X
+        "CoordinatesOfKPoints": np.repeat(np.linspace(0.0, 0.5, nkpt), 3),
+    }
+    energies = [_band_energies(nband, nkpt, 0.1 * s) for s in range(nspin)]
+    projections = [_projections(rng, natom) if projected else [] for _ in range(nspin)]
+
+    if path.suffix == ".h5":
+        # stored band-fastest but declared (nband, nkpt)
+        with h5py.File(path, "w") as f:
+            _write_h5_atoms(f, natom)
+            _write_h5_info(f.create_group("BandInfo"), info, projected)
+            for s, (band, project) in enumerate(zip(energies, projections, strict=True)):
+                group = f.create_group(f"BandInfo/Spin{s + 1}")
+                _write_h5_array(group, "BandEnergies", (nband, nkpt), band)
+                if projected:
+                    group["ProjectBand/AtomIndex"] = np.array([natom], np.int32)
+                    group["ProjectBand/OrbitIndexs"] = np.array([len(ORBITALS)], np.int32)
+                    group["ProjectBand/Nspins"] = np.array([1], np.int32)
+                    for (a, o), values in project:
+                        name = f"ProjectBand/1/{a}/{o}"
+                        _write_h5_array(group, name, (nband, nkpt), values)
+    else:
+        spins = [
+            {"BandEnergies": band, **({"ProjectBand": project} if projected else {})}
+            for band, project in zip(energies, projections, strict=True)
+        ]
+        _write_json(path, natom, "BandInfo", info, spins)
+    return path
+
+
+@logger.catch
+def write_dos_file(
+    p: str | Path,
+    spin: str = "collinear",
+    shape: tuple[int, int] = (2, 1001),
+    projected: bool = True,
+    seed: int = 0,
+) -> Path:
+    """Write a synthetic density of states file.
+
+    Parameters
+    ----------
+    p : str or pathlib.Path
+        Output path; the extension, .h5 or .json, selects the format.
+    spin : {"spinless", "collinear", "noncollinear"}, default "collinear"
+        Spin type of the calculation.
+    shape : tuple of (int, int), default (2, 1001)
+        Number of atoms and energy points.
+    projected : bool, default True
+        Whether to write orbital projections.
+    seed : int, default 0
+        Seed of the random total and projected DOS.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the written file.
+
+    Examples
+    --------
+    >>> write_dos_file("dos.json", "spinless", (16, 20001))
+    """
+    path = Path(p)
+    natom, nenergy = shape
+    spin_type, nspin = SPIN_TYPES[spin]
+    rng = np.random.default_rng(seed)
+    info = {
+        "DosEnergy": _energy_grid(nenergy),
+        "EFermi": 0.0,
+        "EnergyMax": EMAX,
+        "EnergyMin": EMIN,
+        "NumberOfDos": nenergy,
+        "Project": projected,
+        "SpinType": spin_type,
+    }
+    totals = [_random(rng, float(natom)) for _ in range(nspin)]
+    projections = [_projections(rng, natom) if projected else [] for _ in range(nspin)]
+
+    if path.suffix == ".h5":
+        with h5py.File(path, "w") as f:
+            _write_h5_atoms(f, natom)
+            group = f.create_group("DosInfo")
+            _write_h5_array(group, "DosEnergy", (nenergy,), _energy_grid(nenergy))
+            del info["DosEnergy"]
+            _write_h5_info(group, info, projected)
+            for s, (total, project) in enumerate(zip(totals, projections, strict=True)):
+                group = f.create_group(f"DosInfo/Spin{s + 1}")
+                _write_h5_array(group, "Dos", (nenergy,), total)
+                if projected:
+                    group["ProjectDos/AtomIndexs"] = np.array([natom], np.int32)
+                    group["ProjectDos/OrbitIndexs"] = np.array([len(ORBITALS)], np.int32)
+                    for (a, o), values in project:
+                        _write_h5_array(group, f"ProjectDos{a}/{o}", (nenergy,), values)
+    else:
+        spins = [
+            {"Dos": total, **({"ProjectDos": project} if projected else {})}
+            for total, project in zip(totals, projections, strict=True)
+        ]
+        _write_json(path, natom, "DosInfo", info, spins)
+    return path
+
+
+def _band_energies(nband: int, nkpt: int, shift: float) -> Callable:
+    """Band energies of the band-fastest positions ``[start, stop)``.
+
+    Every band wobbles inside its own slice of the energy range, so the
+    bands stay sorted at every k-point.
+    """
+
+    def values(start: int, stop: int) -> np.ndarray:
+        k, b = np.divmod(np.arange(start, stop), nband)
+        wobble = 0.4 * np.sin(2 * np.pi * k / nkpt + b)
+        return EMIN + shift + (EMAX - EMIN) * (b + 0.5 + wobble) / nband
+
+    return values
+
+
+def _energy_grid(nenergy: int) -> Callable:
+    """Evenly spaced energies from :data:`EMIN` to :data:`EMAX`."""
+    step = (EMAX - EMIN) / max(nenergy - 1, 1)
+    return lambda start, stop: EMIN + step * np.arange(start, stop)
+
+
+def _random(rng: np.random.Generator, scale: float) -> Callable:
+    """Uniform random numbers in ``[0, scale)``, drawn as the chunks are written."""
+    return lambda start, stop: scale * rng.random(stop - start)
+
+
+def _projections(rng: np.random.Generator, natom: int) -> list:
+    """``((atom, orbital), values)`` of every projection, 1-based.
+
+    The weights of one point sum to about one over all atoms and orbitals.
+    """
+    scale = 2.0 / (natom * len(ORBITALS))
+    return [
+        ((a + 1, o + 1), _random(rng, scale)) for a in range(natom) for o in range(len(ORBITALS))
+    ]
+
+
+def _chunks(values: Callable, size: int, step: int = 1) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Generate ``(start, stop, values)`` chunks, cut at multiples of ``step``."""
+    length = max(step, CHUNK_VALUES // step * step)
+    for start in range(0, size, length):
+        stop = min(start + length, size)
+        yield start, stop, values(start, stop)
+
+
+def _h5_str(values: list[str]) -> np.ndarray:
+    """Encode strings as DS-PAW does, ``;``-joined single characters."""
+    return np.array(list(";".join(values)), dtype="S1")
+
+
+def _write_h5_array(group: h5py.Group, name: str, shape: tuple, values: Callable) -> None:
+    """Write a dataset chunk by chunk, whole rows at a time."""
+    dataset = group.create_dataset(name, shape, dtype=float)
+    row = int(np.prod(shape[1:]))
+    for start, stop, chunk in _chunks(values, int(np.prod(shape)), row):
+        dataset[start // row : stop // row] = chunk.reshape(-1, *shape[1:])
+
+
+def _write_h5_atoms(f: h5py.File, natom: int) -> None:
+    """Write the ``/AtomInfo`` group of a cubic cell."""
+    f["AtomInfo/Elements"] = _h5_str([ELEMENTS[i % len(ELEMENTS)] for i in range(natom)])
+    f["AtomInfo/CoordinateType"] = _h5_str(["Direct"])
+    f["AtomInfo/Lattice"] = 5.0 * np.eye(3).ravel()
+    f["AtomInfo/Position"] = np.linspace(0.0, 1.0, 3 * natom, endpoint=False)
+
+
+def _write_h5_info(group: h5py.Group, info: dict, projected: bool) -> None:
+    """Write the metadata of ``/BandInfo`` or ``/DosInfo``."""
+    for key, value in info.items():
+        if isinstance(value, str):
+            group[key] = _h5_str([value])
+        elif isinstance(value, bool):
+            group[key] = np.array([value], np.uint8)
+        elif isinstance(value, int):
+            group[key] = np.array([value], np.int32)
+        elif isinstance(value, list) and isinstance(value[0], str):
+            group[key] = _h5_str(value)
+        elif isinstance(value, list):
+            group[key] = np.array(value, np.int32)
+        elif isinstance(value, np.ndarray):
+            # the k-point coordinates are stored k-major but declared (3, nkpt)
+            group[key] = value.reshape(3, -1)
+        else:
+            group[key] = np.array([value])
+    if projected:
+        group["Orbit"] = _h5_str(ORBITALS_H5)
+
+
+def _write_json(path: Path, natom: int, name: str, info: dict, spins: list[dict]) -> None:
+    """Write a JSON document, streaming the large arrays chunk by chunk."""
+    atoms = [
+        {"Element": ELEMENTS[i % len(ELEMENTS)], "Position": [i / natom] * 3} for i in range(natom)
+    ]
+    info = dict(info)
+    if spins[0].keys() & {"ProjectBand", "ProjectDos"}:
+        info["Orbit"] = ORBITALS
+    for s, arrays in enumerate(spins):
+        info[f"Spin{s + 1}"] = {
+            key: values
+            if callable(values)
+            else [{"AtomIndex": a, "OrbitIndex": o, "Contribution": c} for (a, o), c in values]
+            for key, values in arrays.items()
+        }
+    lattice = 5.0 * np.eye(3).ravel()
+    doc = {"AtomInfo": {"Atoms": atoms, "CoordinateType": "Direct", "Lattice": lattice}, name: info}
+    # every large array of a file has the same length
+    size = info.get("NumberOfDos") or info["NumberOfBand"] * info["NumberOfKpoints"]
+    with path.open("w") as f:
+        _write_json_value(f, doc, size)
+
+
+def _write_json_value(f: TextIO, value: object, size: int) -> None:
+    """Write a JSON value; callables are arrays of ``size`` numbers written in chunks."""
+    if callable(value):
+        _write_json_array(f, value, size)
+    elif isinstance(value, dict):
+        f.write("{")
+        for i, (key, item) in enumerate(value.items()):
+            f.write(f"{', ' if i else ''}{json.dumps(key)}: ")
+            _write_json_value(f, item, size)
+        f.write("}")
+    elif isinstance(value, list) and value and isinstance(value[0], dict):
+        f.write("[")
+        for i, item in enumerate(value):
+            f.write(", " if i else "")
+            _write_json_value(f, item, size)
+        f.write("]")
+    else:
+        f.write(json.dumps(value, default=np.ndarray.tolist))
+
+
+def _write_json_array(f: TextIO, values: Callable, size: int) -> None:
+    """Write a JSON array of numbers, formatted chunk by chunk by Polars."""
+    f.write("[")
+    for start, _, chunk in _chunks(values, size):
+        text = pl.DataFrame({"value": chunk}).write_csv(include_header=False)
+        f.write(("," if start else "") + text.rstrip("\n").replace("\n", ","))
+    f.write("]")
@@ -1,7 +1,12 @@
+from collections.abc import Callable
 from pathlib import Path
 
+import numpy as np
 import pytest
 
+from ddpc.io.band import BandStructure
+from ddpc.io.dos import DensityOfStates
+
 
 @pytest.fixture(scope="session")
 def data_dir():
@@ -47,3 +52,63 @@ def parametrized_data_file_path(data_dir: Path, request) -> Path:
     yield full_path
     # Optional: cleanup or print after test
     print(f"Finished with data file path: {full_path}")
+
+
+def _spin_axes(nspin: int, axes: dict | None) -> tuple[dict, str]:
+    """Return the axes of an unprojected structure with overrides, and its spin type."""
+    spins = [""] if nspin == 1 else ["up", "down"]
+    axes = {"spins": spins, "atoms": [], "elements": [], "orbitals": [], **(axes or {})}
+    return axes, "collinear" if len(axes["spins"]) == 2 else "none"
+
+
+def build_band(
+    energies: np.ndarray,
+    projections: np.ndarray | None = None,
+    kpath: dict | None = None,
+    axes: dict | None = None,
+    **info: object,
+) -> BandStructure:
+    """Build a band structure of given ``(spin, band, kpoint)`` energies in memory.
+
+    The k-path defaults to evenly spaced points from G to X, the axes to a
+    spinless or collinear structure without atoms, and the Fermi energy to 0;
+    ``kpath``, ``axes`` and ``info`` entries replace the defaults.
+    """
+    nkpt = energies.shape[-1]
+    axes, spin_type = _spin_axes(energies.shape[0], axes)
+    kpath = {
+        "kpoints": np.zeros((nkpt, 3)),
+        "distances": np.linspace(0.0, 1.0, nkpt),
+        "labels": np.array(["G", *[""] * (nkpt - 2), "X"]),
+        **(kpath or {}),
+    }
+    info = {"efermi": 0.0, "spin_type": spin_type, "projected": projections is not None, **info}
+    return BandStructure(energies, projections, kpath, axes, info)
+
+
+def build_dos(
+    energies: np.ndarray,
+    dos: np.ndarray,
+    projections: np.ndarray | None = None,
+    axes: dict | None = None,
+    **info: object,
+) -> DensityOfStates:
+    """Build a density of states of given ``(spin, energy)`` values in memory.
+
+    The axes and Fermi energy default as in :func:`build_band`.
+    """
+    axes, spin_type = _spin_axes(dos.shape[0], axes)
+    info = {"efermi": 0.0, "spin_type": spin_type, "projected": projections is not None, **info}
+    return DensityOfStates(energies, dos, projections, axes, info)
+
+
+@pytest.fixture(scope="session")
+def make_band() -> Callable[..., BandStructure]:
+    """Return the in-memory band structure builder, see :func:`build_band`."""
+    return build_band
+
+
+@pytest.fixture(scope="session")
+def make_dos() -> Callable[..., DensityOfStates]:
+    """Return the in-memory density of states builder, see :func:`build_dos`."""
+    return build_dos
@@ -0,0 +1,89 @@
+"""Tests for densities of states from bands in ddpc.analysis.bandos."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.analysis.bandos import dos_from_bands
+from ddpc.analysis.broadening import broaden_array
+from ddpc.io.band import BandStructure, load_band
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+GRID = np.linspace(-8.0, 8.0, 1601)
+STEP = GRID[1] - GRID[0]
+
+
+def _mesh_band(
+    make_band: Callable[..., BandStructure], n: int, shift: float = 0.0
+) -> BandStructure:
+    """Return a simple cubic tight-binding band and a flat band on a shuffled n^3 mesh."""
+    axis = np.arange(n) / n
+    kpoints = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    kpoints = kpoints[np.random.default_rng(0).permutation(len(kpoints))] - 0.5
+    dispersive = -2 * np.cos(2 * np.pi * kpoints).sum(axis=1) + shift
+    energies = np.array([[dispersive, np.full(len(kpoints), 7.0)]])
+    kpath = {
+        "kpoints": kpoints,
+        "distances": np.zeros(len(kpoints)),
+        "labels": np.array([""] * len(kpoints)),
+    }
+    return make_band(energies, kpath=kpath)
+
+
+def test_gaussian_matches_direct_sum():
+    """Binning and smearing equals a sum of Gaussians over every eigenvalue."""
+    band = load_band(DATA_DIR / "collinear_pband.h5", cache=False)
+    grid = np.linspace(band.energies.min() - 1, band.energies.max() + 1, 4001)
+    dos = dos_from_bands(band, grid, width=0.3)
+    sigma = 0.3 / (2 * np.sqrt(2 * np.log(2)))
+    nkpt = band.energies.shape[2]
+    for si in range(2):
+        offsets = grid[:, None] - band.energies[si].ravel()
+        gaussians = np.exp(-(offsets**2) / (2 * sigma**2)) / (sigma * np.sqrt(2 * np.pi))
+        expected = gaussians.sum(axis=1) / nkpt
+        # linear binning is exact up to (grid step / sigma)^2
+        np.testing.assert_allclose(dos.dos[si], expected, atol=2e-3 * expected.max())
+
+    # every band holds one state, shared between the projections
+    step = grid[1] - grid[0]
+    np.testing.assert_allclose(dos.dos.sum(axis=1) * step, band.energies.shape[1])
+    projected = dos.projections.sum(axis=(1, 2, 3)) * step
+    expected = band.projections.sum(axis=(1, 2, 3, 4)) / nkpt
+    np.testing.assert_allclose(projected, expected)
+    assert dos.axes == band.axes
+    assert dos.to_polars(mode=2).height == len(grid)
+
+
+def test_tetrahedron_on_mesh(make_band):
+    """The tetrahedron DOS holds every state and agrees with Gaussian smearing."""
+    band = _mesh_band(make_band, 16)
+    dos = dos_from_bands(band, GRID, method="tetrahedron")
+    assert dos.dos.sum() * STEP == pytest.approx(2.0)
+    # the tight-binding band is symmetric about 0 and bounded by +-6
+    assert dos.dos[0, GRID < -6.01].sum() == 0.0
+    np.testing.assert_allclose(dos.dos[0, :800].sum() * STEP, 0.5 - dos.dos[0, 800] * STEP / 2)
+    # the flat band fills a single grid cell
+    assert dos.dos[0, np.argmin(np.abs(GRID - 7.0))] * STEP == pytest.approx(1.0)
+
+    smeared = dos_from_bands(band, GRID, width=0.5)
+    np.testing.assert_allclose(broaden_array(dos.dos, GRID, 0.5), smeared.dos, atol=0.02)
+
+
+def test_tetrahedron_converges(make_band):
+    """Shifting the band shifts the tetrahedron DOS, which is smooth on a fine mesh."""
+    coarse = dos_from_bands(_mesh_band(make_band, 12), GRID, method="tetrahedron").dos[0]
+    shifted = dos_from_bands(_mesh_band(make_band, 12, 1.0), GRID, method="tetrahedron").dos[0]
+    np.testing.assert_allclose(shifted[100:1300], coarse[:1200], atol=1e-9)
+    fine = dos_from_bands(_mesh_band(make_band, 24), GRID, method="tetrahedron").dos[0]
+    # van Hove singularities aside, the coarse mesh is already close
+    assert np.abs(broaden_array(coarse - fine, GRID, 0.3)).max() < 0.01
+
+
+def test_invalid_input():
+    """Unknown methods, bad grids and k-paths for tetrahedra are rejected."""
+    band = load_band(DATA_DIR / "spinless_band.h5", cache=False)
+    assert dos_from_bands(band, method="histogram") is None
+    assert dos_from_bands(band, GRID[::-1]) is None
+    assert dos_from_bands(band, method="tetrahedron") is None
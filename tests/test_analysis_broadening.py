@@ -0,0 +1,76 @@
+"""Tests for DOS broadening in ddpc.analysis.broadening."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.analysis.broadening import broaden, broaden_array
+from ddpc.io.dos import load_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+ENERGIES = np.linspace(-5.0, 5.0, 501)
+
+
+def _direct(values: np.ndarray, width: float, lineshape: str) -> np.ndarray:
+    """Broaden row by row with a direct convolution."""
+    n = len(ENERGIES)
+    step = ENERGIES[1] - ENERGIES[0]
+    offsets = np.arange(-(n - 1), n) * step
+    if lineshape == "gaussian":
+        kernel = np.exp(-4 * np.log(2) * (offsets / width) ** 2)
+        kernel /= kernel.sum()
+    else:
+        gamma = width / 2
+        kernel = np.arctan((offsets + step / 2) / gamma) - np.arctan((offsets - step / 2) / gamma)
+        kernel /= np.pi
+    return np.array([np.convolve(row, kernel)[n - 1 : 2 * n - 1] for row in values])
+
+
+@pytest.mark.parametrize("lineshape", ["gaussian", "lorentzian"])
+@pytest.mark.parametrize("width", [0.01, 0.3, 20.0])
+def test_matches_direct_convolution(lineshape, width):
+    """FFT broadening equals a direct linear convolution of every curve."""
+    values = np.random.default_rng(0).random((2, 3, len(ENERGIES)))
+    broadened = broaden_array(values, ENERGIES, width, lineshape)
+    assert broadened.shape == values.shape
+    expected = _direct(values.reshape(6, -1), width, lineshape).reshape(values.shape)
+    np.testing.assert_allclose(broadened, expected, atol=1e-12)
+
+
+def test_peak_shape_and_area():
+    """A delta peak becomes a normalised lineshape of the requested FWHM."""
+    values = np.zeros(len(ENERGIES))
+    values[250] = 1.0
+    for lineshape in ("gaussian", "lorentzian"):
+        peak = broaden_array(values, ENERGIES, 0.5, lineshape)
+        above = ENERGIES[peak >= peak.max() / 2]
+        assert above[-1] - above[0] == pytest.approx(0.5, abs=0.05)
+    np.testing.assert_allclose(broaden_array(values, ENERGIES, 0.5).sum(), 1.0)
+    np.testing.assert_array_equal(broaden_array(values, ENERGIES, 0.0), values)
+
+
+def test_broaden_dos():
+    """Total and projected channels of both spins are broadened separately."""
+    dos = load_dos(DATA_DIR / "collinear_pdos.h5", cache=False)
+    smooth = broaden(dos, 0.2, "lorentzian")
+    assert smooth.dos.shape == dos.dos.shape
+    assert smooth.projections.shape == dos.projections.shape
+    assert smooth.axes == dos.axes
+    for si in range(2):
+        np.testing.assert_allclose(
+            smooth.dos[si], broaden_array(dos.dos[si], dos.energies, 0.2, "lorentzian")
+        )
+    np.testing.assert_allclose(
+        smooth.projections[1, 2],
+        broaden_array(dos.projections[1, 2], dos.energies, 0.2, "lorentzian"),
+    )
+    assert smooth.to_polars(3).columns == dos.to_polars(3).columns
+
+
+def test_invalid_input():
+    """Unknown lineshapes, negative widths and irregular grids are rejected."""
+    values = np.ones((1, 4))
+    assert broaden_array(values, np.arange(4.0), 0.1, "voigt") is None
+    assert broaden_array(values, np.arange(4.0), -0.1) is None
+    assert broaden_array(values, np.array([0.0, 1.0, 3.0, 4.0]), 0.1) is None
@@ -0,0 +1,71 @@
+"""Tests for band reordering in ddpc.analysis.connectivity."""
+
+from pathlib import Path
+
+import numpy as np
+
+from ddpc.analysis.connectivity import _assign, band_order, reorder_bands
+from ddpc.io.band import load_band, load_band_channels
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+KPATH = np.linspace(0.0, 1.0, 41)
+# one Si atom with s and p projections
+SILICON = {"atoms": ["1"], "elements": ["Si"], "orbitals": ["s", "p"]}
+
+
+def test_assign_is_optimal():
+    """The auction finds a minimum-cost assignment, also with tied costs."""
+    rng = np.random.default_rng(0)
+    for n in (2, 7, 40):
+        cost = np.round(rng.random((n, n)), 1)
+        assigned = _assign(cost)
+        assert sorted(assigned) == list(range(n))
+        # no pair of rows gains by swapping their columns
+        swapped = cost[:, assigned]
+        diagonal = np.diag(swapped)
+        assert (diagonal[:, None] + diagonal[None, :] <= swapped + swapped.T + 1e-9).all()
+
+
+def test_crossing_lines(make_band):
+    """Straight bands keep their slopes through crossings."""
+    lines = np.array([2.0 - 3.0 * KPATH, 1.0 * KPATH, 0.5 + 0.0 * KPATH, 3.0 - KPATH])
+    band = reorder_bands(make_band(np.sort(lines[None], axis=1)))
+    expected = lines[np.argsort(lines[:, 0])]
+    np.testing.assert_allclose(band.energies[0], expected)
+
+
+def test_projections_follow_character(make_band):
+    """Touching bands of different character are told apart by projections."""
+    # a p band peaks where an s band has its minimum, at the middle k-point
+    p_band = 0.5 - np.abs(KPATH - 0.5)
+    s_band = 0.5 + np.abs(KPATH - 0.5)
+    character = np.zeros((1, 1, 2, 2, len(KPATH)))
+    character[0, 0, 1, 0] = 1.0
+    character[0, 0, 0, 1] = 1.0
+    band = make_band(np.sort([[p_band, s_band]], axis=1), character, axes=SILICON)
+
+    # from energies alone the bands continue straight through the touching point
+    energy_only = reorder_bands(band, weight=0.0)
+    np.testing.assert_allclose(energy_only.energies[0], [KPATH, 1.0 - KPATH], atol=1e-12)
+
+    connected = reorder_bands(band, weight=1.0)
+    np.testing.assert_allclose(connected.energies, band.energies)
+    np.testing.assert_allclose(connected.projections, band.projections)
+
+
+def test_file_band_structure():
+    """Orders are permutations and aggregated channels move with the energies."""
+    band = load_band(DATA_DIR / "collinear_pband.h5", cache=False)
+    order = band_order(band)
+    nspin, nband, nkpt = band.energies.shape
+    assert order.shape == (nspin, nband, nkpt)
+    np.testing.assert_array_equal(
+        np.sort(order, axis=1), np.broadcast_to(np.arange(nband)[:, None], order.shape)
+    )
+
+    channels = load_band_channels(DATA_DIR / "collinear_pband.h5", mode=2)
+    reordered = reorder_bands(channels)
+    expected = np.take_along_axis(channels.channels[2], band_order(channels)[:, None], axis=2)
+    np.testing.assert_allclose(reordered.channels[2], expected)
+    np.testing.assert_allclose(np.sort(reordered.energies, axis=1), channels.energies)
+    assert reordered.to_polars(mode=2).shape == channels.to_polars(mode=2).shape
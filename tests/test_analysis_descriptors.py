@@ -0,0 +1,77 @@
+"""Tests for the DOS descriptors in ddpc.analysis.descriptors."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.analysis.descriptors import dos_descriptors
+from ddpc.io.dos import DensityOfStates, load_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+def _gaussian_dos(
+    make_dos: Callable[..., DensityOfStates], center: float, sigma: float, efermi: float
+) -> DensityOfStates:
+    """Spinless total DOS holding one normalised Gaussian peak."""
+    energies = np.linspace(-20.0, 20.0, 8001) + efermi
+    peak = np.exp(-0.5 * ((energies - efermi - center) / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+    return make_dos(energies, peak[None], efermi=efermi)
+
+
+def test_gaussian_moments(make_dos):
+    """A Gaussian peak has its centre, width, zero skewness and kurtosis 3."""
+    row = dos_descriptors(_gaussian_dos(make_dos, -1.5, 0.8, 3.0)).row(0, named=True)
+    assert row["spin"] == "none"
+    assert row["channel"] == "tdos"
+    assert row["states"] == pytest.approx(1.0)
+    assert row["occupied"] == pytest.approx(0.9696, abs=1e-4)
+    assert row["filling"] == pytest.approx(row["occupied"])
+    assert row["center"] == pytest.approx(-1.5)
+    assert row["width"] == pytest.approx(0.8)
+    assert row["skewness"] == pytest.approx(0.0, abs=1e-8)
+    assert row["kurtosis"] == pytest.approx(3.0)
+
+
+def test_every_channel_matches_trapezoid():
+    """Every spin and channel equals a direct trapezoid integration."""
+    dos = load_dos(DATA_DIR / "collinear_pdos.h5", cache=False)
+    table = dos_descriptors(dos, 4, window=(-8.0, 4.0))
+    channels = table["channel"].cat.get_categories().to_list()
+    assert channels[0] == "tdos"
+    assert table.height == 2 * len(channels)
+    assert table["spin"].to_list()[:: len(channels)] == ["up", "down"]
+
+    frame = dos.to_polars(4)
+    energies = dos.energies - dos.efermi
+    inside = (energies >= -8.0) & (energies <= 4.0)
+    x = energies[inside]
+    for row in table.iter_rows(named=True):
+        rho = frame[f"{row['channel']}-{row['spin']}"].to_numpy()[inside]
+        states = np.trapezoid(rho, x)
+        with np.errstate(invalid="ignore"):
+            # empty channels have NaN moments
+            center = np.trapezoid(x * rho, x) / states
+            width = np.sqrt(np.trapezoid((x - center) ** 2 * rho, x) / states)
+        below = x <= 0
+        occupied = np.trapezoid(rho[below], x[below])
+        occupied += (0 - x[below][-1]) * (rho[below][-1] + np.interp(0, x, rho)) / 2
+        np.testing.assert_allclose(
+            [row["states"], row["center"], row["width"], row["occupied"]],
+            [states, center, width, occupied],
+            rtol=1e-9,
+        )
+
+
+def test_total_only_and_errors(make_dos):
+    """Mode 0 gives the total DOS; empty windows and channels are reported."""
+    dos = load_dos(DATA_DIR / "spinless_pdos.json", cache=False)
+    assert dos_descriptors(dos, 0)["channel"].to_list() == ["tdos"]
+    assert dos_descriptors(dos, 7) is None
+    assert dos_descriptors(dos, window=(100.0, 101.0)) is None
+
+    empty = _gaussian_dos(make_dos, 0.0, 1.0, 0.0)
+    empty.dos[:] = 0.0
+    assert np.isnan(dos_descriptors(empty)["center"][0])
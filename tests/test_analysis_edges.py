@@ -0,0 +1,76 @@
+"""Tests for the band edge analysis in ddpc.analysis.edges."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.analysis.edges import band_edges
+from ddpc.io.band import load_band
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+KPATH = np.linspace(0.0, 1.0, 21)
+
+
+def test_indirect_gap(make_band):
+    """A valence maximum at G and conduction minimum at X give an indirect gap."""
+    valence = -(KPATH**2)
+    conduction = 1.5 + 0.5 * (KPATH - 1) ** 2
+    energies = np.array([[valence - 1, valence, conduction]])
+    row = band_edges(make_band(energies)).row(0, named=True)
+    assert row["spin"] == "none"
+    assert (row["vbm"], row["cbm"]) == (0.0, 1.5)
+    assert row["gap"] == pytest.approx(1.5)
+    assert row["direct_gap"] == pytest.approx((conduction - valence).min())
+    assert row["direct"] is False
+    assert (row["vbm_band"], row["cbm_band"]) == (2, 3)
+    assert (row["vbm_kpoint"], row["cbm_kpoint"]) == (1, 21)
+    assert (row["vbm_label"], row["cbm_label"]) == ("G", "X")
+    assert row["metal"] is False
+
+
+def test_direct_gap_and_spins(make_band):
+    """Edges are found per spin and over both spins of collinear data."""
+    up = np.array([-(KPATH**2) - 0.2, 1.0 + KPATH**2])
+    down = np.array([-((KPATH - 1) ** 2), 2.1 - KPATH])
+    table = band_edges(make_band(np.array([up, down])))
+    assert table["spin"].to_list() == ["up", "down", "both"]
+    rows = {row["spin"]: row for row in table.iter_rows(named=True)}
+    assert rows["up"]["gap"] == pytest.approx(1.2)
+    assert rows["up"]["direct"] is True
+    assert rows["down"]["gap"] == pytest.approx(1.1)
+    assert rows["down"]["direct"] is True
+    assert (rows["down"]["vbm_label"], rows["down"]["cbm_label"]) == ("X", "X")
+
+    both = rows["both"]
+    assert (both["vbm_spin"], both["cbm_spin"]) == ("down", "up")
+    assert (both["vbm_label"], both["cbm_label"]) == ("X", "G")
+    assert both["gap"] == pytest.approx(1.0)
+    assert both["direct_gap"] == pytest.approx(1.1)
+    assert both["direct"] is False
+
+
+def test_metal(make_band):
+    """A band crossing the Fermi energy closes the gap."""
+    energies = np.array([[KPATH - 0.5, KPATH + 1.0]])
+    row = band_edges(make_band(energies)).row(0, named=True)
+    assert row["metal"] is True
+    assert row["gap"] == row["direct_gap"] == 0.0
+    # a metal has no gap to call direct
+    assert row["direct"] is False
+
+
+@pytest.mark.parametrize(
+    "name", ["collinear_band.h5", "spinless_band.json", "noncollinear_band.h5"]
+)
+def test_matches_brute_force(name):
+    """Edges of real files equal a scan over every state."""
+    band = load_band(DATA_DIR / name, projections=False, cache=False)
+    table = band_edges(band)
+    for si, row in enumerate(table.iter_rows(named=True)):
+        energies = band.energies if row["spin"] == "both" else band.energies[si : si + 1]
+        occupied = energies[energies <= band.efermi + 1e-4]
+        empty = energies[energies > band.efermi + 1e-4]
+        assert row["vbm"] == occupied.max()
+        assert row["cbm"] == empty.min()
+        assert row["gap"] == pytest.approx(empty.min() - occupied.max())
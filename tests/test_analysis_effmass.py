@@ -0,0 +1,79 @@
+"""Tests for k-path segments and effective masses in ddpc.analysis."""
+
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pytest
+
+from ddpc.analysis.effmass import HBAR2_OVER_ME, effective_masses
+from ddpc.analysis.kpath import kpath_segments
+from ddpc.io.band import load_band
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+# G -> X -> G with the X point repeated, 21 points per segment
+KPATH = np.concatenate([np.linspace(0.0, 0.5, 21), np.linspace(0.5, 1.0, 21)])
+LABELS = np.array(["G", *[""] * 19, "X", "", *[""] * 19, "G"])
+GXG = {"distances": KPATH, "labels": LABELS}
+
+
+def _parabola(mass: float, center: float, k: np.ndarray) -> np.ndarray:
+    """Energies of a free-electron band of the given mass in electron masses."""
+    return HBAR2_OVER_ME / (2 * mass) * (k - center) ** 2
+
+
+def test_kpath_segments(make_band):
+    """The path is cut at repeated k-points and measured in 1/Angstrom."""
+    distances, segments = kpath_segments(make_band(np.zeros((1, 1, len(KPATH))), kpath=GXG))
+    assert segments == [slice(0, 21), slice(21, 42)]
+    np.testing.assert_array_equal(distances, KPATH)
+
+    path = DATA_DIR / "spinless_band.h5"
+    band = load_band(path, projections=False, cache=False)
+    with h5py.File(path) as f:
+        lattice = np.array(f["AtomInfo/Lattice"]).reshape(3, 3)
+    distances, segments = kpath_segments(band, lattice)
+    assert [(seg.start, seg.stop) for seg in segments] == [(i, i + 30) for i in range(0, 150, 30)]
+    assert distances[0] == 0.0
+    # G-X of the fcc cell is 2 pi / a in 1/Angstrom
+    a = np.linalg.norm(lattice[0]) * np.sqrt(2)
+    assert distances[29] == pytest.approx(2 * np.pi / a, rel=1e-4)
+
+
+def test_parabolic_masses(make_band):
+    """Known masses are recovered inside segments and at mirrored segment ends."""
+    electron = np.concatenate([_parabola(0.3, 0.25, KPATH[:21]), _parabola(0.5, 1.0, KPATH[21:])])
+    hole = -1.0 - _parabola(0.8, 0.5, KPATH)
+    table = effective_masses(make_band(np.array([[hole, electron]]), kpath=GXG, first_band=5))
+    assert table.height == 8
+    assert table["segment"].to_list() == ["G-X", "G-X", "X-G", "X-G"] * 2
+    assert table["kind"].to_list() == ["min", "max"] * 4
+    assert table["band"].to_list() == [5] * 4 + [6] * 4
+
+    rows = {(r["band"], r["segment"], r["kind"]): r for r in table.iter_rows(named=True)}
+    hole_x = rows[5, "G-X", "max"]
+    assert (hole_x["kpoint"], hole_x["label"]) == (21, "X")
+    assert hole_x["mass"] == pytest.approx(-0.8)
+    assert hole_x["energy"] == pytest.approx(-1.0)
+    assert rows[5, "X-G", "max"]["label"] == "X"
+    assert rows[5, "X-G", "max"]["mass"] == pytest.approx(-0.8)
+    assert rows[6, "G-X", "min"]["kpoint"] == 11
+    assert rows[6, "G-X", "min"]["mass"] == pytest.approx(0.3)
+    assert rows[6, "X-G", "min"]["label"] == "G"
+    assert rows[6, "X-G", "min"]["mass"] == pytest.approx(0.5)
+    for key in [(5, "G-X", "max"), (6, "G-X", "min"), (6, "X-G", "min")]:
+        assert rows[key]["rmse"] == pytest.approx(0.0, abs=1e-10)
+    # the electron band is not symmetric about X, its mirrored fit is poor
+    assert rows[6, "G-X", "max"]["rmse"] > 1e-3
+
+
+def test_higher_order_fit(make_band):
+    """A quartic fit separates the curvature from a quartic term."""
+    quartic = _parabola(0.4, 0.25, KPATH) + 50.0 * (KPATH - 0.25) ** 4
+    band = make_band(quartic[None, None], kpath=GXG)
+    parabola = effective_masses(band, npoints=5)
+    fit = effective_masses(band, npoints=5, order=4)
+    assert fit["mass"][0] == pytest.approx(0.4)
+    assert fit["rmse"][0] == pytest.approx(0.0, abs=1e-10)
+    assert parabola["rmse"][0] > 1e-5
+    assert effective_masses(band, npoints=1, order=3) is None
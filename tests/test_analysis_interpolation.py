@@ -0,0 +1,87 @@
+"""Tests for band interpolation in ddpc.analysis.interpolation."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.analysis.interpolation import interpolate_bands
+from ddpc.io.band import BandStructure, load_band
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+# G -> X -> G with the X point repeated, 11 points per segment
+KPATH = np.concatenate([np.linspace(0.0, 1.0, 11), np.linspace(1.0, 2.0, 11)])
+LABELS = np.array(["G", *[""] * 9, "X", "", *[""] * 9, "G"])
+
+
+def _gxg(distances: np.ndarray = KPATH) -> dict:
+    """Return the G-X-G path with k-points along x at the given distances."""
+    kpoints = np.zeros((len(distances), 3))
+    kpoints[:, 0] = distances / 2
+    return {"kpoints": kpoints, "distances": distances, "labels": LABELS}
+
+
+@pytest.mark.parametrize("method", ["spline", "fourier"])
+def test_dense_path(make_band, method):
+    """Original points and labels are kept and segments stay separate."""
+    energies = np.array([[np.abs(KPATH - 1.0), np.cos(np.pi * KPATH)]])
+    band = make_band(energies, kpath=_gxg(), first_band=3)
+    dense = interpolate_bands(band, factor=5, method=method)
+    assert dense.energies.shape == (1, 2, 2 * (10 * 5 + 1))
+    np.testing.assert_allclose(dense.energies[..., :51:5], energies[..., :11], atol=1e-12)
+    np.testing.assert_allclose(dense.energies[..., 51::5], energies[..., 11:], atol=1e-12)
+    assert dense.labels[0] == "G"
+    assert dense.labels[50] == "X"
+    assert dense.labels[-1] == "G"
+    assert dense.first_band == 3
+    assert dense.projections is None
+    np.testing.assert_allclose(dense.distances[:51], np.linspace(0.0, 1.0, 51))
+    np.testing.assert_allclose(dense.kpoints[:51, 0], np.linspace(0.0, 0.5, 51))
+    # the kink at X is not smoothed; a cosine series bends linear bands at the ends
+    np.testing.assert_allclose(dense.energies[0, 1], np.cos(np.pi * dense.distances), atol=1e-3)
+    linear = np.abs(dense.distances - 1.0)
+    atol = 1e-12 if method == "spline" else 0.03
+    np.testing.assert_allclose(dense.energies[0, 0], linear, atol=atol)
+
+
+def test_spline_reproduces_cubics(make_band):
+    """Not-a-knot splines are exact for cubic bands, also on uneven k-points."""
+    distances = np.concatenate([np.linspace(0.0, 1.0, 11) ** 1.5, 1.0 + np.linspace(0.0, 1.0, 11)])
+    cubic = (distances - 0.3) ** 3 - 2 * distances
+    band = make_band(cubic[None, None], kpath=_gxg(distances))
+    dense = interpolate_bands(band, factor=3)
+    expected = (dense.distances - 0.3) ** 3 - 2 * dense.distances
+    np.testing.assert_allclose(dense.energies[0, 0], expected, atol=1e-10)
+    assert interpolate_bands(band, method="fourier") is None
+
+
+def test_fourier_accuracy():
+    """Upsampling a coarse file path recovers the skipped points of smooth bands."""
+    band = load_band(DATA_DIR / "spinless_band.h5", projections=False, cache=False)
+    coarse_kpoints = np.arange(0, 29, 2)
+    nband = band.energies.shape[1]
+    coarse = BandStructure(
+        band.energies[..., coarse_kpoints],
+        None,
+        {
+            "kpoints": band.kpoints[coarse_kpoints],
+            "distances": band.distances[coarse_kpoints],
+            "labels": np.asarray(band.labels)[coarse_kpoints],
+        },
+        band.axes,
+        {"efermi": band.efermi, "spin_type": "none", "projected": False},
+    )
+    # the lowest bands are smooth, the upper ones kink where sorted bands cross
+    for method, bands, tol in (("spline", slice(0, 5), 1e-3), ("fourier", slice(2, 5), 0.02)):
+        dense = interpolate_bands(coarse, factor=2, method=method)
+        assert dense.energies.shape == (1, nband, 29)
+        error = np.abs(dense.energies[:, bands] - band.energies[:, bands, :29])
+        assert error.max() < tol
+
+
+def test_invalid_input(make_band):
+    """Unknown methods and factors below one are rejected."""
+    band = make_band(np.zeros((1, 1, len(KPATH))), kpath=_gxg())
+    assert interpolate_bands(band, method="linear") is None
+    assert interpolate_bands(band, factor=0) is None
+    assert interpolate_bands(band, factor=1).energies.shape == (1, 1, len(KPATH))
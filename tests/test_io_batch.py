@@ -0,0 +1,54 @@
+"""Tests for the parallel batch readers in ddpc.io.batch."""
+
+import shutil
+from pathlib import Path
+
+import h5py
+import pytest
+
+from ddpc.io.band import read_band, read_band_many
+from ddpc.io.batch import expand_paths
+from ddpc.io.dos import read_dos, read_dos_many
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+def test_expand_paths():
+    """Patterns are sorted matches, iterables are kept in order."""
+    paths = expand_paths(str(DATA_DIR / "*_dos.h5"))
+    assert paths == sorted(DATA_DIR.glob("*_dos.h5"))
+    assert expand_paths(["b.h5", "a.h5"]) == [Path("b.h5"), Path("a.h5")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_read_band_many_reports_failures(workers):
+    """Results follow the input order and a bad file only reports an error."""
+    paths = [DATA_DIR / "spinless_pband.h5", DATA_DIR / "missing.h5", DATA_DIR / "spinless_band.h5"]
+    results = list(read_band_many(paths, workers=workers, mode=2, fmt=None))
+
+    assert [path for path, _, _ in results] == paths
+    for path, result, error in results:
+        if path.name == "missing.h5":
+            assert result is None
+            assert error.startswith("FileNotFoundError")
+        else:
+            assert error is None
+            df, efermi, isproj = read_band(path, 2, fmt=None)
+            assert result[0].equals(df)
+            assert result[1:] == (efermi, isproj)
+
+
+def test_read_dos_many_unordered(tmp_path):
+    """Unordered reads yield every file once; missing metadata is an error, not an exit."""
+    broken = tmp_path / "broken_dos.h5"
+    shutil.copy(DATA_DIR / "spinless_dos.h5", broken)
+    with h5py.File(broken, "a") as h5:
+        del h5["DosInfo/EFermi"]
+        h5["DosInfo"].create_group("EFermi")
+    paths = [DATA_DIR / "spinless_dos.h5", broken, DATA_DIR / "collinear_dos.h5"]
+
+    results = {path: (result, error) for path, result, error in read_dos_many(paths, 2, False)}
+    assert set(results) == set(paths)
+    assert results[broken] == (None, "TypeError: cannot read /DosInfo/EFermi")
+    df, _, _ = read_dos(paths[2])
+    assert results[paths[2]][0][0].equals(df)
@@ -0,0 +1,104 @@
+"""Tests for the on-disk cache in ddpc.io.cache."""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.io import cache
+from ddpc.io.band import load_band, read_band
+from ddpc.io.dos import load_dos, read_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory."""
+    monkeypatch.setitem(cache.CACHE_CONFIG, "enabled", True)
+    monkeypatch.setitem(cache.CACHE_CONFIG, "directory", tmp_path / "cache")
+    monkeypatch.setitem(cache.CACHE_CONFIG, "max_bytes", 1 << 30)
+    return tmp_path / "cache"
+
+
+@pytest.mark.parametrize(
+    ("name", "select"),
+    [("collinear_pband.h5", {"spins": ["up"]}), ("spinless_pband.json", None)],
+)
+def test_band_cache_hit(cache_dir, name, select):
+    """Cached reads equal uncached ones and memory-map the arrays."""
+    path = DATA_DIR / name
+    cache.disable_cache()
+    expected = read_band(path, 3, fmt=None, select=select)
+    cache.enable_cache()
+
+    first = load_band(path)
+    assert len(list(cache_dir.glob("*/meta.json"))) == 1
+    second = load_band(path)
+    assert isinstance(second.projections, np.memmap)
+    np.testing.assert_array_equal(first.projections, second.projections)
+    assert second.to_polars(3).equals(first.to_polars(3))
+
+    result = read_band(path, 3, fmt=None, select=select)
+    assert result[0].equals(expected[0])
+    assert result[1:] == expected[1:]
+    assert repr(result[1]) == repr(expected[1])
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_dos_cache_select(cache_dir, ext):
+    """Selectors are applied to the cached full-file arrays."""
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    select = {"elements": ["O"], "spins": ["down"]}
+    expected = load_dos(path, select, cache=False)
+
+    load_dos(path)
+    result = read_dos(path, 4, fmt=None, select=select)
+    assert result[0].equals(expected.to_polars(4))
+    assert repr(result[1:]) == repr((expected.efermi, expected.projected))
+
+
+def test_total_read_uses_projected_entry(cache_dir):
+    """An entry with projections serves total reads without a new entry."""
+    path = DATA_DIR / "spinless_pdos.h5"
+    load_dos(path)
+    dos = load_dos(path, projections=False)
+    assert isinstance(dos.dos, np.memmap)
+    assert len(list(cache_dir.glob("*/meta.json"))) == 1
+
+
+def test_cache_invalidated_on_change(cache_dir, tmp_path):
+    """A modified source file gets a new key."""
+    path = tmp_path / "pdos.h5"
+    shutil.copy(DATA_DIR / "spinless_pdos.h5", path)
+    key = cache.cache_key(path, "dos-1")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.cache_key(path, "dos-1") != key
+    assert cache.cache_key(path, "dos-0") != cache.cache_key(path, "dos-1")
+
+
+def test_cache_eviction(cache_dir, monkeypatch):
+    """Least recently used entries are evicted beyond the size limit."""
+    monkeypatch.setitem(cache.CACHE_CONFIG, "max_bytes", 1)
+    load_dos(DATA_DIR / "spinless_pdos.h5")
+    load_dos(DATA_DIR / "collinear_pdos.h5")
+    entries = list(cache_dir.glob("*/meta.json"))
+    assert len(entries) == 1
+    key = cache.cache_key(DATA_DIR / "collinear_pdos.h5", "dos-1")
+    assert entries[0].parent.name == key
+
+
+def test_cache_disabled(cache_dir):
+    """cache=False bypasses an enabled cache."""
+    load_band(DATA_DIR / "spinless_pband.h5", cache=False)
+    assert not cache_dir.exists()
+    cache.disable_cache()
+    load_band(DATA_DIR / "spinless_pband.h5")
+    assert not cache_dir.exists()
+    cache.enable_cache(cache_dir)
+    load_band(DATA_DIR / "spinless_pband.h5")
+    cache.clear_cache()
+    assert not cache_dir.exists()
@@ -0,0 +1,71 @@
+"""Tests for projections aggregated chunk by chunk under a memory budget."""
+
+import numpy as np
+import pytest
+from polars.testing import assert_frame_equal
+
+from ddpc import testing
+from ddpc.io.band import load_band, load_band_channels, read_band
+from ddpc.io.projection import BAND_MODES, MEMORY_CONFIG, memory_budget, set_memory_budget
+
+SELECT = {"atoms": [2, 4, 5], "bands": (3, 9), "kpoints": (2, 8)}
+
+
+@pytest.fixture(params=["h5", "json"])
+def band_file(request, tmp_path):
+    """Collinear band file with five atoms."""
+    return testing.write_band_file(tmp_path / f"band.{request.param}", "collinear", (5, 12, 9))
+
+
+@pytest.mark.parametrize("mode", list(BAND_MODES))
+@pytest.mark.parametrize("budget", [None, 1, 20_000, 10**7])
+@pytest.mark.parametrize("select", [None, SELECT])
+def test_channels_match_full_read(band_file, mode, budget, select):
+    """Any chunking gives the channels of the whole projection tensor."""
+    full = load_band(band_file, cache=False).subset(select)
+    band = load_band_channels(band_file, mode, select, budget)
+    assert band.projections is None
+    assert band.channels[0] == mode
+    labels, weights = full._aggregate(mode)
+    assert band.channels[1] == labels
+    np.testing.assert_allclose(band.channels[2], weights, rtol=1e-12)
+    np.testing.assert_array_equal(band.energies, full.energies)
+
+
+@pytest.mark.parametrize("layout", ["wide", "long"])
+def test_read_band_under_budget(band_file, layout):
+    """read_band streams under a global budget with the same frame."""
+    expected = read_band(band_file, 2, None, SELECT, layout)[0]
+    set_memory_budget(4_000)
+    try:
+        got = read_band(band_file, 2, None, SELECT, layout)[0]
+    finally:
+        set_memory_budget(None)
+    assert MEMORY_CONFIG["budget"] is None
+    assert_frame_equal(got, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize(("value", "budget"), [("4000", 4_000), ("0", None), ("2GB", None)])
+def test_budget_from_environment(band_file, monkeypatch, value, budget):
+    """$DDPC_MEMORY_BUDGET is read when used, a malformed value is ignored."""
+    expected = read_band(band_file, 2, None, SELECT)[0]
+    monkeypatch.setenv("DDPC_MEMORY_BUDGET", value)
+    assert memory_budget() == budget
+    assert_frame_equal(read_band(band_file, 2, None, SELECT)[0], expected, rtol=1e-12)
+    set_memory_budget(1_000)
+    try:
+        assert memory_budget() == 1_000
+    finally:
+        set_memory_budget(None)
+
+
+def test_channels_subset(band_file):
+    """Channels follow spin and window selections, not atom selections."""
+    band = load_band_channels(band_file, 3, budget=1)
+    sub = band.subset({"spins": ["down"], "bands": (2, 4)})
+    assert sub.channels[2].shape == (1, band.channels[2].shape[1], 3, 9)
+    np.testing.assert_array_equal(sub.channels[2], band.channels[2][1:, :, 1:4])
+    with pytest.raises(ValueError, match="aggregated"):
+        band.subset({"atoms": [1]})
+    with pytest.raises(RuntimeError, match="mode 3"):
+        band.to_polars(1)
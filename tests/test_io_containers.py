@@ -0,0 +1,115 @@
+"""Tests for the BandStructure and DensityOfStates containers."""
+
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pytest
+from polars.testing import assert_frame_equal
+
+from ddpc.io import band as band_io
+from ddpc.io import dos as dos_io
+from ddpc.io.band import BandStructure, load_band, read_band, read_band_modes
+from ddpc.io.dos import DensityOfStates, load_dos, read_dos, read_dos_modes
+from ddpc.io.jsonio import load_json
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+@pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+def test_band_structure_arrays(name):
+    """Band arrays have consistent shapes and slots only."""
+    band = load_band(DATA_DIR / name)
+    assert isinstance(band, BandStructure)
+    assert not hasattr(band, "__dict__")
+
+    nspin, nband, nkpt = band.energies.shape
+    assert band.projections.shape == (nspin, len(band.atoms), len(band.orbitals), nband, nkpt)
+    assert band.projections.flags["C_CONTIGUOUS"]
+    assert band.kpoints.shape == (nkpt, 3)
+    assert band.distances.shape == (nkpt,)
+    assert len(band.labels) == nkpt
+    assert len(band.spins) == nspin
+
+
+@pytest.mark.parametrize("mode", [0, 2, 5])
+def test_band_to_polars_matches_read(mode):
+    """to_polars gives the same frame as read_band without formatting."""
+    path = DATA_DIR / "spinless_pband.h5"
+    df, efermi, isproj = read_band(path, mode, fmt=None)
+    band = load_band(path)
+    assert band.to_polars(mode).equals(df)
+    assert (band.efermi, band.projected) == (efermi, isproj)
+
+
+def test_band_skip_projections():
+    """Total reads of projected files leave the projections unread."""
+    band = load_band(DATA_DIR / "spinless_pband.h5", projections=False)
+    assert band.projections is None
+    assert band.projected
+    assert band.to_polars(5).columns == band.to_polars(0).columns
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_density_of_states(ext):
+    """DOS container views match read_dos and keep the total DOS per spin."""
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    dos = load_dos(path, select={"elements": ["O"]})
+    assert isinstance(dos, DensityOfStates)
+    assert dos.dos.shape == (2, dos.energies.size)
+    assert set(dos.elements) == {"O"}
+
+    df, _, _ = read_dos(path, 4, fmt=None, select={"elements": ["O"]})
+    assert dos.to_polars(4).equals(df)
+    np.testing.assert_array_equal(dos.dos[1], df["tdos-down"].to_numpy())
+
+
+def test_read_modes_match_single_reads():
+    """One multi-mode read equals separate reads of every mode."""
+    path = DATA_DIR / "collinear_pdos.json"
+    frames, efermi, isproj = read_dos_modes(path, (0, 3, 6), layout="long")
+    assert list(frames) == [0, 3, 6]
+    for mode, df in frames.items():
+        single, single_efermi, single_isproj = read_dos(path, mode, layout="long")
+        assert df.equals(single)
+        assert (efermi, isproj) == (single_efermi, single_isproj)
+
+    frames, _, _ = read_band_modes(DATA_DIR / "spinless_pband.h5", fmt=None)
+    assert list(frames) == [1, 2, 3, 4, 5]
+    assert frames[4].equals(read_band(DATA_DIR / "spinless_pband.h5", 4, fmt=None)[0])
+
+
+@pytest.mark.parametrize(
+    ("kind", "name", "mode"),
+    [
+        ("band", "collinear_pband.h5", 2),
+        ("band", "spinless_pband.json", 5),
+        ("dos", "collinear_pdos.h5", 3),
+        ("dos", "noncollinear_pdos.json", 6),
+    ],
+)
+def test_deprecated_readers(kind, name, mode):
+    """The former per-format readers warn and return the container frames."""
+    module = band_io if kind == "band" else dos_io
+    path = DATA_DIR / name
+    ext = path.suffix[1:]
+    load = getattr(module, f"load_{kind}")
+    expected = load(path, cache=False).to_polars(mode)
+    total = load(path, projections=False, cache=False).to_polars(0)
+
+    with pytest.warns(DeprecationWarning, match="deprecated") as record:
+        df, efermi, isproj = getattr(module, f"read_{kind}_{ext}")(str(path), mode)
+    # the warning points at the caller
+    assert record[0].filename == __file__
+    assert_frame_equal(df, expected)
+    assert (efermi, isproj) == (load(path, cache=False).efermi, True)
+
+    opened = h5py.File(path) if ext == "h5" else load_json(path)
+    try:
+        with pytest.warns(DeprecationWarning, match="deprecated"):
+            assert_frame_equal(getattr(module, f"read_t{kind}")(opened, ext == "h5"), total)
+        with pytest.warns(DeprecationWarning, match="deprecated"):
+            assert_frame_equal(getattr(module, f"read_p{kind}_{ext}")(opened, mode), expected)
+    finally:
+        if ext == "h5":
+            opened.close()
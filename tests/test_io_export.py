@@ -3,9 +3,10 @@
 from pathlib import Path
 
 import pytest
+from polars.testing import assert_frame_equal
 
-from ddpc.io.band import read_band
-from ddpc.io.dos import read_dos
+from ddpc.io.band import read_band, read_band_modes
+from ddpc.io.dos import read_dos, read_dos_modes
 
 
 def get_file_info(file_path: Path):
@@ -64,3 +65,24 @@ def test_read_data_from_various_files(parametrized_data_file_path: Path, snapsho
                 assert str(df) == snapshot
     else:
         pytest.fail(f"Unknown data type: {data_type} for file: {parametrized_data_file_path.name}")
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["collinear_pband.h5", "spinless_pband.json", "collinear_pdos.h5", "noncollinear_pdos.json"],
+)
+@pytest.mark.parametrize("fmt", [None, "8.3f"])
+def test_read_modes_match_single_reads(data_dir: Path, name: str, fmt: str | None):
+    """Reading several modes at once gives the frames of one read per mode."""
+    path = data_dir / name
+    if get_file_info(path)["data_type"] == "band":
+        read, read_modes, modes = read_band, read_band_modes, range(6)
+    else:
+        read, read_modes, modes = read_dos, read_dos_modes, range(7)
+
+    frames, efermi, isproj = read_modes(path, tuple(modes), fmt=fmt)
+    assert list(frames) == list(modes)
+    for mode in modes:
+        df, single_efermi, single_isproj = read(path, mode, fmt)
+        assert_frame_equal(frames[mode], df)
+        assert (efermi, isproj) == (single_efermi, single_isproj)
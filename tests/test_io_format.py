@@ -0,0 +1,53 @@
+"""Tests for numeric reads and float formatting in ddpc.io.utils."""
+
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from ddpc.io.band import read_band
+from ddpc.io.dos import read_dos
+from ddpc.io.utils import format_float_columns
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+VALUES = np.concatenate(
+    [
+        np.random.default_rng(0).normal(size=1000) * 10,
+        np.arange(-2, 2, 0.0005),  # many decimal ties
+        [-0.0, -0.0004, 2.675, 1.0005, 123456789.123, np.nan, np.inf, -np.inf],
+    ]
+)
+
+
+@pytest.mark.parametrize("fmt", ["7.2f", "8.3f", "9.4f", ".0f", ".3e", "08.3f", "+09.2f", "+.1f"])
+def test_format_matches_python(fmt):
+    """Vectorised formatting is identical to Python's format spec."""
+    df = format_float_columns(pl.DataFrame({"x": VALUES, "i": np.arange(VALUES.size)}), fmt)
+    assert df["x"].to_list() == [f"{x:{fmt}}" for x in VALUES]
+    assert df["i"].dtype == pl.Int64
+
+
+def test_format_lazy_and_nulls():
+    """LazyFrames are formatted on collect and nulls become empty strings."""
+    lf = pl.LazyFrame({"a": [1.0, None], "b": [None, -2.5]})
+    df = format_float_columns(lf, "6.1f").collect()
+    assert df.rows() == [("   1.0", ""), ("", "  -2.5")]
+
+
+def test_numeric_read_keeps_floats():
+    """fmt=None returns native floats equal to the formatted read."""
+    path = DATA_DIR / "collinear_pband.h5"
+    numeric, _, _ = read_band(path, 3, fmt=None)
+    text, _, _ = read_band(path, 3, fmt="8.3f")
+
+    assert numeric.schema["dist"] == pl.Float64
+    assert format_float_columns(numeric, "8.3f").equals(text)
+
+
+def test_numeric_read_dos():
+    """Numeric DOS columns support arithmetic straight away."""
+    df, _, _ = read_dos(DATA_DIR / "spinless_pdos.h5", 3, fmt=None)
+    projected = df.select(pl.exclude("energy", "tdos")).sum_horizontal()
+    assert (projected <= df["tdos"] + 1e-6).all()
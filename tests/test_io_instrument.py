@@ -0,0 +1,93 @@
+"""Tests for the stage instrumentation in ddpc.io.instrument."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ddpc.io import instrument
+from ddpc.io.band import read_band, read_band_modes
+from ddpc.io.dos import read_dos
+from ddpc.io.structure import read_structure, write_structure
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+STRUCTURE_DIR = Path(__file__).parent / "structures"
+
+
+def test_off_by_default():
+    """Without an instrument block stages are shared no-ops."""
+    assert instrument.stage("read_band") is instrument.stage("load")
+    instrument.add_bytes(1)
+    assert read_band(DATA_DIR / "spinless_band.h5") is not None
+
+
+@pytest.mark.parametrize(
+    ("name", "parse"), [("collinear_pband.h5", False), ("spinless_pband.json", True)]
+)
+def test_read_band_stages(name, parse):
+    """Every stage of a band read is recorded with its bytes and memory peak."""
+    with instrument.instrument() as report:
+        read_band(DATA_DIR / name, 2)
+    stages = report.to_dict()["stages"]
+    paths = [s["stage"] for s in stages]
+    expected = [
+        "read_band/load/projections",
+        "read_band/load",
+        "read_band/dataframe/aggregate",
+        "read_band/dataframe",
+        "read_band/format",
+        "read_band",
+    ]
+    if parse:
+        expected.insert(0, "read_band/load/parse")
+    assert paths == expected
+
+    totals = report.stages
+    assert totals["read_band/load/projections"]["bytes"] > 0
+    assert sum(s["bytes"] for s in stages) <= (DATA_DIR / name).stat().st_size * (1 + parse)
+    assert all(s["calls"] == 1 and s["seconds"] >= 0 for s in stages)
+    assert totals["read_band"]["peak_bytes"] >= totals["read_band/load"]["peak_bytes"] > 0
+    assert totals["read_band"]["seconds"] <= report.seconds
+    assert json.loads(report.to_json()) == report.to_dict()
+
+
+def test_repeated_stages_and_no_memory():
+    """Repeated stages add up; without memory tracing peaks are None."""
+    with instrument.instrument(memory=False) as report:
+        read_band_modes(DATA_DIR / "spinless_pband.h5", modes=(0, 1, 3))
+        read_dos(DATA_DIR / "collinear_pdos.h5", 3, fmt=None)
+    assert report.stages["read_band_modes/format"]["calls"] == 3
+    assert report.stages["read_band_modes/dataframe/aggregate"]["calls"] == 2
+    assert "read_dos/format" not in report.stages
+    assert report.stages["read_dos/load"]["bytes"] > 0
+    assert all(s["peak_bytes"] is None for s in report.stages.values())
+    assert report.peak_rss_bytes > 0
+
+
+def test_no_resource_module(monkeypatch):
+    """Without the POSIX resource module the peak RSS is None."""
+    monkeypatch.setattr(instrument, "_resource", None)
+    with instrument.instrument(memory=False) as report:
+        read_dos(DATA_DIR / "spinless_dos.h5", 0, fmt=None)
+    assert report.peak_rss_bytes is None
+    assert report.to_dict()["peak_rss_bytes"] is None
+
+
+def test_structure_stages(tmp_path):
+    """Structure reads and writes record the bytes of their files."""
+    src = STRUCTURE_DIR / "all.as"
+    with instrument.instrument() as report:
+        atoms = read_structure(src)
+        write_structure(tmp_path / "out.as", atoms)
+    assert report.stages["read_structure"]["bytes"] == src.stat().st_size
+    assert report.stages["write_structure"]["bytes"] == (tmp_path / "out.as").stat().st_size
+
+
+def test_structure_index_syntax(tmp_path):
+    """ASE's ``file@index`` paths are read with and without a report."""
+    atoms = read_structure(STRUCTURE_DIR / "all.as")
+    write_structure(tmp_path / "t.traj", [atoms, atoms])
+    assert len(read_structure(f"{tmp_path / 't.traj'}@:")) == 2
+    with instrument.instrument() as report:
+        assert len(read_structure(f"{tmp_path / 't.traj'}@:")) == 2
+    assert report.stages["read_structure"]["bytes"] == 0
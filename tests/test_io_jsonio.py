@@ -0,0 +1,66 @@
+"""Tests for the JSON loaders in ddpc.io.jsonio."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.io.jsonio import load_json, load_json_skeleton
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+def test_load_json_matches_stdlib():
+    """The fast backend parses to the same document as the json module."""
+    path = DATA_DIR / "spinless_dos.json"
+    assert load_json(path) == json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_skeleton_arrays_match_full_parse(tmp_path, indent):
+    """Cut-out arrays decode to the values of a full parse, also when pretty-printed."""
+    doc = json.loads((DATA_DIR / "spinless_pdos.json").read_text(encoding="utf-8"))
+    path = tmp_path / "pdos.json"
+    path.write_text(json.dumps(doc, indent=indent), encoding="utf-8")
+
+    skeleton, arrays = load_json_skeleton(path)
+    entries = doc["DosInfo"]["Spin1"]["ProjectDos"]
+    cut = skeleton["DosInfo"]["Spin1"]["ProjectDos"]
+    assert len(arrays) == len(entries)
+    assert skeleton["DosInfo"]["DosEnergy"] == doc["DosInfo"]["DosEnergy"]
+
+    outs = [np.empty(len(entry["Contribution"])) for entry in entries]
+    arrays.read_many([entry["Contribution"] for entry in cut], outs)
+    for entry, out in zip(entries, outs, strict=True):
+        np.testing.assert_array_equal(out, entry["Contribution"])
+
+
+def test_skeleton_size_mismatch():
+    """Decoding into a buffer of the wrong size is refused."""
+    _, arrays = load_json_skeleton(DATA_DIR / "spinless_pdos.json")
+    with pytest.raises(ValueError, match="expected 3"):
+        arrays.read(0, np.empty(3))
+
+
+def test_skeleton_empty_arrays(tmp_path):
+    """Empty arrays hold no value and leave their neighbours intact."""
+    path = tmp_path / "empty.json"
+    path.write_text(
+        '{"a": [{"Contribution": []}, {"Contribution": [1.5, 2]}, {"Contribution": [ ]}]}'
+    )
+    skeleton, arrays = load_json_skeleton(path)
+    assert [entry["Contribution"] for entry in skeleton["a"]] == [0, 1, 2]
+
+    outs = [np.empty(0), np.empty(2), np.empty(0)]
+    arrays.read_many([0, 1, 2], outs)
+    np.testing.assert_array_equal(outs[1], [1.5, 2.0])
+    with pytest.raises(ValueError, match="has 0 values, expected 1"):
+        arrays.read(0, np.empty(1))
+
+
+def test_skeleton_nested_arrays(tmp_path):
+    """Nested arrays are refused instead of being cut at their first bracket."""
+    path = tmp_path / "nested.json"
+    path.write_text('{"Contribution": [[1, 2], [3, 4]]}')
+    assert load_json_skeleton(path) is None
@@ -0,0 +1,66 @@
+"""Tests for the long layout of read_band and read_dos."""
+
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from ddpc.io.band import read_band
+from ddpc.io.dos import read_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+@pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+def test_long_band_matches_wide(name):
+    """Every wide projection column reappears as one (channel, spin, band) group."""
+    path = DATA_DIR / name
+    wide, _, _ = read_band(path, 2, fmt=None)
+    long, _, _ = read_band(path, 2, fmt=None, layout="long")
+
+    assert long.columns == ["kpoint", "band", "spin", "channel", "energy", "weight"]
+    assert long["kpoint"].dtype == pl.UInt32
+    for row in long.select("band", "channel", "spin").unique().head(5).iter_rows():
+        band, channel, spin = row
+        key = f"band{band}-{channel}" + ("" if spin == "none" else f"-{spin}")
+        group = long.filter(band=band, channel=channel, spin=spin).sort("kpoint")
+        np.testing.assert_allclose(group["weight"].to_numpy(), wide[key].to_numpy())
+
+
+def test_long_total_band_energies():
+    """Total bands carry the energies of the wide columns."""
+    path = DATA_DIR / "collinear_band.h5"
+    wide, _, _ = read_band(path, fmt=None)
+    long, _, _ = read_band(path, fmt=None, layout="long")
+
+    assert long.columns == ["kpoint", "band", "spin", "energy"]
+    down = long.filter(spin="down", band=3)["energy"].to_numpy()
+    np.testing.assert_allclose(down, wide["band3-down"].to_numpy())
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_long_dos_matches_wide(ext):
+    """Long DOS reshapes the wide columns with the total DOS as a channel."""
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    wide, _, _ = read_dos(path, 3, fmt=None)
+    long, _, _ = read_dos(path, 3, fmt=None, layout="long")
+
+    assert long.columns == ["energy", "spin", "channel", "dos"]
+    channels = long.filter(spin="up")["channel"].unique(maintain_order=True).to_list()
+    assert channels == ["tdos", "Ni", "O"]
+    for channel in channels:
+        group = long.filter(spin="down", channel=channel)
+        np.testing.assert_allclose(group["dos"].to_numpy(), wide[f"{channel}-down"].to_numpy())
+
+
+def test_long_dos_group_by():
+    """Channel sums come from a plain group_by on the long frame."""
+    long, _, _ = read_dos(DATA_DIR / "spinless_pdos.h5", 4, fmt=None, layout="long")
+    summed = long.filter(pl.col("channel") != "tdos").group_by("energy").agg(pl.col("dos").sum())
+    assert summed.height == long.filter(channel="tdos").height
+
+
+def test_unknown_layout():
+    """An unknown layout is reported instead of read."""
+    assert read_dos(DATA_DIR / "spinless_dos.h5", layout="tall") is None
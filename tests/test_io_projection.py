@@ -0,0 +1,134 @@
+"""Tests for the projection aggregation engine in ddpc.io.projection."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.io.dos import load_dos, read_dos
+from ddpc.io.projection import (
+    BAND_MODES,
+    DOS_MODES,
+    aggregate,
+    aggregate_chunked,
+    channel_members,
+    group_matrix,
+    mode_rule,
+    parse_group,
+)
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+AXES = {
+    "spins": ["up", "down"],
+    "atoms": [1, 2, 3],
+    "elements": ["Ni", "O", "Ni"],
+    "orbitals": ["s", "py", "pz", "px", "dxy", "dyz", "dz2", "dxz", "dx2"],
+}
+
+
+@pytest.fixture
+def proj():
+    """Random (spin, atom, orbital, energy) projections."""
+    return np.random.default_rng(0).random((2, 3, 9, 11))
+
+
+def test_group_matrix_first_seen_order():
+    """Groups keep first-seen order and d orbitals split into t2g/eg."""
+    labels, matrix = group_matrix(AXES["orbitals"], "shell")
+    assert labels == ["s", "p", "d"]
+    assert matrix.sum(axis=1).tolist() == [1, 3, 5]
+
+    labels, matrix = group_matrix(AXES["orbitals"], "t2geg")
+    assert labels == ["t2g", "eg"]
+    assert matrix[1, AXES["orbitals"].index("dx2")] == 1
+
+
+@pytest.mark.parametrize(
+    "rule", sorted(set(BAND_MODES.values()) | set(DOS_MODES.values()), key=str)
+)
+def test_aggregate_conserves_weight(proj, rule):
+    """Every partitioning mode keeps the total weight of each spin channel."""
+    labels, out = aggregate(proj, AXES, rule)
+    assert out.shape == (2, len(labels), 11)
+    if rule[1] != "t2geg":
+        np.testing.assert_allclose(out.sum(axis=1), proj.sum(axis=(1, 2)))
+
+
+def test_aggregate_element_channels(proj):
+    """Element grouping sums the atoms sharing a symbol."""
+    labels, out = aggregate(proj, AXES, ("element", None))
+    assert labels == [("Ni", ""), ("O", "")]
+    np.testing.assert_allclose(out[:, 0], proj[:, [0, 2]].sum(axis=(1, 2)))
+
+
+def test_parse_group():
+    """Terms are recognised by their form, dicts and lists give the same selectors."""
+    assert parse_group("1-3,5 Ni px+py up") == [
+        {"atoms": [1, 2, 3, 5], "elements": ["Ni"], "orbitals": ["px", "py"], "spins": ["up"]}
+    ]
+    assert parse_group({"atoms": "1-2", "orbitals": ["t2g"]}) == [
+        {"atoms": [1, 2], "orbitals": ["t2g"]}
+    ]
+    assert parse_group(["O p", {"atoms": range(1, 3)}]) == [
+        {"elements": ["O"], "orbitals": ["p"]},
+        {"atoms": [1, 2]},
+    ]
+    assert parse_group("f-3 dx2y2 eg") == [{"orbitals": ["f-3", "dx2y2", "eg"]}]
+    assert parse_group("Ni xyz") is None
+    assert parse_group({"layers": [1]}) is None
+    # only known orbital names count as orbitals, not any word starting with s/p/d/f
+    assert parse_group("fe d") is None
+    assert parse_group("Fe pz2") is None
+
+
+def test_channel_groups(proj):
+    """Every group sums its selection; lists are unions counted once."""
+    groups = {"Ni-d": "Ni d", "top": ["1 t2g", "O p down", "1 dxy"], "none": "7 s"}
+    labels, out = aggregate(proj, AXES, groups)
+    assert labels == [("Ni-d", ""), ("top", ""), ("none", "")]
+    np.testing.assert_allclose(out[:, 0], proj[:, [0, 2], 4:].sum(axis=(1, 2)))
+    top = proj[:, 0, [4, 5, 7]].sum(axis=1)
+    top[1] += proj[1, 1, 1:4].sum(axis=0)
+    np.testing.assert_allclose(out[:, 1], top)
+    assert not out[:, 2].any()
+
+    # one group per atom and orbital reproduces mode 5
+    each = {f"{a}{o}": f"{a} {o}" for a in AXES["atoms"] for o in AXES["orbitals"]}
+    np.testing.assert_allclose(
+        aggregate(proj, AXES, each)[1], aggregate(proj, AXES, DOS_MODES[5])[1]
+    )
+
+    streamed = aggregate_chunked(lambda a, w: proj[:, a, :, w], proj.shape, AXES, groups, 4000)
+    assert streamed[0] == labels
+    np.testing.assert_allclose(streamed[1], out)
+    members = channel_members(AXES, groups)
+    assert members[1] == (("top", ""), [0, 1], [1, 2, 3, 4, 5, 7])
+    assert members[2] == (("none", ""), [], [])
+
+
+def test_mode_rule():
+    """Modes are looked up in their table, channel groups are passed through."""
+    assert mode_rule(4, DOS_MODES) == ("atom", "shell")
+    assert mode_rule({"d": "d"}, BAND_MODES) == {"d": "d"}
+    with pytest.raises(RuntimeError):
+        mode_rule(6, BAND_MODES)
+
+
+def test_read_channel_groups():
+    """Channel groups are modes of the readers, spin terms only fill their spin."""
+    groups = {"Ni-d": "Ni d", "O-p": "O p up"}
+    df, _, _ = read_dos(DATA_DIR / "collinear_pdos.h5", mode=groups, fmt=None)
+    assert df.columns == [
+        "energy",
+        "tdos-up",
+        "tdos-down",
+        "Ni-d-up",
+        "O-p-up",
+        "Ni-d-down",
+        "O-p-down",
+    ]
+    dos = load_dos(DATA_DIR / "collinear_pdos.h5", cache=False)
+    nickel = [i for i, e in enumerate(dos.elements) if e == "Ni"]
+    np.testing.assert_allclose(df["Ni-d-down"], dos.projections[1, nickel, 4:].sum(axis=(0, 1)))
+    assert (df["O-p-down"] == 0).all()
@@ -0,0 +1,99 @@
+"""Tests for the lazy scans in ddpc.io.scan."""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from ddpc.io import scan
+from ddpc.io.band import load_band, read_band
+from ddpc.io.dos import read_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+def _strings(df: pl.DataFrame) -> pl.DataFrame:
+    """Compare categorical and enum columns by value."""
+    return df.with_columns(pl.col(pl.Categorical, pl.Enum).cast(pl.String))
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record the selectors every scan passes to the readers."""
+    calls = []
+    for spec in scan._SCANS.values():
+        loader = spec["loader"]
+
+        def spy(path, select, projections, loader=loader):
+            calls.append((select, projections))
+            return loader(path, select, projections)
+
+        monkeypatch.setitem(spec, "loader", spy)
+    return calls
+
+
+@pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+def test_scan_band_pushdown(loads, name):
+    """Index and channel filters become a band/k-point window and an atom selection."""
+    path = DATA_DIR / name
+    eager, _, _ = read_band(path, 2, fmt=None, layout="long")
+    channel = eager["channel"].cat.get_categories()[0]
+
+    def query(lf: pl.LazyFrame) -> pl.LazyFrame:
+        return lf.filter(
+            pl.col("band").is_between(3, 5),
+            pl.col("kpoint") <= 20,
+            pl.col("channel") == channel,
+        ).select("kpoint", "band", "channel", "weight")
+
+    lf = scan.scan_band(path, mode=2)
+    assert lf.collect_schema()["channel"] == pl.Categorical
+    result = query(lf).collect()
+    assert _strings(result).equals(_strings(query(eager.lazy()).collect()))
+
+    select, projections = loads[-1]
+    assert projections
+    assert (select["bands"], select["kpoints"]) == ((3, 5), (1, 20))
+    band = load_band(path, projections=False)
+    element, shell = channel.split("-")
+    atoms = [a for a, e in zip(band.atoms, band.elements, strict=True) if e == element]
+    assert select["atoms"] == atoms
+    assert {orbital[0] for orbital in select["orbitals"]} == {shell}
+
+
+def test_scan_band_without_weights(loads):
+    """Queries without the weight column never read projections."""
+    path = DATA_DIR / "collinear_pband.h5"
+    lf = scan.scan_band(path, mode=1).filter(pl.col("spin") == "down")
+    result = lf.select("kpoint", "band", "channel", "energy").collect()
+
+    eager, _, _ = read_band(path, 1, fmt=None, layout="long")
+    expected = eager.filter(pl.col("spin") == "down").drop("spin", "weight")
+    assert _strings(result).equals(_strings(expected))
+    assert loads[-1] == ({"spins": ["down"], "bands": (1, 24), "kpoints": (1, 180)}, False)
+
+
+@pytest.mark.parametrize("name", ["collinear_pdos.h5", "collinear_pdos.json"])
+def test_scan_dos_pushdown(loads, name):
+    """Energy filters read an energy window, a tdos filter skips projections."""
+    path = DATA_DIR / name
+    eager, _, _ = read_dos(path, 4, fmt=None, layout="long")
+    lazy = eager.lazy()
+    queries = [
+        lambda lf: lf.filter(pl.col("energy").is_between(-2, 1)),
+        lambda lf: lf.filter(pl.col("channel") == "tdos", pl.col("energy") < 0),
+        lambda lf: lf.filter(pl.col("energy") > 1e3),
+        lambda lf: lf.head(5),
+    ]
+    for query in queries:
+        result = query(scan.scan_dos(path, mode=4)).collect()
+        assert _strings(result).equals(_strings(query(lazy).collect()))
+
+    # every query loads the metadata, the total energies and then its window
+    select, projections = loads[2]
+    emin, emax = select["energies"]
+    assert -2 - 1e-9 <= emin < emax <= 1 + 1e-9
+    assert projections
+    select, projections = loads[5]
+    assert select["energies"][1] < 0
+    assert not projections
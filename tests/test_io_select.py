@@ -0,0 +1,142 @@
+"""Tests for projection selectors of read_band and read_dos."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.io.band import load_band, read_band
+from ddpc.io.cache import CACHE_CONFIG
+from ddpc.io.dos import load_dos, load_dos_h5, load_dos_json, read_dos
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_band_select_matches_full_read(ext):
+    """Selected columns equal the same columns of an unfiltered read."""
+    path = DATA_DIR / f"spinless_pband.{ext}"
+    full, _, _ = read_band(path, 5)
+    part, _, _ = read_band(path, 5, select={"atoms": [2], "orbitals": ["p"]})
+
+    proj_cols = [c for c in part.columns if c.startswith("band")]
+    assert proj_cols
+    assert all(c.split("-")[1] == "2" and c.split("-")[2][0] == "p" for c in proj_cols)
+    assert part.equals(full.select(part.columns))
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_dos_select_elements_and_spins(ext):
+    """Element and spin selectors restrict both projections and total DOS."""
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    full, _, _ = read_dos(path, 3)
+    part, _, _ = read_dos(path, 3, select={"elements": ["Ni"], "spins": ["down"]})
+
+    assert part.columns == ["energy", "tdos-down", "Ni-down"]
+    assert part.equals(full.select(part.columns))
+
+
+def test_h5_and_json_agree():
+    """Both file formats of the same calculation yield the same frame."""
+    select = {"elements": ["Ni"], "orbitals": ["d"]}
+    h5, _, _ = read_dos(DATA_DIR / "collinear_pdos.h5", 6, select=select)
+    js, _, _ = read_dos(DATA_DIR / "collinear_pdos.json", 6, select=select)
+    assert h5.columns == js.columns
+
+
+def test_empty_selection():
+    """A selection matching nothing is reported instead of read."""
+    assert read_dos(DATA_DIR / "spinless_pdos.h5", 1, select={"elements": ["Fe"]}) is None
+
+
+@pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+def test_band_window(name):
+    """A band and k-point window keeps file numbering and matches a full read."""
+    path = DATA_DIR / name
+    full, _, _ = read_band(path, 2, fmt=None)
+    part, _, _ = read_band(path, 2, fmt=None, select={"bands": (3, 5), "kpoints": (10, 40)})
+
+    assert part.columns[5].startswith("band3-")
+    assert part.equals(full.select(part.columns).slice(9, 31))
+
+    long, _, _ = read_band(path, 2, fmt=None, select={"bands": (2, 2)}, layout="long")
+    assert long["band"].unique().to_list() == [2]
+    assert read_band(path, select={"bands": (0, 3)}) is None
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_dos_energy_window(ext):
+    """An energy window reads the grid points inside the inclusive bounds."""
+    path = DATA_DIR / f"spinless_pdos.{ext}"
+    full, _, _ = read_dos(path, 4, fmt=None)
+    part, _, _ = read_dos(path, 4, fmt=None, select={"energies": (-1.0, 1.0)})
+
+    expected = full.filter(full["energy"].is_between(-1.0, 1.0))
+    assert part.height > 0
+    assert part.equals(expected)
+
+
+@pytest.mark.parametrize("name", ["collinear_pband.h5", "spinless_pband.json"])
+def test_band_energy_window(name):
+    """Bands that never enter an energy window are dropped, the others kept whole."""
+    path = DATA_DIR / name
+    full, efermi, _ = read_band(path, 1, fmt=None)
+    select = {"energies": (-2.0, 2.0), "relative_to_fermi": True}
+    part, _, _ = read_band(path, 1, fmt=None, select=select)
+    assert part.equals(full.select(part.columns))
+
+    energies = load_band(path, projections=False).energies
+    enters = ((energies >= efermi - 2.0) & (energies <= efermi + 2.0)).any(axis=(0, 2))
+    expected = np.flatnonzero(enters) + 1
+    bands = load_band(path, select).energies.shape[1]
+    assert 0 < bands < energies.shape[1]
+    assert bands == expected[-1] - expected[0] + 1
+    assert f"band{expected[0]}-" in "".join(part.columns)
+    assert f"band{expected[0] - 1}-" not in "".join(part.columns)
+
+    absolute = {"energies": (efermi - 2.0, efermi + 2.0)}
+    assert read_band(path, 1, fmt=None, select=absolute)[0].equals(part)
+    assert read_band(path, 1, select={"energies": (1e3, 1e4)}) is None
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_dos_energy_window_relative(ext):
+    """A window relative to the Fermi energy is shifted by it."""
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    full, efermi, _ = read_dos(path, 3, fmt=None)
+    select = {"energies": (-1.0, 1.0), "relative_to_fermi": True}
+    part, _, _ = read_dos(path, 3, fmt=None, select=select)
+    assert part.height > 0
+    assert part.equals(full.filter(full["energy"].is_between(efermi - 1.0, efermi + 1.0)))
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+@pytest.mark.parametrize("cache", [False, True])
+def test_dos_grid(ext, cache, tmp_path, monkeypatch):
+    """Resampling interpolates every channel and reads only the bracketing points."""
+    monkeypatch.setitem(CACHE_CONFIG, "directory", tmp_path)
+    path = DATA_DIR / f"collinear_pdos.{ext}"
+    full = load_dos(path, cache=False)
+    grid = np.linspace(-1.0, 1.0, 41)
+    select = {"grid": grid, "relative_to_fermi": True}
+    dos = load_dos(path, select, cache=cache)
+
+    energies = grid + full.efermi
+    np.testing.assert_array_equal(dos.energies, energies)
+    assert dos.projections.shape == (*full.projections.shape[:3], len(grid))
+    for values, resampled in ((full.dos, dos.dos), (full.projections, dos.projections)):
+        flat = values.reshape(-1, values.shape[-1])
+        expected = [np.interp(energies, full.energies, row, left=0, right=0) for row in flat]
+        np.testing.assert_allclose(resampled.reshape(len(flat), -1), expected, atol=1e-12)
+
+    bracket = load_dos_json(str(path), select) if ext == "json" else load_dos_h5(str(path), select)
+    assert bracket.energies[0] <= energies[0] < bracket.energies[1]
+    assert bracket.energies[-2] < energies[-1] <= bracket.energies[-1]
+
+
+def test_dos_resample_outside():
+    """Points outside the energy grid get zero DOS."""
+    dos = load_dos(DATA_DIR / "spinless_pdos.h5", cache=False)
+    resampled = dos.resample([dos.energies[0] - 1.0, dos.energies[-1], dos.energies[-1] + 1.0])
+    np.testing.assert_allclose(resampled.dos[:, [0, 2]], 0.0)
+    np.testing.assert_allclose(resampled.dos[:, 1], dos.dos[:, -1])
@@ -0,0 +1,96 @@
+"""Tests for merging symmetry-equivalent atoms with ddpc.io.symmetry."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ddpc.io import cache, dos, symmetry
+from ddpc.io.band import load_band, load_band_channels, read_band
+from ddpc.io.dos import load_dos
+from ddpc.io.symmetry import equivalent_atoms
+
+DATA_DIR = Path(__file__).parent / "band_dos_data"
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("spinless_pband.h5", [0, 0]),
+        ("noncollinear_pdos.h5", [0, 0, 2, 3, 3]),
+        ("collinear_pdos.json", [0, 0, 2, 2]),
+        # the initial moments keep the antiferromagnetic Ni atoms apart
+        ("collinear_pdos.h5", [0, 1, 2, 2]),
+    ],
+)
+def test_equivalent_atoms(name, expected):
+    """Orbits follow the structure, element and magnetic moment of every atom."""
+    np.testing.assert_array_equal(equivalent_atoms(DATA_DIR / name), expected)
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_merged_band(cache):
+    """Summed orbits add up the atoms, averaged orbits divide by their size."""
+    path = DATA_DIR / "spinless_pband.h5"
+    band = load_band(path, cache=False)
+    summed = load_band(path, cache=cache, select={"equivalent": "sum"})
+    averaged = load_band(path, cache=cache, select={"equivalent": "average"})
+    assert summed.atoms == [1]
+    assert summed.elements == ["Si"]
+    np.testing.assert_allclose(summed.projections[:, 0], band.projections.sum(axis=1))
+    np.testing.assert_allclose(averaged.projections, summed.projections / 2)
+    np.testing.assert_array_equal(summed.energies, band.energies)
+
+    df, _, _ = read_band(path, mode=5, fmt=None, layout="long", select={"equivalent": "sum"})
+    assert df["channel"].unique(maintain_order=True).to_list() == [
+        f"1-{orbital}" for orbital in band.orbitals
+    ]
+
+
+def test_merged_channels():
+    """Streamed atom channels are merged per orbit like the full projections."""
+    path = DATA_DIR / "spinless_pband.h5"
+    full = load_band(path, cache=False, select={"equivalent": "average"})
+    band = load_band_channels(path, 5, select={"equivalent": "average"})
+    _, labels, weights = band.channels
+    assert labels == [("1", orbital) for orbital in full.orbitals]
+    np.testing.assert_allclose(weights, full.projections[:, 0])
+    # element channels hold every atom already, they can only be summed
+    assert load_band_channels(path, 2, select={"equivalent": "average"}) is None
+
+
+def test_merged_dos():
+    """Collinear DOS orbits are merged per spin, the total DOS is untouched."""
+    path = DATA_DIR / "collinear_pdos.h5"
+    dos = load_dos(path, cache=False)
+    merged = load_dos(path, cache=False, select={"equivalent": "sum"})
+    assert merged.atoms == [1, 2, 3]
+    np.testing.assert_allclose(merged.projections[:, :2], dos.projections[:, :2])
+    np.testing.assert_allclose(merged.projections[:, 2], dos.projections[:, 2:].sum(axis=1))
+    np.testing.assert_array_equal(merged.dos, dos.dos)
+    assert load_dos(path, cache=False, select={"equivalent": "median"}) is None
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_json_parsed_once(cached, tmp_path, monkeypatch):
+    """The orbits reuse the AtomInfo of the parsed JSON, also from a cache entry."""
+    monkeypatch.setitem(cache.CACHE_CONFIG, "directory", tmp_path / "cache")
+    path = DATA_DIR / "collinear_pdos.json"
+    select = {"equivalent": "sum"}
+    expected = load_dos(path, cache=False, select=select)
+    if cached:
+        load_dos(path, cache=True)
+
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return load_json_skeleton(*args, **kwargs)
+
+    load_json_skeleton = dos.load_json_skeleton
+    monkeypatch.setattr(dos, "load_json_skeleton", counted)
+    monkeypatch.setattr(symmetry, "load_json_skeleton", counted)
+    merged = load_dos(path, cache=cached, select=select)
+    assert len(calls) == (0 if cached else 1)
+    assert merged.atoms == expected.atoms == [1, 3]
+    np.testing.assert_allclose(merged.projections, expected.projections)
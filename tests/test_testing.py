@@ -0,0 +1,65 @@
+"""Tests for the synthetic file generator in ddpc.testing."""
+
+import numpy as np
+import pytest
+
+from ddpc import testing
+from ddpc.io.band import load_band, read_band
+from ddpc.io.dos import load_dos, read_dos
+
+
+@pytest.mark.parametrize("spin", list(testing.SPIN_TYPES))
+def test_band_file_roundtrip(tmp_path, spin):
+    """HDF5 and JSON band files hold the same arrays of the requested size."""
+    h5, js = (
+        load_band(testing.write_band_file(tmp_path / f"band.{ext}", spin, (3, 5, 7)), cache=False)
+        for ext in ("h5", "json")
+    )
+    nspin = 2 if spin == "collinear" else 1
+    assert h5.energies.shape == (nspin, 5, 7)
+    assert h5.projections.shape == (nspin, 3, 9, 5, 7)
+    assert h5.spin_type == testing.SPIN_TYPES[spin][0]
+    assert (np.diff(h5.energies, axis=1) > 0).all()
+    np.testing.assert_array_equal(h5.energies, js.energies)
+    np.testing.assert_array_equal(h5.projections, js.projections)
+    np.testing.assert_allclose(h5.kpoints, js.kpoints)
+    assert h5.labels == js.labels
+
+
+@pytest.mark.parametrize("spin", list(testing.SPIN_TYPES))
+def test_dos_file_roundtrip(tmp_path, spin):
+    """HDF5 and JSON DOS files hold the same arrays of the requested size."""
+    h5, js = (
+        load_dos(testing.write_dos_file(tmp_path / f"dos.{ext}", spin, (2, 11)), cache=False)
+        for ext in ("h5", "json")
+    )
+    nspin = 2 if spin == "collinear" else 1
+    assert h5.projections.shape == (nspin, 2, 9, 11)
+    np.testing.assert_allclose(h5.energies, np.linspace(-10, 10, 11))
+    np.testing.assert_array_equal(h5.energies, js.energies)
+    np.testing.assert_array_equal(h5.dos, js.dos)
+    np.testing.assert_array_equal(h5.projections, js.projections)
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_chunked_writes(tmp_path, monkeypatch, ext):
+    """Files written in small chunks hold the same numbers."""
+    whole = load_band(testing.write_band_file(tmp_path / f"a.{ext}"), cache=False)
+    monkeypatch.setattr(testing, "CHUNK_VALUES", 7)
+    chunked = load_band(testing.write_band_file(tmp_path / f"b.{ext}"), cache=False)
+    np.testing.assert_array_equal(whole.energies, chunked.energies)
+    np.testing.assert_array_equal(whole.projections, chunked.projections)
+
+    dos = load_dos(testing.write_dos_file(tmp_path / f"dos.{ext}"), cache=False)
+    np.testing.assert_allclose(dos.energies, np.linspace(-10, 10, 1001))
+
+
+@pytest.mark.parametrize("ext", ["h5", "json"])
+def test_unprojected_files(tmp_path, ext):
+    """Files without projections read as total band structure and DOS."""
+    band = read_band(testing.write_band_file(tmp_path / f"band.{ext}", projected=False), 5)
+    dos = read_dos(testing.write_dos_file(tmp_path / f"dos.{ext}", projected=False), 5)
+    assert band[2] is False
+    assert dos[2] is False
+    assert band[0].height == 100
+    assert dos[0].height == 1001